@@ -1,6 +1,17 @@
 """Configuration management for plan review system."""
 from .plan_review_config import PlanReviewConfig
-from .config_schema import ConfigSchema, ThresholdConfig, MetricsConfig
+from .config_watcher import ConfigWatcher
 from .defaults import DEFAULT_CONFIG
 
-__all__ = ['PlanReviewConfig', 'ConfigSchema', 'ThresholdConfig', 'MetricsConfig', 'DEFAULT_CONFIG']
+__all__ = ['PlanReviewConfig', 'ConfigWatcher', 'ConfigSchema', 'ThresholdConfig', 'MetricsConfig', 'DEFAULT_CONFIG']
+
+# The pydantic schemas are imported on first use, so a warm start that
+# loads a config snapshot never imports pydantic
+_SCHEMA_EXPORTS = ('ConfigSchema', 'ThresholdConfig', 'MetricsConfig')
+
+
+def __getattr__(name):
+    if name in _SCHEMA_EXPORTS:
+        from . import config_schema
+        return getattr(config_schema, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
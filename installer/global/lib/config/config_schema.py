@@ -72,7 +72,55 @@ class MetricsConfig(BaseModel):
 
     enabled: bool = Field(description="Enable metrics collection")
     retention_days: int = Field(gt=0, description="Number of days to retain metrics")
-    output_format: Literal["terminal"] = Field(description="Output format (terminal only for MVP)")
+    output_format: Literal["terminal", "json", "csv", "prometheus"] = Field(
+        description="Dashboard output format (terminal, json, csv or prometheus)"
+    )
+    backend: Literal["jsonl", "segmented", "sqlite"] = Field(
+        default="jsonl",
+        description="Storage backend (single JSONL file, daily JSONL segments, or SQLite)"
+    )
+    encoding: Literal["json", "compact"] = Field(
+        default="json",
+        description="JSONL line encoding for new metrics (JSON objects, or compact schema-tagged rows)"
+    )
+    dedup_window: int = Field(
+        default=10000,
+        gt=0,
+        description="Number of recent idempotency keys checked to reject retried metric writes"
+    )
+    buffered_writes: bool = Field(
+        default=False,
+        description="Batch JSONL appends through a buffered writer instead of one write per metric (jsonl backend)"
+    )
+    fsync: Literal["never", "batch", "record"] = Field(
+        default="never",
+        description="Fsync policy of buffered writes (never, after each batch, or per record)"
+    )
+    rollup_after_days: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Replace decision and outcome events older than this many days with daily rollups on cleanup "
+            "(0 disables); only dashboard summaries read rollups"
+        )
+    )
+    archive: Literal["none", "gzip", "lzma"] = Field(
+        default="none",
+        description="Compress metrics past retention into an archive instead of deleting them (JSONL backends)"
+    )
+    repositories: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Repositories (name -> project root) whose metrics the dashboard federates"
+    )
+    async_writes: bool = Field(
+        default=False,
+        description="Write metrics from a background thread instead of the review path"
+    )
+    queue_size: int = Field(default=1000, gt=0, description="Maximum metrics queued for async writes")
+    overflow_policy: Literal["drop", "block"] = Field(
+        default="drop",
+        description="What async writes do when the queue is full (drop the metric or block)"
+    )
 
 
 class ThresholdsConfig(BaseModel):
@@ -106,6 +154,11 @@ class ConfigSchema(BaseModel):
     timeouts: Timeouts = Field(description="Timeout configuration")
     weights: Weights = Field(description="Scoring weights")
     metrics: MetricsConfig = Field(description="Metrics configuration")
+    watch_interval_seconds: float = Field(
+        default=2.0,
+        gt=0,
+        description="How often ConfigWatcher polls settings.json for changes"
+    )
 
     def model_post_init(self, __context) -> None:
         """Validate after all fields are set."""
@@ -0,0 +1,195 @@
+"""Validated configuration snapshots that load without pydantic."""
+import copy
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from ..utils import FileOperations, JsonSerializer
+
+# Bump when the snapshot layout or the meaning of a config field changes
+SNAPSHOT_VERSION = 1
+
+CACHE_DIR_ENV = 'REQUIREKIT_CACHE_DIR'
+CONFIG_CACHE_ENV = 'REQUIREKIT_CONFIG_CACHE'
+
+_SCHEMA_SOURCES = ('config_schema.py', 'defaults.py')
+
+
+class ConfigSnapshot(Mapping):
+    """
+    Read-only view of a validated configuration dictionary.
+
+    Exposes the same attribute access as ``ConfigSchema`` (nested sections
+    are views as well) plus ``model_dump``, so ``PlanReviewConfig`` getters
+    work unchanged whether the configuration was validated in this process
+    or loaded from a snapshot.
+    """
+
+    __slots__ = ('_data',)
+
+    _SECTIONS: Dict[str, type] = {}
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Initialize snapshot view.
+
+        Args:
+            data: Validated configuration (``ConfigSchema.model_dump()``)
+        """
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._data[key]
+        if isinstance(value, dict):
+            return self._SECTIONS.get(key, ConfigSnapshot)(value)
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def model_dump(self) -> Dict[str, Any]:
+        """
+        Get the configuration as a dictionary.
+
+        Returns:
+            Deep copy of the validated configuration
+        """
+        return copy.deepcopy(self._data)
+
+
+class ThresholdsSnapshot(ConfigSnapshot):
+    """Snapshot view of ``ThresholdsConfig``."""
+
+    __slots__ = ()
+
+    def get_for_stack(self, stack: Optional[str] = None) -> ConfigSnapshot:
+        """
+        Get threshold configuration for specific stack.
+
+        Args:
+            stack: Technology stack identifier
+
+        Returns:
+            Thresholds for stack or default
+        """
+        if stack and stack in self.stack_overrides:
+            return self.stack_overrides[stack]
+        return self.default
+
+
+ConfigSnapshot._SECTIONS['thresholds'] = ThresholdsSnapshot
+
+
+class ConfigSnapshotCache:
+    """
+    Persists validated configuration keyed by everything it was built from.
+
+    The key holds the settings path with its mtime and size, the values of
+    the environment variables that override configuration, the snapshot
+    version and the mtime and size of the schema and defaults modules, so
+    any change to an input invalidates the snapshot. Snapshots live in
+    ``$REQUIREKIT_CACHE_DIR`` (default: ``$XDG_CACHE_HOME/requirekit`` or
+    ``~/.cache/requirekit``), one file per settings path; setting
+    ``REQUIREKIT_CONFIG_CACHE=0`` disables them.
+    """
+
+    @staticmethod
+    def enabled() -> bool:
+        """Whether snapshots are read and written."""
+        return os.getenv(CONFIG_CACHE_ENV, '1').lower() not in ('0', 'false', 'no', 'off')
+
+    @staticmethod
+    def _cache_file(settings_path: Path) -> Path:
+        """Get the snapshot path for a settings file."""
+        cache_dir = os.getenv(CACHE_DIR_ENV)
+        if cache_dir:
+            base = Path(cache_dir)
+        else:
+            base = Path(os.getenv('XDG_CACHE_HOME') or Path.home() / '.cache') / 'requirekit'
+        digest = hashlib.sha1(str(settings_path).encode('utf-8')).hexdigest()[:16]
+        return base / f"plan_review_config-{digest}.json"
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[list]:
+        """Get [mtime_ns, size] of a file, or None if missing."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    @staticmethod
+    def key(settings_path: Path, env: Mapping[str, str]) -> Dict[str, Any]:
+        """
+        Build the snapshot key for the current inputs.
+
+        Args:
+            settings_path: Path of settings.json
+            env: Values of the configuration environment variables that are set
+
+        Returns:
+            Key dictionary (JSON-serializable)
+        """
+        here = Path(__file__).parent
+        return {
+            'version': SNAPSHOT_VERSION,
+            'schema': [ConfigSnapshotCache._stat(here / name) for name in _SCHEMA_SOURCES],
+            'settings': str(settings_path),
+            'settings_stat': ConfigSnapshotCache._stat(settings_path),
+            'env': dict(env),
+        }
+
+    @staticmethod
+    def load(settings_path: Path, key: Dict[str, Any]) -> Optional[ConfigSnapshot]:
+        """
+        Load the snapshot for a key.
+
+        Args:
+            settings_path: Path of settings.json
+            key: Snapshot key (see ``key``)
+
+        Returns:
+            Snapshot view, or None if missing, unreadable or stale
+        """
+        cache_file = ConfigSnapshotCache._cache_file(settings_path)
+        if not cache_file.exists():
+            return None
+        data = JsonSerializer.safe_load_file(cache_file)
+        if data.get('key') != key or not isinstance(data.get('config'), dict):
+            return None
+        return ConfigSnapshot(data['config'])
+
+    @staticmethod
+    def save(settings_path: Path, key: Dict[str, Any], config: Dict[str, Any]) -> bool:
+        """
+        Persist a validated configuration.
+
+        Args:
+            settings_path: Path of settings.json
+            key: Snapshot key (see ``key``)
+            config: Validated configuration dictionary
+
+        Returns:
+            True if successful, False otherwise
+        """
+        cache_file = ConfigSnapshotCache._cache_file(settings_path)
+        try:
+            content = JsonSerializer.serialize({'key': key, 'config': config}, indent=None)
+        except ValueError as e:
+            print(f"Warning: Failed to snapshot configuration: {e}")
+            return False
+        if not FileOperations.ensure_directory(cache_file.parent):
+            return False
+        return FileOperations.atomic_write(cache_file, content)
@@ -0,0 +1,133 @@
+"""Polling watcher that hot-reloads configuration when settings.json changes."""
+import os
+import threading
+from typing import Callable, List, Optional
+
+from .plan_review_config import PlanReviewConfig
+from ..utils import PathResolver
+
+ConfigCallback = Callable[[PlanReviewConfig], None]
+
+
+class ConfigWatcher:
+    """
+    Reloads ``PlanReviewConfig`` when settings.json changes.
+
+    Each poll only stats settings.json; the file is re-parsed (and
+    revalidated, or loaded from its snapshot) only when its mtime or size
+    changed. The new configuration is swapped in with a single assignment,
+    CLI overrides are kept, and subscribers are called with the config
+    after the swap. Poll explicitly with ``check``, or call ``start`` to
+    poll from a daemon thread every ``interval`` seconds.
+    """
+
+    def __init__(self, config: Optional[PlanReviewConfig] = None, interval: Optional[float] = None):
+        """
+        Initialize config watcher.
+
+        Args:
+            config: Configuration to keep current (default: singleton)
+            interval: Poll interval in seconds (default:
+                watch_interval_seconds from config)
+        """
+        self.config = config or PlanReviewConfig()
+        self.interval = interval if interval is not None else self.config.get_watch_interval()
+        if self.interval <= 0:
+            raise ValueError("interval must be positive")
+
+        self.settings_path = PathResolver.get_settings_path()
+        self.reloads = 0
+        self._stamp = self._settings_stamp()
+        self._callbacks: List[ConfigCallback] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._pid: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _settings_stamp(self) -> Optional[List[int]]:
+        """Get [mtime_ns, size] of settings.json, or None if missing."""
+        try:
+            stat = self.settings_path.stat()
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def subscribe(self, callback: ConfigCallback) -> None:
+        """
+        Call a function after every reload.
+
+        Args:
+            callback: Called with the reloaded configuration
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: ConfigCallback) -> None:
+        """
+        Stop calling a subscribed function.
+
+        Args:
+            callback: Previously subscribed callback
+        """
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def check(self) -> bool:
+        """
+        Reload the configuration if settings.json changed since the last check.
+
+        Returns:
+            True if the configuration was reloaded
+        """
+        with self._lock:
+            stamp = self._settings_stamp()
+            if stamp == self._stamp:
+                return False
+            self._stamp = stamp
+            self.config.reload(keep_cli_overrides=True)
+            self.reloads += 1
+            callbacks = list(self._callbacks)
+
+        for callback in callbacks:
+            try:
+                callback(self.config)
+            except Exception as e:
+                print(f"Warning: Config change callback failed: {e}")
+        return True
+
+    def start(self) -> None:
+        """Start polling from a daemon thread (again, in a forked child)."""
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='config-watcher', daemon=True)
+        self._thread.start()
+        self._pid = os.getpid()
+
+    def _run(self) -> None:
+        """Poll until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Warning: Failed to reload configuration: {e}")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the polling thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the thread to exit
+        """
+        self._stop.set()
+        if self._pid == os.getpid() and self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def __enter__(self) -> 'ConfigWatcher':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
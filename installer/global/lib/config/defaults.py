@@ -60,6 +60,19 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "metrics": {
         "enabled": True,
         "retention_days": 90,
-        "output_format": "terminal"  # Only terminal for MVP (no HTML)
-    }
+        "rollup_after_days": 0,  # 0 keeps raw metrics until retention
+        "output_format": "terminal",  # terminal, json, csv, prometheus
+        "backend": "jsonl",  # jsonl, segmented, sqlite
+        "archive": "none",  # none, gzip, lzma
+        "encoding": "json",  # json, compact
+        "dedup_window": 10000,
+        "buffered_writes": False,
+        "fsync": "never",  # never, batch, record (buffered writes)
+        "repositories": {},  # name -> project root, for a cross-repo dashboard
+        "async_writes": False,
+        "queue_size": 1000,
+        "overflow_policy": "drop"  # drop, block
+    },
+
+    "watch_interval_seconds": 2.0  # ConfigWatcher poll interval
 }
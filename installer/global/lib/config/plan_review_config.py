@@ -1,12 +1,29 @@
 """Plan review configuration manager with 4-layer precedence."""
 import os
-from typing import Optional, Dict, Any, Literal
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional, Dict, Any, Iterator, List, Literal, Mapping, Sequence, Tuple, Union
 from pathlib import Path
 
+from .config_snapshot import ConfigSnapshot, ConfigSnapshotCache
 from .defaults import DEFAULT_CONFIG
-from .config_schema import ConfigSchema, ThresholdConfig
 from ..utils import JsonSerializer, PathResolver
 
+if TYPE_CHECKING:
+    from .config_schema import ConfigSchema
+
+_MISSING = object()
+_NO_OVERRIDES: Mapping[str, Any] = MappingProxyType({})
+
+Decision = Literal['auto_approve', 'approve_with_recommendations', 'reject']
+
+# CLI overrides of the current context; None outside any cli_overrides() scope
+_context_overrides: ContextVar[Optional[Mapping[str, Any]]] = ContextVar(
+    'plan_review_cli_overrides', default=None
+)
+
 
 class PlanReviewConfig:
     """
@@ -17,11 +34,40 @@ class PlanReviewConfig:
     2. Environment variables
     3. Settings.json file
     4. Default configuration (lowest priority)
+
+    The merged, validated configuration is snapshotted (see
+    ``ConfigSnapshotCache``); a process whose settings.json, environment
+    and schema match a snapshot loads it without importing pydantic.
+
+    Configuration and override layers are never mutated in place, only
+    replaced, so readers need no locks. CLI overrides come in two layers:
+    process-wide ones, and per-context ones set inside ``cli_overrides``
+    (scoped with ``contextvars``, so concurrent evaluations in threads or
+    asyncio tasks each see only their own). Lookups check the context
+    layer, then the process layer; layers are flattened when set, not
+    merged per call.
+
+    Decisions for integer scores 0-100 come from a per-stack table of 101
+    precompiled decisions, rebuilt only when the configuration or one of
+    the override layers is replaced.
     """
 
+    ENV_VARS = (
+        'PLAN_REVIEW_ENABLED',
+        'PLAN_REVIEW_MODE',
+        'PLAN_REVIEW_AUTO_APPROVE_THRESHOLD',
+        'PLAN_REVIEW_METRICS_ENABLED',
+        'PLAN_REVIEW_METRICS_BACKEND',
+    )
+
     _instance: Optional['PlanReviewConfig'] = None
-    _config: Optional[ConfigSchema] = None
-    _cli_overrides: Dict[str, Any] = {}
+    _config: Optional[Union['ConfigSchema', ConfigSnapshot]] = None
+    _cli_overrides: Mapping[str, Any] = _NO_OVERRIDES
+    _overrides_lock = threading.Lock()
+    _decision_tables: Dict[Tuple[Optional[str], int], Tuple[Any, ...]] = {}
+
+    MAX_SCORE = 100
+    MAX_DECISION_TABLES = 256
 
     def __new__(cls) -> 'PlanReviewConfig':
         """Ensure singleton instance."""
@@ -35,12 +81,34 @@ class PlanReviewConfig:
             self._load_config()
 
     def _load_config(self) -> None:
-        """Load configuration from all sources with precedence."""
+        """Load configuration from all sources and swap it in."""
+        # A single assignment, so concurrent readers see the old or the new
+        # configuration, never a partial one
+        self._config = self._build_config()
+
+    def _build_config(self) -> Union['ConfigSchema', ConfigSnapshot]:
+        """
+        Build configuration from all sources with precedence.
+
+        Returns:
+            Validated configuration (a snapshot view on a warm start)
+        """
+        settings_path = PathResolver.get_settings_path()
+        snapshot_key = None
+        if ConfigSnapshotCache.enabled():
+            # Keyed before reading, so a concurrent edit can only make it stale
+            env = {name: os.environ[name] for name in self.ENV_VARS if name in os.environ}
+            snapshot_key = ConfigSnapshotCache.key(settings_path, env)
+            snapshot = ConfigSnapshotCache.load(settings_path, snapshot_key)
+            if snapshot is not None:
+                return snapshot
+
+        from .config_schema import ConfigSchema
+
         # Start with defaults
         config_dict = DEFAULT_CONFIG.copy()
 
         # Layer 3: Settings.json
-        settings_path = PathResolver.get_settings_path()
         if settings_path.exists():
             settings = JsonSerializer.safe_load_file(settings_path)
             plan_review_settings = settings.get('plan_review', {})
@@ -57,10 +125,15 @@ class PlanReviewConfig:
 
         # Validate and create schema
         try:
-            self._config = ConfigSchema(**config_dict)
+            config = ConfigSchema(**config_dict)
         except Exception as e:
+            # Not snapshotted, so the warning repeats until the config is fixed
             print(f"Warning: Invalid configuration, using defaults: {e}")
-            self._config = ConfigSchema(**DEFAULT_CONFIG)
+            return ConfigSchema(**DEFAULT_CONFIG)
+
+        if snapshot_key is not None:
+            ConfigSnapshotCache.save(settings_path, snapshot_key, config.model_dump())
+        return config
 
     def _load_env_overrides(self) -> Dict[str, Any]:
         """
@@ -99,6 +172,14 @@ class PlanReviewConfig:
                 overrides['metrics'] = {}
             overrides['metrics']['enabled'] = value in ('true', '1', 'yes')
 
+        # PLAN_REVIEW_METRICS_BACKEND
+        if 'PLAN_REVIEW_METRICS_BACKEND' in os.environ:
+            backend = os.getenv('PLAN_REVIEW_METRICS_BACKEND', '')
+            if backend in ('jsonl', 'segmented', 'sqlite'):
+                if 'metrics' not in overrides:
+                    overrides['metrics'] = {}
+                overrides['metrics']['backend'] = backend
+
         return overrides
 
     def _merge_configs(self, base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
@@ -126,11 +207,43 @@ class PlanReviewConfig:
         """
         Set CLI override value (highest precedence).
 
+        Inside a ``cli_overrides`` scope the override only applies to the
+        current context until the scope exits; outside one it applies to
+        the whole process.
+
         Args:
             key: Configuration key (dot notation supported, e.g., 'thresholds.default.auto_approve')
             value: Override value
         """
-        self._cli_overrides[key] = value
+        layer = _context_overrides.get()
+        if layer is not None:
+            _context_overrides.set(MappingProxyType({**layer, key: value}))
+            return
+        with self._overrides_lock:
+            self._cli_overrides = MappingProxyType({**self._cli_overrides, key: value})
+
+    @contextmanager
+    def cli_overrides(self, overrides: Optional[Mapping[str, Any]] = None) -> Iterator['PlanReviewConfig']:
+        """
+        Scope CLI overrides to the current context.
+
+        Overrides given here, or set with ``set_cli_override`` inside the
+        scope, are seen only by code running in this context (and tasks
+        started from it) and are discarded on exit. Scopes nest; inner
+        values win.
+
+        Args:
+            overrides: Configuration keys and override values
+
+        Yields:
+            This configuration
+        """
+        layer = _context_overrides.get() or _NO_OVERRIDES
+        token = _context_overrides.set(MappingProxyType({**layer, **(overrides or {})}))
+        try:
+            yield self
+        finally:
+            _context_overrides.reset(token)
 
     def _get_cli_override(self, key: str) -> Optional[Any]:
         """
@@ -140,8 +253,14 @@ class PlanReviewConfig:
             key: Configuration key
 
         Returns:
-            Override value or None
+            Override value from the context layer, else the process layer,
+            else None
         """
+        layer = _context_overrides.get()
+        if layer is not None:
+            value = layer.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
         return self._cli_overrides.get(key)
 
     def is_enabled(self) -> bool:
@@ -168,7 +287,7 @@ class PlanReviewConfig:
             return cli_override
         return self._config.default_mode
 
-    def get_threshold(self, score: int, stack: Optional[str] = None) -> str:
+    def get_threshold(self, score: int, stack: Optional[str] = None) -> Decision:
         """
         Get decision threshold for score.
 
@@ -179,23 +298,133 @@ class PlanReviewConfig:
         Returns:
             Decision: 'auto_approve', 'approve_with_recommendations', or 'reject'
         """
-        # Check for CLI overrides
-        cli_auto = self._get_cli_override('thresholds.auto_approve')
-        cli_recommend = self._get_cli_override('thresholds.approve_with_recommendations')
+        if type(score) is int and 0 <= score <= self.MAX_SCORE:
+            return self._decision_table(stack)[score]
+        return self._decide(score, *self._stack_thresholds(stack))
+
+    def classify_scores(
+        self,
+        scores: Sequence[float],
+        stacks: Union[None, str, Sequence[Optional[str]]] = None
+    ) -> List[Decision]:
+        """
+        Get decisions for many scores in one call.
 
-        # Get thresholds for stack
-        thresholds = self._config.thresholds.get_for_stack(stack)
+        Each distinct stack's decision table is resolved once, so the
+        per-score cost is a single table lookup.
+
+        Args:
+            scores: Architectural review scores
+            stacks: One stack for all scores, or one stack per score
+                (default: no stack)
 
-        auto_approve = cli_auto if cli_auto is not None else thresholds.auto_approve
-        approve_with_rec = cli_recommend if cli_recommend is not None else thresholds.approve_with_recommendations
+        Returns:
+            Decisions in score order
 
+        Raises:
+            ValueError: If stacks and scores differ in length
+        """
+        if stacks is None or isinstance(stacks, str):
+            stacks = [stacks] * len(scores)
+        elif len(stacks) != len(scores):
+            raise ValueError(f"Got {len(stacks)} stacks for {len(scores)} scores")
+
+        tables: Dict[Optional[str], Tuple[Decision, ...]] = {}
+        decisions: List[Decision] = []
+        for score, stack in zip(scores, stacks):
+            table = tables.get(stack)
+            if table is None:
+                table = tables[stack] = self._decision_table(stack)
+            if type(score) is int and 0 <= score <= self.MAX_SCORE:
+                decisions.append(table[score])
+            else:
+                decisions.append(self._decide(score, *self._stack_thresholds(stack)))
+        return decisions
+
+    @staticmethod
+    def _decide(score: float, auto_approve: int, approve_with_recommendations: int) -> Decision:
+        """Compare a score against thresholds."""
         if score >= auto_approve:
             return 'auto_approve'
-        elif score >= approve_with_rec:
+        elif score >= approve_with_recommendations:
             return 'approve_with_recommendations'
         else:
             return 'reject'
 
+    def _decision_table(self, stack: Optional[str] = None) -> Tuple[Decision, ...]:
+        """
+        Get the precompiled decisions for scores 0-100 of a stack.
+
+        Tables are cached per stack and override context, and are valid as
+        long as the configuration and both override layers are the same
+        objects they were compiled from (all three are only ever replaced).
+
+        Args:
+            stack: Technology stack identifier
+
+        Returns:
+            Tuple indexed by score
+        """
+        config = self._config
+        process_layer = self._cli_overrides
+        context_layer = _context_overrides.get()
+        key = (stack, id(context_layer))
+
+        entry = self._decision_tables.get(key)
+        if (entry is not None and entry[0] is config and entry[1] is process_layer
+                and entry[2] is context_layer):
+            return entry[3]
+
+        thresholds = self._stack_thresholds(stack)
+        table = tuple(self._decide(score, *thresholds) for score in range(self.MAX_SCORE + 1))
+        if len(self._decision_tables) >= self.MAX_DECISION_TABLES:
+            self._decision_tables.clear()
+        self._decision_tables[key] = (config, process_layer, context_layer, table)
+        return table
+
+    def get_stack_thresholds(self, stack: Optional[str] = None) -> Dict[str, int]:
+        """
+        Get the effective decision thresholds for a stack.
+
+        Args:
+            stack: Technology stack identifier
+
+        Returns:
+            Mapping with 'auto_approve' and 'approve_with_recommendations'
+            minimum scores (CLI overrides applied)
+        """
+        auto_approve, approve_with_recommendations = self._stack_thresholds(stack)
+        return {
+            'auto_approve': auto_approve,
+            'approve_with_recommendations': approve_with_recommendations,
+        }
+
+    def get_reject_threshold(self, stack: Optional[str] = None) -> int:
+        """
+        Get the configured reject threshold for a stack.
+
+        Args:
+            stack: Technology stack identifier
+
+        Returns:
+            Reject threshold (approve_with_recommendations may not go below it)
+        """
+        return self._config.thresholds.get_for_stack(stack).reject
+
+    def _stack_thresholds(self, stack: Optional[str] = None) -> Tuple[int, int]:
+        """Get (auto_approve, approve_with_recommendations) with CLI overrides applied."""
+        # Check for CLI overrides
+        cli_auto = self._get_cli_override('thresholds.auto_approve')
+        cli_recommend = self._get_cli_override('thresholds.approve_with_recommendations')
+
+        # Get thresholds for stack
+        thresholds = self._config.thresholds.get_for_stack(stack)
+
+        return (
+            cli_auto if cli_auto is not None else thresholds.auto_approve,
+            cli_recommend if cli_recommend is not None else thresholds.approve_with_recommendations,
+        )
+
     def should_force_review(self, complexity: int, keywords: Optional[list] = None) -> bool:
         """
         Check if architectural review should be forced.
@@ -207,14 +436,18 @@ class PlanReviewConfig:
         Returns:
             True if review should be forced
         """
+        force_triggers = self._config.force_triggers
+
         # Check complexity threshold
-        if complexity >= self._config.force_triggers.min_complexity:
+        cli_min_complexity = self._get_cli_override('force_triggers.min_complexity')
+        min_complexity = cli_min_complexity if cli_min_complexity is not None else force_triggers.min_complexity
+        if complexity >= min_complexity:
             return True
 
         # Check critical keywords
         if keywords:
             keywords_lower = [k.lower() for k in keywords]
-            for critical in self._config.force_triggers.critical_keywords:
+            for critical in force_triggers.critical_keywords:
                 if critical.lower() in keywords_lower:
                     return True
 
@@ -272,19 +505,136 @@ class PlanReviewConfig:
         """
         return self._config.metrics.retention_days
 
+    def get_metrics_rollup_after_days(self) -> int:
+        """
+        Get age after which metrics are downsampled into daily rollups.
+
+        Returns:
+            Age in days (0 disables rollups)
+        """
+        return self._config.metrics.rollup_after_days
+
     def get_metrics_output_format(self) -> str:
         """
         Get metrics output format.
 
         Returns:
-            Output format (terminal only for MVP)
+            Output format ('terminal', 'json', 'csv' or 'prometheus')
         """
         return self._config.metrics.output_format
 
-    def reload(self) -> None:
-        """Reload configuration from all sources."""
-        self._config = None
-        self._cli_overrides = {}
+    def get_metrics_backend(self) -> str:
+        """
+        Get metrics storage backend.
+
+        Returns:
+            Backend identifier ('jsonl', 'segmented' or 'sqlite')
+        """
+        return self._config.metrics.backend
+
+    def get_metrics_encoding(self) -> str:
+        """
+        Get JSONL line encoding for new metrics.
+
+        Returns:
+            'json' or 'compact'
+        """
+        return self._config.metrics.encoding
+
+    def get_metrics_archive(self) -> str:
+        """
+        Get compression used to archive expired metrics.
+
+        Returns:
+            'none' (delete expired metrics), 'gzip' or 'lzma'
+        """
+        return self._config.metrics.archive
+
+    def get_metrics_repositories(self) -> Dict[str, str]:
+        """
+        Get repositories federated by the dashboard.
+
+        Returns:
+            Mapping of repository name to project root (empty for the
+            current repository only)
+        """
+        return dict(self._config.metrics.repositories)
+
+    def is_metrics_async(self) -> bool:
+        """
+        Check if metrics are written from a background thread.
+
+        Returns:
+            True if async writes are enabled
+        """
+        return self._config.metrics.async_writes
+
+    def get_metrics_dedup_window(self) -> int:
+        """
+        Get number of recent idempotency keys checked for duplicate writes.
+
+        Returns:
+            Window size in keys
+        """
+        return self._config.metrics.dedup_window
+
+    def is_metrics_buffered(self) -> bool:
+        """
+        Check if JSONL appends are batched through a buffered writer.
+
+        Returns:
+            True if buffered writes are enabled
+        """
+        return self._config.metrics.buffered_writes
+
+    def get_metrics_fsync_policy(self) -> str:
+        """
+        Get fsync policy of buffered metric writes.
+
+        Returns:
+            'never', 'batch' or 'record'
+        """
+        return self._config.metrics.fsync
+
+    def get_watch_interval(self) -> float:
+        """
+        Get how often ConfigWatcher polls settings.json.
+
+        Returns:
+            Poll interval in seconds
+        """
+        return self._config.watch_interval_seconds
+
+    def get_metrics_queue_size(self) -> int:
+        """
+        Get maximum number of metrics queued for async writes.
+
+        Returns:
+            Queue size
+        """
+        return self._config.metrics.queue_size
+
+    def get_metrics_overflow_policy(self) -> str:
+        """
+        Get async write overflow policy.
+
+        Returns:
+            'drop' or 'block'
+        """
+        return self._config.metrics.overflow_policy
+
+    def reload(self, keep_cli_overrides: bool = False) -> None:
+        """
+        Reload configuration from all sources.
+
+        Args:
+            keep_cli_overrides: Keep process-wide CLI overrides instead of
+                clearing them (used by ``ConfigWatcher`` when settings.json
+                changes); context-scoped overrides are never cleared
+        """
+        if not keep_cli_overrides:
+            with self._overrides_lock:
+                self._cli_overrides = _NO_OVERRIDES
         self._load_config()
 
     def get_raw_config(self) -> Dict[str, Any]:
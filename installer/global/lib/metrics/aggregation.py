@@ -0,0 +1,674 @@
+"""Mergeable partial aggregates of plan review metrics."""
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, Iterable, List, Optional, Sequence, Tuple
+
+from .metrics_index import parse_timestamp
+
+
+COMPLEXITY_BUCKETS = ['0-9', '10-19', '20-29', '30-39', '40+']
+
+PERCENTILES = (('p50', 0.50), ('p90', 0.90), ('p99', 0.99))
+
+# Returns (timestamp, metric) pairs of the metrics folded into a day's partial
+DayScanner = Callable[[str], Iterable[Tuple[Optional[datetime], Dict[str, Any]]]]
+
+
+def complexity_bucket(complexity: float) -> str:
+    """
+    Map a complexity score to its distribution bucket.
+
+    Args:
+        complexity: Complexity score
+
+    Returns:
+        Bucket label
+    """
+    if complexity < 10:
+        return '0-9'
+    elif complexity < 20:
+        return '10-19'
+    elif complexity < 30:
+        return '20-29'
+    elif complexity < 40:
+        return '30-39'
+    return '40+'
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error.
+
+    Positive values are counted in logarithmic buckets so that every
+    bucket's representative value is within ``relative_accuracy`` of the
+    values it holds (the DDSketch scheme). Memory depends on the value
+    range, not on the number of values, and sketches merge by adding
+    bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.02):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of quantile estimates
+        """
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = defaultdict(int)
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        """
+        Add a value to the sketch.
+
+        Args:
+            value: Observed value (non-positive values share one bucket)
+            count: Number of times the value was observed
+        """
+        self.count += count
+        if value <= 0:
+            self.zero_count += count
+        else:
+            self.bins[math.ceil(math.log(value) / self._log_gamma)] += count
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Merge another sketch with the same accuracy into this one.
+
+        Args:
+            other: Sketch to merge
+
+        Returns:
+            This sketch (for chaining)
+        """
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for index, count in other.bins.items():
+            self.bins[index] += count
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.bins) / (self._gamma + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary."""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'zero_count': self.zero_count,
+            'bins': {str(index): count for index, count in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QuantileSketch':
+        """Restore a sketch serialized with ``to_dict``."""
+        sketch = cls(data['relative_accuracy'])
+        sketch.zero_count = data['zero_count']
+        for index, count in data['bins'].items():
+            sketch.bins[int(index)] = count
+        sketch.count = sketch.zero_count + sum(sketch.bins.values())
+        return sketch
+
+
+class ScoreHistogram:
+    """
+    Mergeable histogram of 0-100 scores with one bucket per integer.
+
+    Quantiles are exact for integer scores.
+    """
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.bins: Dict[int, int] = defaultdict(int)
+        self.count = 0
+
+    def add(self, score: float, count: int = 1) -> None:
+        """
+        Add a score, rounded and clamped to 0-100.
+
+        Args:
+            score: Observed score
+            count: Number of times the score was observed
+        """
+        self.count += count
+        self.bins[min(100, max(0, int(round(score))))] += count
+
+    def merge(self, other: 'ScoreHistogram') -> 'ScoreHistogram':
+        """
+        Merge another histogram into this one.
+
+        Args:
+            other: Histogram to merge
+
+        Returns:
+            This histogram (for chaining)
+        """
+        self.count += other.count
+        for score, count in other.bins.items():
+            self.bins[score] += count
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Compute a quantile.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Score at the quantile, or None if the histogram is empty
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for score in sorted(self.bins):
+            seen += self.bins[score]
+            if rank < seen:
+                return float(score)
+        return float(max(self.bins))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary."""
+        return {str(score): count for score, count in self.bins.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScoreHistogram':
+        """Restore a histogram serialized with ``to_dict``."""
+        histogram = cls()
+        for score, count in data.items():
+            histogram.bins[int(score)] = count
+        histogram.count = sum(histogram.bins.values())
+        return histogram
+
+
+def percentiles(distribution) -> Dict[str, Optional[float]]:
+    """
+    Compute the dashboard percentiles of a sketch or histogram.
+
+    Args:
+        distribution: QuantileSketch or ScoreHistogram
+
+    Returns:
+        Mapping of 'p50'/'p90'/'p99' to values (None when empty)
+    """
+    return {name: distribution.quantile(q) for name, q in PERCENTILES}
+
+
+def stddev(count: int, total: float, sq_total: float) -> Optional[float]:
+    """
+    Compute a population standard deviation from running sums.
+
+    Args:
+        count: Number of values
+        total: Sum of values
+        sq_total: Sum of squared values
+
+    Returns:
+        Standard deviation, or None when there are no values
+    """
+    if not count:
+        return None
+    mean = total / count
+    return math.sqrt(max(0.0, sq_total / count - mean * mean))
+
+
+class StackAggregate:
+    """Per-stack (or per-repository) review counts plus score and duration distributions."""
+
+    def __init__(self):
+        """Initialize an empty stack aggregate."""
+        self.count = 0
+        self.score_sum = 0.0
+        self.scores = ScoreHistogram()
+        self.durations = QuantileSketch()
+
+    def merge(self, other: 'StackAggregate') -> 'StackAggregate':
+        """
+        Merge another stack aggregate into this one.
+
+        Args:
+            other: Stack aggregate to merge
+
+        Returns:
+            This aggregate (for chaining)
+        """
+        self.count += other.count
+        self.score_sum += other.score_sum
+        self.scores.merge(other.scores)
+        self.durations.merge(other.durations)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary."""
+        return {
+            'count': self.count,
+            'score_sum': self.score_sum,
+            'scores': self.scores.to_dict(),
+            'durations': self.durations.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StackAggregate':
+        """Restore a stack aggregate serialized with ``to_dict``."""
+        stack = cls()
+        stack.count = data['count']
+        stack.score_sum = data['score_sum']
+        stack.scores = ScoreHistogram.from_dict(data['scores'])
+        stack.durations = QuantileSketch.from_dict(data['durations'])
+        return stack
+
+
+class MetricsAggregate:
+    """
+    Single-pass, constant-memory fold over a set of metrics.
+
+    Aggregates keep running sums (and sums of squares), counts, buckets and
+    mergeable distributions (a score histogram and a duration quantile
+    sketch) but no per-metric state. They can be merged with each other and
+    round-trip through ``to_dict``/``from_dict``, so partial results (for
+    example one per day) can be cached and combined later. ``rollup``
+    records, which carry a serialized daily aggregate in place of the raw
+    events they replaced, are folded in by merging.
+    """
+
+    def __init__(self):
+        """Initialize an empty aggregate."""
+        self.total_reviews = 0
+        self.decisions: Dict[str, int] = defaultdict(int)
+        self.complexity_distribution: Dict[str, int] = defaultdict(int)
+        self.architectural_score_sum = 0.0
+        self.architectural_score_sq_sum = 0.0
+        self.complexity_score_sum = 0.0
+        self.architectural_scores = ScoreHistogram()
+        self.forced_reviews = 0
+        self.by_stack: Dict[str, StackAggregate] = defaultdict(StackAggregate)
+        self.by_repo: Dict[str, StackAggregate] = defaultdict(StackAggregate)
+        self.outcome_count = 0
+        self.duration_sum = 0.0
+        self.duration_sq_sum = 0.0
+        self.durations = QuantileSketch()
+        self.human_overrides = 0
+        self.outcomes: Dict[str, int] = defaultdict(int)
+
+    def add(self, metric: Dict[str, Any]) -> None:
+        """
+        Fold one metric into the aggregate.
+
+        Args:
+            metric: Metric dictionary
+        """
+        metric_type = metric.get('type')
+
+        if metric_type == 'decision':
+            self.total_reviews += 1
+            self.decisions[metric.get('decision', 'unknown')] += 1
+
+            arch_score = metric.get('architectural_score', 0)
+            self.architectural_score_sum += arch_score
+            self.architectural_score_sq_sum += arch_score * arch_score
+            self.architectural_scores.add(arch_score)
+
+            complexity = metric.get('complexity_score', 0)
+            self.complexity_score_sum += complexity
+            self.complexity_distribution[complexity_bucket(complexity)] += 1
+
+            if metric.get('forced', False):
+                self.forced_reviews += 1
+
+            groups = [self.by_stack[metric.get('stack') or 'unknown']]
+            if metric.get('repo'):
+                groups.append(self.by_repo[metric['repo']])
+            for group in groups:
+                group.count += 1
+                group.score_sum += arch_score
+                group.scores.add(arch_score)
+
+        elif metric_type == 'outcome':
+            duration = metric.get('duration_seconds', 0)
+            self.outcome_count += 1
+            self.duration_sum += duration
+            self.duration_sq_sum += duration * duration
+            self.durations.add(duration)
+            self.by_stack[metric.get('stack') or 'unknown'].durations.add(duration)
+            if metric.get('repo'):
+                self.by_repo[metric['repo']].durations.add(duration)
+
+            if metric.get('human_override', False):
+                self.human_overrides += 1
+
+            self.outcomes[metric.get('final_status', 'unknown')] += 1
+
+        elif metric_type == 'rollup':
+            aggregate = metric.get('aggregate')
+            if isinstance(aggregate, dict):
+                self.merge(MetricsAggregate.from_dict(aggregate))
+
+    def add_all(self, metrics: Iterable[Dict[str, Any]]) -> 'MetricsAggregate':
+        """
+        Fold an iterable of metrics into the aggregate in a single pass.
+
+        Args:
+            metrics: Metric dictionaries
+
+        Returns:
+            This aggregate (for chaining)
+        """
+        for metric in metrics:
+            self.add(metric)
+        return self
+
+    def merge(self, other: 'MetricsAggregate') -> 'MetricsAggregate':
+        """
+        Merge another aggregate into this one.
+
+        Args:
+            other: Aggregate to merge
+
+        Returns:
+            This aggregate (for chaining)
+        """
+        self.total_reviews += other.total_reviews
+        self.architectural_score_sum += other.architectural_score_sum
+        self.architectural_score_sq_sum += other.architectural_score_sq_sum
+        self.complexity_score_sum += other.complexity_score_sum
+        self.architectural_scores.merge(other.architectural_scores)
+        self.forced_reviews += other.forced_reviews
+        self.outcome_count += other.outcome_count
+        self.duration_sum += other.duration_sum
+        self.duration_sq_sum += other.duration_sq_sum
+        self.durations.merge(other.durations)
+        self.human_overrides += other.human_overrides
+
+        for target, source in (
+            (self.decisions, other.decisions),
+            (self.complexity_distribution, other.complexity_distribution),
+            (self.outcomes, other.outcomes),
+        ):
+            for key, count in source.items():
+                target[key] += count
+
+        for stack_name, stack in other.by_stack.items():
+            self.by_stack[stack_name].merge(stack)
+        for repo, group in other.by_repo.items():
+            self.by_repo[repo].merge(group)
+
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize to a JSON-compatible dictionary.
+
+        Returns:
+            Aggregate state
+        """
+        return {
+            'total_reviews': self.total_reviews,
+            'decisions': dict(self.decisions),
+            'complexity_distribution': dict(self.complexity_distribution),
+            'architectural_score_sum': self.architectural_score_sum,
+            'architectural_score_sq_sum': self.architectural_score_sq_sum,
+            'complexity_score_sum': self.complexity_score_sum,
+            'architectural_scores': self.architectural_scores.to_dict(),
+            'forced_reviews': self.forced_reviews,
+            'by_stack': {name: stack.to_dict() for name, stack in self.by_stack.items()},
+            'by_repo': {name: group.to_dict() for name, group in self.by_repo.items()},
+            'outcome_count': self.outcome_count,
+            'duration_sum': self.duration_sum,
+            'duration_sq_sum': self.duration_sq_sum,
+            'durations': self.durations.to_dict(),
+            'human_overrides': self.human_overrides,
+            'outcomes': dict(self.outcomes),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MetricsAggregate':
+        """
+        Restore an aggregate serialized with ``to_dict``.
+
+        Args:
+            data: Aggregate state
+
+        Returns:
+            MetricsAggregate instance
+        """
+        aggregate = cls()
+        aggregate.total_reviews = data['total_reviews']
+        aggregate.architectural_score_sum = data['architectural_score_sum']
+        aggregate.architectural_score_sq_sum = data.get('architectural_score_sq_sum', 0.0)
+        aggregate.complexity_score_sum = data['complexity_score_sum']
+        aggregate.architectural_scores = ScoreHistogram.from_dict(data['architectural_scores'])
+        aggregate.forced_reviews = data['forced_reviews']
+        aggregate.outcome_count = data['outcome_count']
+        aggregate.duration_sum = data['duration_sum']
+        aggregate.duration_sq_sum = data.get('duration_sq_sum', 0.0)
+        aggregate.durations = QuantileSketch.from_dict(data['durations'])
+        aggregate.human_overrides = data['human_overrides']
+        aggregate.decisions.update(data['decisions'])
+        aggregate.complexity_distribution.update(data['complexity_distribution'])
+        aggregate.outcomes.update(data['outcomes'])
+        for name, stack in data['by_stack'].items():
+            aggregate.by_stack[name] = StackAggregate.from_dict(stack)
+        for name, group in data.get('by_repo', {}).items():
+            aggregate.by_repo[name] = StackAggregate.from_dict(group)
+        return aggregate
+
+    def assign_repo(self, repo: str) -> 'MetricsAggregate':
+        """
+        Attribute every review in this aggregate to one repository.
+
+        Used for aggregates computed from a single repository's storage,
+        whose records do not carry a ``repo`` field.
+
+        Args:
+            repo: Repository name
+
+        Returns:
+            This aggregate (for chaining)
+        """
+        group = StackAggregate()
+        group.count = self.total_reviews
+        group.score_sum = self.architectural_score_sum
+        group.scores.merge(self.architectural_scores)
+        group.durations.merge(self.durations)
+        self.by_repo.clear()
+        self.by_repo[repo] = group
+        return self
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Build the dashboard summary from the aggregate.
+
+        Returns:
+            Aggregated summary
+        """
+        reviews = self.total_reviews
+        return {
+            'total_reviews': reviews,
+            'decisions': defaultdict(int, self.decisions),
+            'complexity_distribution': defaultdict(int, self.complexity_distribution),
+            'avg_architectural_score': self.architectural_score_sum / reviews if reviews else 0.0,
+            'avg_complexity_score': self.complexity_score_sum / reviews if reviews else 0.0,
+            'avg_duration': self.duration_sum / self.outcome_count if self.outcome_count else 0.0,
+            'architectural_score_stddev': stddev(
+                reviews, self.architectural_score_sum, self.architectural_score_sq_sum
+            ),
+            'duration_stddev': stddev(self.outcome_count, self.duration_sum, self.duration_sq_sum),
+            'architectural_score_percentiles': percentiles(self.architectural_scores),
+            'duration_percentiles': percentiles(self.durations),
+            'forced_reviews': self.forced_reviews,
+            'human_overrides': self.human_overrides,
+            'by_stack': _group_summaries(self.by_stack),
+            'by_repo': _group_summaries(self.by_repo),
+            'outcomes': defaultdict(int, self.outcomes),
+        }
+
+
+def _group_summaries(groups: Dict[str, StackAggregate]) -> Dict[str, Dict[str, Any]]:
+    """Summarize per-stack or per-repository groups for the dashboard."""
+    return {
+        name: {
+            'count': group.count,
+            'avg_score': group.score_sum / group.count if group.count else 0.0,
+            'score_percentiles': percentiles(group.scores),
+            'duration_percentiles': percentiles(group.durations),
+        }
+        for name, group in groups.items()
+    }
+
+
+def fold_windows(
+    metrics: Iterable[Dict[str, Any]],
+    windows: Sequence[int],
+    now: Optional[datetime] = None
+) -> Dict[int, Tuple[MetricsAggregate, MetricsAggregate]]:
+    """
+    Aggregate several trailing windows and their preceding periods in one pass.
+
+    Each metric is folded into every window it falls in: the current period
+    of an N-day window is the last N days, and the previous period is the N
+    days before that (used for trend comparisons).
+
+    Args:
+        metrics: Metric dictionaries covering at least the last
+            ``2 * max(windows)`` days
+        windows: Window lengths in days
+        now: Reference time (default: current UTC time)
+
+    Returns:
+        Mapping of window length to (current, previous) aggregates
+    """
+    now = now or datetime.utcnow()
+    result = {days: (MetricsAggregate(), MetricsAggregate()) for days in windows}
+    cutoffs = [
+        (now - timedelta(days=days), now - timedelta(days=2 * days), result[days])
+        for days in result
+    ]
+
+    for metric in metrics:
+        timestamp = parse_timestamp(metric)
+        if timestamp is None:
+            continue
+        for current_start, previous_start, (current, previous) in cutoffs:
+            if timestamp >= current_start:
+                current.add(metric)
+            elif timestamp >= previous_start:
+                previous.add(metric)
+
+    return result
+
+
+def merge_daily(
+    daily: Dict[str, MetricsAggregate],
+    days: int,
+    scan_day: DayScanner,
+    now: Optional[datetime] = None
+) -> MetricsAggregate:
+    """
+    Merge per-day partial aggregates covering the last N days.
+
+    Days entirely inside the window are merged from their partials; the
+    UTC day containing ``now - N days`` is clipped to the exact cutoff by
+    folding its metrics from ``scan_day``, so the result matches folding
+    ``iter_recent_metrics(N)``.
+
+    Args:
+        daily: Mapping of ISO date to partial aggregate
+        days: Number of days to look back
+        scan_day: Returns (timestamp, metric) pairs of the metrics in a
+            day's partial
+        now: Reference time (default: current UTC time)
+
+    Returns:
+        Aggregate over the window
+    """
+    start = (now or datetime.utcnow()) - timedelta(days=days)
+    return _merge_range(daily, scan_day, start)
+
+
+def merge_daily_windows(
+    daily: Dict[str, MetricsAggregate],
+    windows: Sequence[int],
+    scan_day: DayScanner,
+    now: Optional[datetime] = None
+) -> Dict[int, Tuple[MetricsAggregate, MetricsAggregate]]:
+    """
+    Merge per-day partial aggregates into several windows and their previous periods.
+
+    Boundary days are clipped as in ``merge_daily``; each is scanned at
+    most once however many windows share it.
+
+    Args:
+        daily: Mapping of ISO date to partial aggregate
+        windows: Window lengths in days
+        scan_day: Returns (timestamp, metric) pairs of the metrics in a
+            day's partial
+        now: Reference time (default: current UTC time)
+
+    Returns:
+        Mapping of window length to (current, previous) aggregates, where
+        the previous period is the N days before the window
+    """
+    now = now or datetime.utcnow()
+    scanned: Dict[str, List[Tuple[Optional[datetime], Dict[str, Any]]]] = {}
+
+    def scan_once(day: str) -> List[Tuple[Optional[datetime], Dict[str, Any]]]:
+        if day not in scanned:
+            scanned[day] = list(scan_day(day))
+        return scanned[day]
+
+    result = {}
+    for days in windows:
+        start = now - timedelta(days=days)
+        result[days] = (
+            _merge_range(daily, scan_once, start),
+            _merge_range(daily, scan_once, start - timedelta(days=days), start),
+        )
+    return result
+
+
+def _merge_range(
+    daily: Dict[str, MetricsAggregate],
+    scan_day: DayScanner,
+    start: datetime,
+    end: Optional[datetime] = None
+) -> MetricsAggregate:
+    """Merge partials for ``start <= timestamp < end``, scanning the boundary days."""
+    first_day = start.date().isoformat()
+    last_day = end.date().isoformat() if end is not None else None
+    result = MetricsAggregate()
+    for day, partial in daily.items():
+        if day < first_day or (last_day is not None and day > last_day):
+            continue
+        if day != first_day and day != last_day:
+            result.merge(partial)
+            continue
+        for timestamp, metric in scan_day(day):
+            if timestamp is not None and timestamp >= start and (end is None or timestamp < end):
+                result.add(metric)
+    return result
@@ -0,0 +1,135 @@
+"""Persisted, incrementally updated per-day aggregates of the metrics file."""
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .aggregation import MetricsAggregate, merge_daily, merge_daily_windows
+from .metrics_archive import MetricsArchive
+from .metrics_index import SidecarIndex, parse_timestamp
+from .records import decode_metric
+from ..utils import FileOperations
+
+
+class AggregationCache(SidecarIndex):
+    """
+    Per-day partial aggregates plus the last processed file offset.
+
+    Each sync folds only the lines appended since the previous one into
+    their day's partial, so on a warm cache the cost of a dashboard render
+    depends on new data rather than on history size. Each day also records
+    the byte span its lines were found in; the day containing a window's
+    cutoff is clipped exactly by re-reading only that span, so windows
+    match ``iter_recent_metrics``.
+    """
+
+    VERSION = 4
+    KIND = 'aggregates'
+
+    def __init__(
+        self,
+        metrics_file: Path,
+        cache_file: Optional[Path] = None,
+        persist: bool = True,
+        archive: Optional[MetricsArchive] = None
+    ):
+        """
+        Initialize aggregation cache.
+
+        Args:
+            metrics_file: JSONL metrics file being aggregated
+            cache_file: Cache path (default: <metrics stem>.aggregates.json)
+            persist: Write updates back to the cache file (False keeps them
+                in memory, e.g. for a live tail)
+            archive: Cold tier whose days are merged into every window
+                (default: only the metrics file is aggregated)
+        """
+        super().__init__(metrics_file, cache_file or metrics_file.with_suffix('.aggregates.json'), persist)
+        self.archive = archive
+
+    def _reset_state(self) -> None:
+        self.daily: Dict[str, MetricsAggregate] = {}
+        self.spans: Dict[str, List[int]] = {}
+
+    def _observe(self, offset: int, length: int, metric: Dict[str, Any]) -> None:
+        timestamp = parse_timestamp(metric)
+        if timestamp is None:
+            return
+
+        day = timestamp.date().isoformat()
+        partial = self.daily.get(day)
+        if partial is None:
+            partial = self.daily[day] = MetricsAggregate()
+            self.spans[day] = [offset, offset + length]
+        partial.add(metric)
+        self.spans[day][1] = offset + length
+
+    def _dump_state(self) -> Dict[str, Any]:
+        return {
+            'daily': {day: partial.to_dict() for day, partial in sorted(self.daily.items())},
+            'spans': self.spans,
+        }
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        self.daily = {day: MetricsAggregate.from_dict(data) for day, data in state['daily'].items()}
+        self.spans = {day: [int(start), int(end)] for day, (start, end) in state['spans'].items()}
+
+    def scan_day(self, day: str) -> List[Tuple[Optional[datetime], Dict[str, Any]]]:
+        """
+        Re-read the metrics folded into a day's partial.
+
+        Args:
+            day: ISO date
+
+        Returns:
+            (timestamp, metric) pairs in file order
+        """
+        span = self.spans.get(day)
+        if span is None:
+            return []
+        found = []
+        for offset, raw_line in FileOperations.iter_lines(self.metrics_file, span[0]):
+            if offset >= span[1]:
+                break
+            try:
+                metric = decode_metric(raw_line)
+            except ValueError:
+                continue
+            timestamp = parse_timestamp(metric) if isinstance(metric, dict) else None
+            if timestamp is not None and timestamp.date().isoformat() == day:
+                found.append((timestamp, metric))
+        return found
+
+    def aggregate(self, days: int = 30) -> MetricsAggregate:
+        """
+        Merge the cached daily partials covering the last N days.
+
+        Args:
+            days: Number of days to look back
+
+        Returns:
+            Aggregate over the window
+        """
+        self.sync()
+        aggregate = merge_daily(self.daily, days, self.scan_day)
+        if self.archive is not None:
+            aggregate.merge(self.archive.aggregate(days))
+        return aggregate
+
+    def aggregate_windows(self, windows: Sequence[int]) -> Dict[int, Tuple[MetricsAggregate, MetricsAggregate]]:
+        """
+        Merge the cached daily partials into several windows at once.
+
+        Args:
+            windows: Window lengths in days
+
+        Returns:
+            Mapping of window length to (current, previous) aggregates,
+            where the previous period is the N days before the window
+        """
+        self.sync()
+        result = merge_daily_windows(self.daily, windows, self.scan_day)
+        if self.archive is not None:
+            for days, (current, previous) in self.archive.aggregate_windows(windows).items():
+                result[days][0].merge(current)
+                result[days][1].merge(previous)
+        return result
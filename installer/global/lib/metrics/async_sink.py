@@ -0,0 +1,222 @@
+"""Background-thread metric sink with a bounded queue."""
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Dict, Any, Literal, Optional
+
+from .storage_backend import MetricsBackend
+
+OverflowPolicy = Literal['drop', 'block']
+
+_STOP = object()
+
+
+class AsyncMetricsSink:
+    """
+    Fire-and-forget metric writer.
+
+    ``submit`` puts the metric on a bounded queue and returns immediately;
+    a daemon thread serializes and appends queued metrics to the storage
+    backend. When the queue is full the metric is either dropped (and
+    counted) or the caller blocks until there is room, depending on the
+    overflow policy. ``close`` (also run at process exit) drains the queue
+    and flushes the backend; metrics it cannot write in time are counted
+    as dropped.
+    """
+
+    def __init__(
+        self,
+        storage: MetricsBackend,
+        max_queue: int = 1000,
+        overflow: OverflowPolicy = 'drop',
+        block_timeout: Optional[float] = None
+    ):
+        """
+        Initialize async sink.
+
+        Args:
+            storage: Backend the worker thread appends to
+            max_queue: Maximum number of queued metrics
+            overflow: 'drop' discards metrics when the queue is full,
+                'block' waits for room
+            block_timeout: With 'block', give up (and drop) after this many
+                seconds (default: wait indefinitely)
+        """
+        if overflow not in ('drop', 'block'):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self.storage = storage
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+
+        self._lock = threading.Lock()
+        # Held while checking for close and queueing, so nothing is queued
+        # behind the stop marker
+        self._submit_lock = threading.Lock()
+        self._closed = False
+        self._pid: Optional[int] = None
+        self._queue: 'queue.Queue[Any]' = queue.Queue(max_queue)
+        self._thread: Optional[threading.Thread] = None
+
+        atexit.register(self.close)
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread (again, in a forked child)."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Threads do not survive fork; metrics queued in the parent
+                # are the parent's to write
+                self._queue = queue.Queue(self.max_queue)
+            self._thread = threading.Thread(target=self._run, name='metrics-sink', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def submit(self, metric: Dict[str, Any]) -> bool:
+        """
+        Queue a metric for writing.
+
+        Args:
+            metric: Metric dictionary
+
+        Returns:
+            True if queued, False if dropped (queue full or sink closed)
+        """
+        with self._submit_lock:
+            if self._closed:
+                self._count('dropped')
+                return False
+            self._ensure_worker()
+            try:
+                if self.overflow == 'block':
+                    self._queue.put(metric, timeout=self.block_timeout)
+                else:
+                    self._queue.put_nowait(metric)
+            except queue.Full:
+                self._count('dropped')
+                return False
+
+        self._count('submitted')
+        return True
+
+    def _count(self, counter: str) -> None:
+        """Increment a counter."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _run(self) -> None:
+        """Worker loop: append queued metrics, flushing when the queue drains."""
+        work = self._queue
+        while True:
+            item = work.get()
+            if item is _STOP:
+                self.storage.flush()
+                work.task_done()
+                break
+            try:
+                self._count('written' if self.storage.append_metric(item) else 'failed')
+                if work.empty():
+                    self.storage.flush()
+            except Exception as e:
+                print(f"Warning: Failed to write metric: {e}")
+                self._count('failed')
+            work.task_done()
+
+    def drain(self) -> None:
+        """Wait until every queued metric has been written and flushed."""
+        if self._pid == os.getpid() and not self._closed:
+            self._queue.join()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get sink counters.
+
+        Returns:
+            Submitted, written, failed, dropped and currently queued counts
+        """
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'written': self.written,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'queued': self._queue.qsize(),
+            }
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting metrics, drain the queue and flush the backend.
+
+        Metrics still queued when the timeout expires are discarded and
+        counted as dropped.
+
+        Args:
+            timeout: Maximum seconds to wait for the queue to drain
+                (default: wait until done)
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+
+        if self._pid != os.getpid() or self._thread is None:
+            return
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        # A submit blocked on a full queue holds the submit lock
+        if not self._submit_lock.acquire(timeout=-1 if deadline is None else remaining()):
+            self._abandon(timeout)
+            return
+        try:
+            self._queue.put(_STOP, timeout=remaining())
+        except queue.Full:
+            self._abandon(timeout)
+            return
+        finally:
+            self._submit_lock.release()
+
+        self._thread.join(remaining())
+        if self._thread.is_alive():
+            self._abandon(timeout)
+
+    def _abandon(self, timeout: Optional[float]) -> None:
+        """Discard queued metrics after the worker failed to drain them in time."""
+        discarded = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._queue.task_done()
+            if item is not _STOP:
+                discarded += 1
+        with self._lock:
+            self.dropped += discarded
+        try:
+            # Let the worker exit once its current write returns
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            pass
+        print(f"Warning: Metrics sink did not drain within {timeout}s; "
+              f"{discarded} metrics not written")
+
+    def __enter__(self) -> 'AsyncMetricsSink':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
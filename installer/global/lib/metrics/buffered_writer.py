@@ -0,0 +1,184 @@
+"""Buffered batch writer for JSONL metrics with configurable fsync policy."""
+import atexit
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Literal, Optional
+
+from ..utils import FileLock, FileOperations
+
+FsyncPolicy = Literal['never', 'batch', 'record']
+
+
+class BufferedMetricsWriter:
+    """
+    Keeps the metrics file open and writes metric lines in batches.
+
+    Lines are buffered in memory and flushed when the batch reaches
+    ``max_records`` lines or ``max_bytes`` bytes, when ``flush_interval``
+    seconds have elapsed since the last flush (checked on each write), on
+    ``close()`` and at process exit.
+
+    Fsync policies trade durability against throughput:
+
+    - ``never``: rely on the OS page cache (fastest)
+    - ``batch``: one fsync after each flushed batch
+    - ``record``: write and fsync every record individually (most durable)
+
+    Batches are written under the metrics file lock, and the handle is
+    reopened if the file was replaced (e.g. by compaction in another process)
+    so no batch lands in an unlinked file.
+    """
+
+    def __init__(
+        self,
+        metrics_file: Path,
+        max_records: int = 100,
+        max_bytes: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        fsync: FsyncPolicy = 'never'
+    ):
+        """
+        Initialize buffered writer.
+
+        Args:
+            metrics_file: JSONL file to append to
+            max_records: Flush once this many lines are buffered
+            max_bytes: Flush once this many bytes are buffered
+            flush_interval: Flush when this many seconds passed since last flush
+            fsync: Fsync policy ('never', 'batch' or 'record')
+        """
+        if fsync not in ('never', 'batch', 'record'):
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+
+        self.metrics_file = metrics_file
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+
+        self._fd: Optional[int] = None
+        self._buffer: List[bytes] = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.file_lock = FileLock.for_path(metrics_file.with_suffix('.lock'))
+
+        atexit.register(self.close)
+
+    def _open(self) -> int:
+        """Open the metrics file for appending if not already open."""
+        if self._fd is None:
+            FileOperations.ensure_directory(self.metrics_file.parent)
+            self._fd = os.open(self.metrics_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def write(self, data: bytes) -> bool:
+        """
+        Buffer one encoded metric line.
+
+        Args:
+            data: Encoded line including trailing newline
+
+        Returns:
+            True if buffered (and flushed, when due) successfully
+        """
+        with self._lock:
+            if self._closed:
+                return False
+
+            if self.fsync == 'record':
+                return self._write_batch([data])
+
+            self._buffer.append(data)
+            self._buffered_bytes += len(data)
+
+            if (
+                len(self._buffer) >= self.max_records
+                or self._buffered_bytes >= self.max_bytes
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                return self._flush_locked()
+            return True
+
+    def flush(self) -> bool:
+        """
+        Write all buffered lines to the metrics file.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> bool:
+        """Flush the buffer; caller must hold the lock."""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return True
+
+        batch = self._buffer
+        self._buffer = []
+        self._buffered_bytes = 0
+        return self._write_batch(batch)
+
+    def _write_batch(self, batch: List[bytes]) -> bool:
+        """Write a batch with one write() call and apply the fsync policy."""
+        data = b''.join(batch)
+        try:
+            with self.file_lock:
+                return self._write_locked(data)
+        except OSError as e:
+            print(f"Warning: Failed to write {len(batch)} metric(s) to {self.metrics_file}: {e}")
+            return False
+
+    def _write_locked(self, data: bytes) -> bool:
+        """Write data with the file lock held, following file replacement."""
+        if self._fd is not None:
+            try:
+                replaced = os.fstat(self._fd).st_ino != os.stat(self.metrics_file).st_ino
+            except FileNotFoundError:
+                replaced = True
+            if replaced:
+                self._close_fd()
+
+        fd = self._open()
+        written = os.write(fd, data)
+        while written < len(data):
+            written += os.write(fd, data[written:])
+        if self.fsync != 'never':
+            os.fsync(fd)
+        return True
+
+    def reopen(self) -> None:
+        """Flush and close the file handle so the next write reopens the path."""
+        with self._lock:
+            self._flush_locked()
+            self._close_fd()
+
+    def _close_fd(self) -> None:
+        """Close the underlying file descriptor if open."""
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+    def close(self) -> None:
+        """Flush remaining lines and close the file handle."""
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_locked()
+            self._close_fd()
+            self._closed = True
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> 'BufferedMetricsWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
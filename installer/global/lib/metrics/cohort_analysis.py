@@ -0,0 +1,169 @@
+"""Join complexity, decision and outcome events per task and analyze cohorts."""
+from collections import defaultdict
+from typing import Dict, Any, Iterable, Literal, Optional
+
+from .aggregation import QuantileSketch, complexity_bucket, percentiles
+from .metrics_index import parse_timestamp
+
+CohortKey = Literal['stack', 'complexity_bucket', 'decision']
+
+
+class TaskLifecycle:
+    """Latest complexity, decision and outcome facts for one task."""
+
+    __slots__ = (
+        'task_id', 'stack', 'complexity_score', 'decision', 'architectural_score',
+        'forced', 'decided_at', 'human_override', 'duration_seconds',
+        'final_status', 'completed_at',
+    )
+
+    def __init__(self, task_id: str):
+        """
+        Initialize an empty lifecycle.
+
+        Args:
+            task_id: Task identifier
+        """
+        self.task_id = task_id
+        self.stack: Optional[str] = None
+        self.complexity_score: Optional[float] = None
+        self.decision: Optional[str] = None
+        self.architectural_score: Optional[float] = None
+        self.forced = False
+        self.decided_at = None
+        self.human_override = False
+        self.duration_seconds: Optional[float] = None
+        self.final_status: Optional[str] = None
+        self.completed_at = None
+
+    def add(self, metric: Dict[str, Any]) -> None:
+        """
+        Fold one of the task's events into the lifecycle (later events win).
+
+        Args:
+            metric: Metric dictionary
+        """
+        metric_type = metric.get('type')
+        if metric.get('stack'):
+            self.stack = metric['stack']
+
+        if metric_type == 'complexity':
+            self.complexity_score = metric.get('complexity_score', self.complexity_score)
+        elif metric_type == 'decision':
+            self.decision = metric.get('decision')
+            self.architectural_score = metric.get('architectural_score')
+            self.complexity_score = metric.get('complexity_score', self.complexity_score)
+            self.forced = bool(metric.get('forced', False))
+            self.decided_at = parse_timestamp(metric)
+        elif metric_type == 'outcome':
+            self.human_override = bool(metric.get('human_override', False))
+            self.duration_seconds = metric.get('duration_seconds')
+            self.final_status = metric.get('final_status')
+            self.completed_at = parse_timestamp(metric)
+            if self.decision is None:
+                self.decision = metric.get('decision')
+
+    def cohort(self, by: CohortKey) -> str:
+        """
+        Get the cohort this task belongs to.
+
+        Args:
+            by: Cohort dimension
+
+        Returns:
+            Cohort label ('unknown' when the dimension was never recorded)
+        """
+        if by == 'stack':
+            return self.stack or 'unknown'
+        if by == 'complexity_bucket':
+            return complexity_bucket(self.complexity_score) if self.complexity_score is not None else 'unknown'
+        if by == 'decision':
+            return self.decision or 'unknown'
+        raise ValueError(f"Unknown cohort dimension: {by}")
+
+
+def join_task_events(metrics: Iterable[Dict[str, Any]]) -> Dict[str, TaskLifecycle]:
+    """
+    Join complexity, decision and outcome events by task_id in one pass.
+
+    Args:
+        metrics: Metric dictionaries in recording order
+
+    Returns:
+        Mapping of task_id to its lifecycle
+    """
+    tasks: Dict[str, TaskLifecycle] = {}
+    for metric in metrics:
+        if metric.get('type') not in ('complexity', 'decision', 'outcome'):
+            continue
+        task_id = metric.get('task_id')
+        if task_id is None:
+            continue
+        lifecycle = tasks.get(task_id)
+        if lifecycle is None:
+            lifecycle = tasks[task_id] = TaskLifecycle(task_id)
+        lifecycle.add(metric)
+    return tasks
+
+
+def cohort_analysis(metrics: Iterable[Dict[str, Any]], by: CohortKey = 'stack') -> Dict[str, Dict[str, Any]]:
+    """
+    Compare task cohorts on review latency, overrides and outcomes.
+
+    Events are joined per task in one pass, then each task is folded into
+    its cohort.
+
+    Args:
+        metrics: Metric dictionaries in recording order
+        by: Cohort dimension: 'stack', 'complexity_bucket' or 'decision'
+
+    Returns:
+        Mapping of cohort label to statistics: task, decided and completed
+        counts, override count and rate, average review duration, and
+        decision-to-outcome latency (average and p50/p90/p99 seconds)
+    """
+    cohorts: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
+        'tasks': 0,
+        'decided': 0,
+        'completed': 0,
+        'overrides': 0,
+        'duration_sum': 0.0,
+        'latency_sum': 0.0,
+        'latency': QuantileSketch(),
+        'outcomes': defaultdict(int),
+    })
+
+    for task in join_task_events(metrics).values():
+        cohort = cohorts[task.cohort(by)]
+        cohort['tasks'] += 1
+        if task.decided_at is not None or task.architectural_score is not None:
+            cohort['decided'] += 1
+        if task.final_status is None:
+            continue
+
+        cohort['completed'] += 1
+        cohort['outcomes'][task.final_status] += 1
+        if task.human_override:
+            cohort['overrides'] += 1
+        cohort['duration_sum'] += task.duration_seconds or 0
+        if task.decided_at is not None and task.completed_at is not None:
+            latency = max(0.0, (task.completed_at - task.decided_at).total_seconds())
+            cohort['latency_sum'] += latency
+            cohort['latency'].add(latency)
+
+    result = {}
+    for name, cohort in sorted(cohorts.items()):
+        completed = cohort['completed']
+        latency: QuantileSketch = cohort['latency']
+        result[name] = {
+            'tasks': cohort['tasks'],
+            'decided': cohort['decided'],
+            'completed': completed,
+            'overrides': cohort['overrides'],
+            'override_rate': cohort['overrides'] / completed if completed else 0.0,
+            'avg_duration': cohort['duration_sum'] / completed if completed else 0.0,
+            'avg_decision_to_outcome': cohort['latency_sum'] / latency.count if latency.count else None,
+            'decision_to_outcome_percentiles': percentiles(latency),
+            'outcomes': dict(cohort['outcomes']),
+        }
+    return result
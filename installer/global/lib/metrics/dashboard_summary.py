@@ -0,0 +1,213 @@
+"""Structured dashboard summary with JSON, CSV and Prometheus serializers."""
+import csv
+import io
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+
+from .aggregation import MetricsAggregate
+
+
+PROMETHEUS_PREFIX = 'plan_review_'
+
+# Exported series: name (without prefix) -> help text
+_SERIES = {
+    'reviews': 'Plan reviews in the window',
+    'forced_reviews': 'Forced plan reviews in the window',
+    'human_overrides': 'Reviews whose decision was overridden by a human',
+    'architectural_score_avg': 'Mean architectural score (0-100)',
+    'complexity_score_avg': 'Mean complexity score',
+    'duration_seconds_avg': 'Mean review duration in seconds',
+    'architectural_score_stddev': 'Standard deviation of the architectural score',
+    'duration_seconds_stddev': 'Standard deviation of review duration in seconds',
+    'architectural_score': 'Architectural score quantiles (0-100)',
+    'duration_seconds': 'Review duration quantiles in seconds',
+    'decisions': 'Reviews by decision',
+    'complexity_reviews': 'Reviews by complexity bucket',
+    'outcomes': 'Reviewed tasks by final status',
+    'stack_reviews': 'Plan reviews by technology stack',
+    'stack_architectural_score_avg': 'Mean architectural score by technology stack',
+    'stack_architectural_score': 'Architectural score quantiles by technology stack',
+    'stack_duration_seconds': 'Review duration quantiles by technology stack',
+    'repo_reviews': 'Plan reviews by repository',
+    'repo_architectural_score_avg': 'Mean architectural score by repository',
+    'repo_architectural_score': 'Architectural score quantiles by repository',
+    'repo_duration_seconds': 'Review duration quantiles by repository',
+}
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+@dataclass
+class DashboardSummary:
+    """
+    Aggregated dashboard summary for one window.
+
+    Computed once from a ``MetricsAggregate`` and then rendered in any
+    output format.
+    """
+
+    days: int
+    total_reviews: int
+    forced_reviews: int
+    human_overrides: int
+    avg_architectural_score: float
+    avg_complexity_score: float
+    avg_duration: float
+    architectural_score_stddev: Optional[float]
+    duration_stddev: Optional[float]
+    architectural_score_percentiles: Dict[str, Optional[float]]
+    duration_percentiles: Dict[str, Optional[float]]
+    decisions: Dict[str, int]
+    complexity_distribution: Dict[str, int]
+    by_stack: Dict[str, Dict[str, Any]]
+    by_repo: Dict[str, Dict[str, Any]]
+    outcomes: Dict[str, int]
+    generated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat() + 'Z')
+
+    @classmethod
+    def from_aggregate(cls, aggregate: MetricsAggregate, days: int) -> 'DashboardSummary':
+        """
+        Build a summary from an aggregate.
+
+        Args:
+            aggregate: Aggregate over the window
+            days: Window length in days
+
+        Returns:
+            DashboardSummary instance
+        """
+        summary = aggregate.summary()
+        for key in ('decisions', 'complexity_distribution', 'outcomes'):
+            summary[key] = dict(summary[key])
+        return cls(days=days, **summary)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to a JSON-compatible dictionary.
+
+        Returns:
+            Summary fields
+        """
+        return asdict(self)
+
+    def samples(self) -> Iterator[Sample]:
+        """
+        Flatten the summary into labelled numeric samples.
+
+        Yields:
+            (series name, labels, value) tuples; empty percentiles and
+            standard deviations are skipped
+        """
+        yield 'reviews', {}, self.total_reviews
+        yield 'forced_reviews', {}, self.forced_reviews
+        yield 'human_overrides', {}, self.human_overrides
+        yield 'architectural_score_avg', {}, self.avg_architectural_score
+        yield 'complexity_score_avg', {}, self.avg_complexity_score
+        yield 'duration_seconds_avg', {}, self.avg_duration
+        if self.architectural_score_stddev is not None:
+            yield 'architectural_score_stddev', {}, self.architectural_score_stddev
+        if self.duration_stddev is not None:
+            yield 'duration_seconds_stddev', {}, self.duration_stddev
+        yield from _quantile_samples('architectural_score', {}, self.architectural_score_percentiles)
+        yield from _quantile_samples('duration_seconds', {}, self.duration_percentiles)
+
+        for decision, count in sorted(self.decisions.items()):
+            yield 'decisions', {'decision': decision}, count
+        for bucket, count in sorted(self.complexity_distribution.items()):
+            yield 'complexity_reviews', {'bucket': bucket}, count
+        for status, count in sorted(self.outcomes.items()):
+            yield 'outcomes', {'status': status}, count
+
+        for dimension, groups in (('stack', self.by_stack), ('repo', self.by_repo)):
+            for name, data in sorted(groups.items()):
+                labels = {dimension: name}
+                yield f'{dimension}_reviews', labels, data['count']
+                yield f'{dimension}_architectural_score_avg', labels, data['avg_score']
+                yield from _quantile_samples(f'{dimension}_architectural_score', labels, data['score_percentiles'])
+                yield from _quantile_samples(f'{dimension}_duration_seconds', labels, data['duration_percentiles'])
+
+
+def _quantile_samples(name: str, labels: Dict[str, str], values: Dict[str, Optional[float]]) -> Iterator[Sample]:
+    """Yield one sample per non-empty percentile, labelled with its quantile."""
+    for percentile, value in values.items():
+        if value is not None:
+            yield name, {**labels, 'quantile': str(int(percentile[1:]) / 100)}, value
+
+
+def to_json(summaries: Sequence[DashboardSummary]) -> str:
+    """
+    Serialize summaries as JSON.
+
+    Args:
+        summaries: One summary per window
+
+    Returns:
+        A JSON object for a single window, or ``{"windows": [...]}`` otherwise
+    """
+    if len(summaries) == 1:
+        return json.dumps(summaries[0].to_dict(), indent=2)
+    return json.dumps({'windows': [summary.to_dict() for summary in summaries]}, indent=2)
+
+
+def to_csv(summaries: Sequence[DashboardSummary]) -> str:
+    """
+    Serialize summaries as CSV with one row per sample.
+
+    Args:
+        summaries: One summary per window
+
+    Returns:
+        CSV text with columns window_days, metric, labels, value
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(['window_days', 'metric', 'labels', 'value'])
+    for summary in summaries:
+        for name, labels, value in summary.samples():
+            label_text = ';'.join(f"{key}={val}" for key, val in labels.items())
+            writer.writerow([summary.days, name, label_text, value])
+    return buffer.getvalue()
+
+
+def to_prometheus(summaries: Sequence[DashboardSummary]) -> str:
+    """
+    Serialize summaries in the Prometheus text exposition format.
+
+    Every series is a gauge labelled with ``window_days``.
+
+    Args:
+        summaries: One summary per window
+
+    Returns:
+        Exposition text
+    """
+    series: Dict[str, List[str]] = {name: [] for name in _SERIES}
+    for summary in summaries:
+        for name, labels, value in summary.samples():
+            label_text = ','.join(
+                f'{key}="{_escape_label(val)}"'
+                for key, val in {'window_days': str(summary.days), **labels}.items()
+            )
+            series[name].append(f"{PROMETHEUS_PREFIX}{name}{{{label_text}}} {float(value)!r}")
+
+    lines = []
+    for name, samples in series.items():
+        if samples:
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}{name} {_SERIES[name]}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} gauge")
+            lines.extend(samples)
+    return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+SERIALIZERS = {
+    'json': to_json,
+    'csv': to_csv,
+    'prometheus': to_prometheus,
+}
@@ -0,0 +1,204 @@
+"""Read-through federation of several repositories' metrics storages."""
+import heapq
+from datetime import datetime
+from typing import Dict, Any, Callable, Iterator, Mapping, Optional, Sequence, Tuple
+
+from .aggregation import MetricsAggregate
+from .metrics_index import parse_timestamp
+from .storage_backend import MetricsBackend
+
+
+def _merge_key(metric: Dict[str, Any]) -> datetime:
+    """Order merged metrics by timestamp; undated metrics sort first."""
+    return parse_timestamp(metric) or datetime.min
+
+
+class FederatedMetricsStorage(MetricsBackend):
+    """
+    Presents the metrics of several repositories as one backend.
+
+    Reads are a heap-based k-way merge of the per-repository streams: one
+    pending metric per source is held at a time, so memory stays bounded by
+    the number of sources and no source is concatenated or re-sorted. The
+    merged stream is in timestamp order as long as each source's stream is
+    (every backend yields metrics in recording order). Each metric is
+    tagged with its repository under ``repo``, which aggregates break down
+    by in ``by_repo``. Write operations are delegated to the sources, which
+    refuse them when opened read-only (see ``create_federated_storage``).
+    Metrics with equal timestamps keep the order of ``sources``.
+    """
+
+    def __init__(self, sources: Mapping[str, MetricsBackend]):
+        """
+        Initialize federated storage.
+
+        Args:
+            sources: Mapping of repository name to that repository's backend
+        """
+        if not sources:
+            raise ValueError("At least one metrics source is required")
+        self.sources = dict(sources)
+
+    def _merged(self, read: Callable[[MetricsBackend], Iterator[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """
+        K-way merge one reader over every source, tagging the repository.
+
+        Args:
+            read: Function producing a source's metric stream
+
+        Yields:
+            Metric dictionaries in timestamp order
+        """
+        def tagged(repo: str, source: MetricsBackend) -> Iterator[Dict[str, Any]]:
+            for metric in read(source):
+                metric['repo'] = repo
+                yield metric
+
+        return heapq.merge(
+            *(tagged(repo, source) for repo, source in self.sources.items()),
+            key=_merge_key
+        )
+
+    def append_metric(self, metric: Dict[str, Any]) -> bool:
+        """
+        Append a metric to the repository named by its ``repo`` field.
+
+        Args:
+            metric: Metric dictionary with a ``repo`` field
+
+        Returns:
+            True if successful, False otherwise
+        """
+        source = self.sources.get(metric.get('repo'))
+        if source is None:
+            print(f"Warning: Cannot append metric for unknown repository: {metric.get('repo')}")
+            return False
+        return source.append_metric({key: value for key, value in metric.items() if key != 'repo'})
+
+    def iter_metrics(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over all metrics of every repository.
+
+        Yields:
+            Metric dictionaries in timestamp order, tagged with ``repo``
+        """
+        return self._merged(lambda source: source.iter_metrics())
+
+    def iter_recent_metrics(self, days: int = 30) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over every repository's metrics from the last N days.
+
+        Args:
+            days: Number of days to look back
+
+        Yields:
+            Metric dictionaries in timestamp order, tagged with ``repo``
+        """
+        return self._merged(lambda source: source.iter_recent_metrics(days))
+
+    def iter_task_metrics(self, task_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over a task's metrics in every repository.
+
+        Args:
+            task_id: Task identifier
+
+        Yields:
+            Metric dictionaries in timestamp order, tagged with ``repo``
+        """
+        return self._merged(lambda source: source.iter_task_metrics(task_id))
+
+    def count_metrics(self) -> int:
+        """
+        Count metrics across all repositories.
+
+        Returns:
+            Total metric count
+        """
+        return sum(source.count_metrics() for source in self.sources.values())
+
+    def clear_old_metrics(self, retention_days: int) -> int:
+        """
+        Apply retention in every repository.
+
+        Args:
+            retention_days: Number of days to retain
+
+        Returns:
+            Number of metrics removed
+        """
+        return sum(source.clear_old_metrics(retention_days) for source in self.sources.values())
+
+    def rollup_old_metrics(self, after_days: int) -> int:
+        """
+        Roll up old metrics in every repository.
+
+        Args:
+            after_days: Age in days after which metrics are rolled up
+
+        Returns:
+            Number of raw metrics rolled up
+        """
+        return sum(source.rollup_old_metrics(after_days) for source in self.sources.values())
+
+    def repair(self) -> Dict[str, int]:
+        """
+        Repair every repository's storage.
+
+        Returns:
+            Counts of repaired problems by kind, summed over repositories
+        """
+        result: Dict[str, int] = {}
+        for source in self.sources.values():
+            for key, count in source.repair().items():
+                result[key] = result.get(key, 0) + count
+        return result
+
+    def flush(self) -> bool:
+        """
+        Flush every repository's buffered writes.
+
+        Returns:
+            True if all flushes succeeded
+        """
+        results = [source.flush() for source in self.sources.values()]
+        return all(results)
+
+    def aggregate_recent(self, days: int = 30) -> Optional[MetricsAggregate]:
+        """
+        Merge each repository's aggregate of the window.
+
+        Sources that cannot aggregate internally are folded from their own
+        windowed reads; aggregates are order-independent, so no merge of the
+        streams is needed.
+
+        Args:
+            days: Number of days to analyze
+
+        Returns:
+            Aggregate over the window, broken down by repository
+        """
+        result = MetricsAggregate()
+        for repo, source in self.sources.items():
+            aggregate = source.aggregate_recent(days)
+            if aggregate is None:
+                aggregate = MetricsAggregate().add_all(source.iter_recent_metrics(days))
+            result.merge(aggregate.assign_repo(repo))
+        return result
+
+    def aggregate_windows(self, windows: Sequence[int]) -> Dict[int, Tuple[MetricsAggregate, MetricsAggregate]]:
+        """
+        Merge each repository's window aggregates.
+
+        Args:
+            windows: Window lengths in days
+
+        Returns:
+            Mapping of window length to (current, previous) aggregates
+        """
+        result = {days: (MetricsAggregate(), MetricsAggregate()) for days in windows}
+        for repo, source in self.sources.items():
+            for days, (current, previous) in source.aggregate_windows(windows).items():
+                result[days][0].merge(current.assign_repo(repo))
+                result[days][1].merge(previous.assign_repo(repo))
+        return result
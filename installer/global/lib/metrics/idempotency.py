@@ -0,0 +1,117 @@
+"""Idempotency keys that let storage reject retried metric writes."""
+from collections import OrderedDict
+from typing import Any, Iterable, Iterator, Optional
+
+IDEMPOTENCY_KEY = 'idempotency_key'
+
+
+def derive_key(metric_type: str, task_id: str, attempt: int) -> str:
+    """
+    Derive the idempotency key of a task event.
+
+    Args:
+        metric_type: Metric type (e.g. 'decision')
+        task_id: Task identifier
+        attempt: Review attempt the event belongs to; a genuinely new
+            attempt must pass a new number or its events are rejected as
+            retries of the previous one
+
+    Returns:
+        Key of the form ``<task_id>:<type>:<attempt>``
+    """
+    return f"{task_id}:{metric_type}:{attempt}"
+
+
+def event_key(
+    metric_type: str,
+    task_id: str,
+    attempt: Optional[int] = None,
+    idempotency_key: Optional[str] = None
+) -> Optional[str]:
+    """
+    Get the idempotency key of a task event, if the caller asked for one.
+
+    Events are only deduplicated when the caller identifies the invocation:
+    an explicit key wins, otherwise one is derived from ``attempt``. Without
+    either the event is unkeyed, so repeated events are all kept.
+
+    Args:
+        metric_type: Metric type (e.g. 'decision')
+        task_id: Task identifier
+        attempt: Review attempt the event belongs to
+        idempotency_key: Explicit idempotency key
+
+    Returns:
+        Idempotency key, or None
+    """
+    if idempotency_key is not None:
+        return idempotency_key
+    if attempt is not None:
+        return derive_key(metric_type, task_id, attempt)
+    return None
+
+
+def metric_key(metric: Any) -> Optional[str]:
+    """
+    Get the idempotency key of a metric, if it carries one.
+
+    Args:
+        metric: Metric dictionary or record
+
+    Returns:
+        Key as a string, or None
+    """
+    key = metric.get(IDEMPOTENCY_KEY)
+    return None if key is None else str(key)
+
+
+class RecentKeys:
+    """
+    Bounded set of the most recently seen idempotency keys.
+
+    Holds at most ``capacity`` keys; adding one more evicts the oldest, so
+    duplicates are detected as long as the retry arrives within the last
+    ``capacity`` keyed writes.
+    """
+
+    def __init__(self, capacity: int, keys: Iterable[str] = ()):
+        """
+        Initialize recent key set.
+
+        Args:
+            capacity: Maximum number of keys kept
+            keys: Initial keys, oldest first
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._keys: 'OrderedDict[str, None]' = OrderedDict()
+        for key in keys:
+            self.add(key)
+
+    def add(self, key: str) -> bool:
+        """
+        Add a key, evicting the oldest one when full.
+
+        Args:
+            key: Idempotency key
+
+        Returns:
+            True if the key was new, False if it was already present
+        """
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.capacity:
+            self._keys.popitem(last=False)
+        return True
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -0,0 +1,256 @@
+"""Compressed cold-tier archive for metrics past the retention window."""
+import gzip
+import lzma
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Literal, Optional, Sequence, Tuple
+
+from .aggregation import MetricsAggregate, merge_daily, merge_daily_windows
+from .metrics_index import parse_timestamp
+from .records import decode_metric
+from ..utils import FileOperations, JsonSerializer
+
+ArchiveCompression = Literal['gzip', 'lzma']
+
+
+class MetricsArchive:
+    """
+    Stores expired metrics as one compressed JSONL segment per day.
+
+    Layout (next to the metrics file)::
+
+        plan_review_metrics_archive/
+            manifest.json
+            plan_review_metrics-2024-01-31.jsonl.gz
+            plan_review_metrics-2024-02-01.jsonl.xz
+
+    The manifest records each day's segment, metric count and partial
+    aggregate, so dashboards can include archived days without
+    decompressing them. Later archive runs that reach the same day append
+    another compressed stream to its segment; gzip and xz readers decode
+    concatenated streams transparently.
+    """
+
+    MANIFEST_VERSION = 1
+
+    _SUFFIXES = {
+        'gzip': '.gz',
+        'lzma': '.xz',
+    }
+
+    def __init__(
+        self,
+        archive_dir: Path,
+        compression: ArchiveCompression = 'gzip',
+        stem: str = 'plan_review_metrics'
+    ):
+        """
+        Initialize metrics archive.
+
+        Args:
+            archive_dir: Directory holding archived segments
+            compression: Compression for new segments ('gzip' or 'lzma');
+                existing segments keep the format they were written in
+            stem: Segment filename prefix
+        """
+        if compression not in self._SUFFIXES:
+            raise ValueError(f"Unknown archive compression: {compression}")
+
+        self.archive_dir = archive_dir
+        self.compression = compression
+        self.stem = stem
+        self.manifest_file = archive_dir / 'manifest.json'
+
+    @staticmethod
+    def _compressor(path: Path):
+        """Pick the compression module matching a segment's suffix."""
+        return lzma if path.suffix == '.xz' else gzip
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the manifest.
+
+        Returns:
+            Mapping of ISO date to {'file', 'count', 'aggregate'}
+        """
+        manifest = JsonSerializer.safe_load_file(self.manifest_file) if self.manifest_file.exists() else {}
+        if manifest.get('version') != self.MANIFEST_VERSION or not isinstance(manifest.get('days'), dict):
+            return {}
+        return manifest['days']
+
+    def _save_manifest(self, days: Dict[str, Dict[str, Any]]) -> bool:
+        """Atomically persist the manifest."""
+        manifest = {
+            'version': self.MANIFEST_VERSION,
+            'days': dict(sorted(days.items())),
+        }
+        return FileOperations.atomic_write(self.manifest_file, JsonSerializer.serialize(manifest, indent=None))
+
+    def add(self, lines: Iterable[Tuple[str, bytes]]) -> int:
+        """
+        Compress metric lines into their days' segments.
+
+        Each segment is synced to disk and the manifest updated before this
+        returns, so callers can safely drop the originals afterwards.
+
+        Args:
+            lines: (ISO date, raw JSONL line) pairs, ideally grouped by day
+
+        Returns:
+            Number of lines archived
+        """
+        FileOperations.ensure_directory(self.archive_dir)
+        days = self._load_manifest()
+        archived = 0
+        current_day = None
+        raw = stream = None
+        aggregate: Optional[MetricsAggregate] = None
+
+        def close_segment() -> None:
+            if stream is None:
+                return
+            stream.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+            raw.close()
+            days[current_day]['aggregate'] = aggregate.to_dict()
+
+        try:
+            for day, raw_line in lines:
+                if day != current_day:
+                    close_segment()
+                    current_day = day
+                    entry = days.get(day)
+                    if entry is None:
+                        name = f"{self.stem}-{day}.jsonl{self._SUFFIXES[self.compression]}"
+                        entry = days[day] = {'file': name, 'count': 0, 'aggregate': MetricsAggregate().to_dict()}
+                    aggregate = MetricsAggregate.from_dict(entry['aggregate'])
+                    path = self.archive_dir / entry['file']
+                    raw = open(path, 'ab')
+                    if self._compressor(path) is lzma:
+                        stream = lzma.LZMAFile(raw, 'wb')
+                    else:
+                        stream = gzip.GzipFile(fileobj=raw, mode='wb')
+
+                if not raw_line.endswith(b'\n'):
+                    raw_line += b'\n'
+                stream.write(raw_line)
+                days[day]['count'] += 1
+                archived += 1
+                try:
+                    metric = decode_metric(raw_line)
+                except ValueError:
+                    continue
+                if isinstance(metric, dict):
+                    aggregate.add(metric)
+
+            close_segment()
+            stream = None
+        finally:
+            if stream is not None:
+                stream.close()
+                raw.close()
+
+        if archived and not self._save_manifest(days):
+            raise OSError(f"Failed to update archive manifest {self.manifest_file}")
+        return archived
+
+    def days(self) -> Sequence[str]:
+        """
+        List archived days.
+
+        Returns:
+            ISO dates in chronological order
+        """
+        return sorted(self._load_manifest())
+
+    def count_metrics(self) -> int:
+        """
+        Count archived metrics.
+
+        Returns:
+            Total archived metric count
+        """
+        return sum(entry.get('count', 0) for entry in self._load_manifest().values())
+
+    def iter_metrics(self, since_day: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream archived metrics, decompressing one segment at a time.
+
+        Args:
+            since_day: Only read segments for this ISO date and later
+
+        Yields:
+            Metric dictionaries in day order
+        """
+        for day, entry in sorted(self._load_manifest().items()):
+            if since_day is not None and day < since_day:
+                continue
+            yield from self._iter_segment(self.archive_dir / entry['file'])
+
+    def _iter_segment(self, path: Path) -> Iterator[Dict[str, Any]]:
+        """Stream the metrics of one compressed segment."""
+        try:
+            with self._compressor(path).open(path, 'rb') as f:
+                for raw_line in f:
+                    if not raw_line.strip():
+                        continue
+                    try:
+                        metric = decode_metric(raw_line)
+                    except ValueError:
+                        continue
+                    if isinstance(metric, dict):
+                        yield metric
+        except FileNotFoundError:
+            print(f"Warning: Archived metrics segment {path} is missing")
+        except (OSError, EOFError, lzma.LZMAError) as e:
+            print(f"Warning: Failed to read archived metrics segment {path}: {e}")
+
+    def scan_day(self, day: str) -> List[Tuple[Optional[datetime], Dict[str, Any]]]:
+        """
+        Decompress the metrics archived for one day.
+
+        Args:
+            day: ISO date
+
+        Returns:
+            (timestamp, metric) pairs in segment order
+        """
+        entry = self._load_manifest().get(day)
+        if entry is None:
+            return []
+        return [(parse_timestamp(metric), metric) for metric in self._iter_segment(self.archive_dir / entry['file'])]
+
+    def _daily(self) -> Dict[str, MetricsAggregate]:
+        """Load the per-day partial aggregates from the manifest."""
+        return {
+            day: MetricsAggregate.from_dict(entry['aggregate'])
+            for day, entry in self._load_manifest().items()
+        }
+
+    def aggregate(self, days: int = 30) -> MetricsAggregate:
+        """
+        Merge archived daily partials covering the last N days.
+
+        The day containing the cutoff is decompressed and clipped exactly.
+
+        Args:
+            days: Number of days to look back
+
+        Returns:
+            Aggregate over the archived part of the window
+        """
+        return merge_daily(self._daily(), days, self.scan_day)
+
+    def aggregate_windows(self, windows: Sequence[int]) -> Dict[int, Tuple[MetricsAggregate, MetricsAggregate]]:
+        """
+        Merge archived daily partials into several windows at once.
+
+        Args:
+            windows: Window lengths in days
+
+        Returns:
+            Mapping of window length to (current, previous) aggregates
+        """
+        return merge_daily_windows(self._daily(), windows, self.scan_day)
@@ -0,0 +1,548 @@
+"""Sidecar indexes derived from the JSONL metrics file."""
+import hashlib
+from bisect import bisect_left
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .idempotency import RecentKeys, metric_key
+from .records import decode_metric
+from ..utils import FileOperations, JsonSerializer
+
+
+class SidecarIndex:
+    """
+    Base class for indexes persisted next to a JSONL metrics file.
+
+    The index records how many bytes of the metrics file it covers together
+    with the file identity (device, inode and a digest of the first bytes).
+    Appends past the covered offset are folded in incrementally; a rewritten,
+    truncated or replaced file is detected and the index is rebuilt from
+    scratch. Subclasses implement ``_reset_state``, ``_observe``,
+    ``_dump_state`` and ``_load_state``.
+    """
+
+    VERSION = 1
+    KIND = 'sidecar'
+    HEAD_BYTES = 256
+
+    def __init__(self, metrics_file: Path, index_file: Path, persist: bool = True):
+        """
+        Initialize sidecar index.
+
+        Args:
+            metrics_file: JSONL metrics file being indexed
+            index_file: Path of the persisted index
+            persist: Write the index back to ``index_file``; when False the
+                persisted index is only read as a starting point and all
+                further updates stay in memory
+        """
+        self.metrics_file = metrics_file
+        self.index_file = index_file
+        self.persist = persist
+        self._loaded = False
+        self._dirty = False
+        self._identity: Optional[List[Any]] = None
+        self.covered = 0
+        self._reset_state()
+
+    # ------------------------------------------------------------------
+    # Subclass hooks
+    # ------------------------------------------------------------------
+
+    def _reset_state(self) -> None:
+        """Reset subclass state to an empty index."""
+        raise NotImplementedError
+
+    def _observe(self, offset: int, length: int, metric: Dict[str, Any]) -> None:
+        """Fold one complete metric line into the index."""
+        raise NotImplementedError
+
+    def _dump_state(self) -> Dict[str, Any]:
+        """Serialize subclass state."""
+        raise NotImplementedError
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        """Restore subclass state."""
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------
+    # Persistence and validation
+    # ------------------------------------------------------------------
+
+    def _file_identity(self, head_length: int) -> Optional[List[Any]]:
+        """
+        Compute the identity of the metrics file.
+
+        Args:
+            head_length: Number of leading bytes to digest
+
+        Returns:
+            [device, inode, head length, head digest], or None if unreadable
+        """
+        try:
+            stat = self.metrics_file.stat()
+            with open(self.metrics_file, 'rb') as f:
+                head = f.read(head_length)
+        except OSError:
+            return None
+        return [stat.st_dev, stat.st_ino, head_length, hashlib.sha1(head).hexdigest()]
+
+    def _load(self) -> None:
+        """Load the persisted index, falling back to an empty one."""
+        self._loaded = True
+        data = JsonSerializer.safe_load_file(self.index_file) if self.index_file.exists() else {}
+        if data.get('version') != self.VERSION or data.get('kind') != self.KIND:
+            self._start_over()
+            return
+
+        try:
+            self.covered = int(data['covered'])
+            self._identity = data['identity']
+            self._load_state(data['state'])
+        except (KeyError, TypeError, ValueError):
+            self._start_over()
+
+    def _start_over(self) -> None:
+        """Discard all indexed state."""
+        self.covered = 0
+        self._identity = None
+        self._reset_state()
+        self._dirty = True
+
+    def save(self) -> bool:
+        """
+        Persist the index atomically.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        head_length = min(self.HEAD_BYTES, self.covered)
+        if not self._identity or self._identity[2] != head_length:
+            self._identity = self._file_identity(head_length) if self.covered else None
+
+        if not self.persist:
+            self._dirty = False
+            return True
+
+        data = {
+            'version': self.VERSION,
+            'kind': self.KIND,
+            'covered': self.covered,
+            'identity': self._identity,
+            'state': self._dump_state(),
+        }
+        saved = FileOperations.atomic_write(self.index_file, JsonSerializer.serialize(data, indent=None))
+        if saved:
+            self._dirty = False
+        return saved
+
+    def _is_stale(self) -> bool:
+        """Check whether the indexed prefix no longer matches the file."""
+        try:
+            size = self.metrics_file.stat().st_size
+        except OSError:
+            return self.covered > 0
+
+        if size < self.covered:
+            return True
+        if self.covered == 0:
+            return False
+        if not self._identity:
+            return True
+        return self._file_identity(self._identity[2]) != self._identity
+
+    def sync(self) -> None:
+        """
+        Bring the index up to date with the metrics file.
+
+        Only bytes appended since the last sync are read. The index is
+        rebuilt if the file was rewritten, truncated or replaced.
+        """
+        if not self._loaded:
+            self._load()
+
+        if self._is_stale():
+            self._start_over()
+
+        start = self.covered
+        for offset, raw_line in FileOperations.iter_lines(self.metrics_file, start):
+            if not raw_line.endswith(b'\n'):
+                # Torn or in-flight final line; index it once it is complete
+                break
+            self._observe_line(offset, raw_line)
+
+        if self.covered != start or self._dirty:
+            self.save()
+
+    def _observe_line(self, offset: int, raw_line: bytes) -> None:
+        """Decode and fold a complete line, skipping corrupted ones."""
+        self.covered = offset + len(raw_line)
+        if not raw_line.strip():
+            return
+        try:
+            metric = decode_metric(raw_line)
+        except ValueError:
+            return
+        if isinstance(metric, dict):
+            self._observe(offset, len(raw_line), metric)
+
+    def note_append(self, offset: int, raw_line: bytes) -> None:
+        """
+        Fold a line just appended by this process.
+
+        The index only advances when the line starts exactly at the covered
+        offset; otherwise another writer got there first and the gap is
+        picked up by the next ``sync``.
+
+        Args:
+            offset: Byte offset the line was written at
+            raw_line: Encoded line including trailing newline
+        """
+        if not self._loaded:
+            self._load()
+            if self._is_stale():
+                self._start_over()
+        if offset != self.covered:
+            return
+
+        checkpoint_count = self._checkpoint_count()
+        self._observe_line(offset, raw_line)
+        if self._checkpoint_count() != checkpoint_count:
+            self.save()
+
+    def _checkpoint_count(self) -> int:
+        """Number of persisted checkpoints (used to decide when to save)."""
+        return 0
+
+    def rebuild(self) -> None:
+        """Rebuild the index from the full metrics file."""
+        self._loaded = True
+        self._start_over()
+        self.sync()
+
+    def invalidate(self) -> None:
+        """Forget indexed state after the metrics file was rewritten."""
+        self._loaded = True
+        self._start_over()
+        if not self.persist:
+            return
+        try:
+            self.index_file.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Warning: Failed to remove index {self.index_file}: {e}")
+
+
+class TimestampIndex(SidecarIndex):
+    """
+    Sparse index mapping timestamps to byte offsets in the metrics file.
+
+    Every ``interval`` lines a checkpoint ``(offset, prefix_max)`` is
+    recorded, where ``prefix_max`` is the latest timestamp seen before
+    ``offset``. Because ``prefix_max`` never decreases, a windowed read can
+    binary-search for the last checkpoint whose ``prefix_max`` is older than
+    the cutoff and start reading there, even if timestamps are not strictly
+    ordered in the file.
+    """
+
+    KIND = 'timestamp'
+    DEFAULT_INTERVAL = 1000
+
+    def __init__(
+        self,
+        metrics_file: Path,
+        index_file: Optional[Path] = None,
+        interval: int = DEFAULT_INTERVAL,
+        persist: bool = True
+    ):
+        """
+        Initialize timestamp index.
+
+        Args:
+            metrics_file: JSONL metrics file being indexed
+            index_file: Index path (default: <metrics stem>.index.json)
+            interval: Number of lines between checkpoints
+            persist: Write the index back to ``index_file``
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        super().__init__(metrics_file, index_file or metrics_file.with_suffix('.index.json'), persist)
+
+    def _reset_state(self) -> None:
+        self.checkpoints: List[Tuple[int, datetime]] = []
+        self.lines_since_checkpoint = 0
+        self.running_max: Optional[datetime] = None
+
+    def _observe(self, offset: int, length: int, metric: Dict[str, Any]) -> None:
+        timestamp = parse_timestamp(metric)
+        if timestamp is not None and (self.running_max is None or timestamp > self.running_max):
+            self.running_max = timestamp
+
+        self.lines_since_checkpoint += 1
+        if self.lines_since_checkpoint >= self.interval and self.running_max is not None:
+            self.checkpoints.append((offset + length, self.running_max))
+            self.lines_since_checkpoint = 0
+
+    def _checkpoint_count(self) -> int:
+        return len(self.checkpoints)
+
+    def _dump_state(self) -> Dict[str, Any]:
+        return {
+            'interval': self.interval,
+            'checkpoints': [[offset, ts.isoformat()] for offset, ts in self.checkpoints],
+            'lines_since_checkpoint': self.lines_since_checkpoint,
+            'running_max': self.running_max.isoformat() if self.running_max else None,
+        }
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        if state['interval'] != self.interval:
+            raise ValueError("index interval changed")
+        self.checkpoints = [
+            (int(offset), datetime.fromisoformat(ts)) for offset, ts in state['checkpoints']
+        ]
+        self.lines_since_checkpoint = int(state['lines_since_checkpoint'])
+        running_max = state['running_max']
+        self.running_max = datetime.fromisoformat(running_max) if running_max else None
+
+    def find_offset(self, cutoff: datetime) -> int:
+        """
+        Find a byte offset before which every metric is older than cutoff.
+
+        Args:
+            cutoff: Earliest timestamp of interest
+
+        Returns:
+            Byte offset to start a windowed read from
+        """
+        self.sync()
+        prefix_maxima = [ts for _offset, ts in self.checkpoints]
+        position = bisect_left(prefix_maxima, cutoff)
+        if position == 0:
+            return 0
+        return self.checkpoints[position - 1][0]
+
+
+class TaskIndex(SidecarIndex):
+    """
+    Index mapping each task_id to the byte offsets of its metric lines.
+
+    Lets the complexity, decision and outcome events of one task be read
+    with a few seeks instead of a scan of the whole file. Appends made by
+    this process are folded in as they happen; the index is persisted every
+    ``SAVE_INTERVAL`` entries and anything newer is caught up by ``sync``.
+    """
+
+    KIND = 'tasks'
+    SAVE_INTERVAL = 100
+
+    def __init__(self, metrics_file: Path, index_file: Optional[Path] = None, persist: bool = True):
+        """
+        Initialize task index.
+
+        Args:
+            metrics_file: JSONL metrics file being indexed
+            index_file: Index path (default: <metrics stem>.tasks.json)
+            persist: Write the index back to ``index_file``
+        """
+        super().__init__(metrics_file, index_file or metrics_file.with_suffix('.tasks.json'), persist)
+
+    def _reset_state(self) -> None:
+        self.offsets: Dict[str, List[int]] = {}
+        self.entries = 0
+
+    def _observe(self, offset: int, length: int, metric: Dict[str, Any]) -> None:
+        task_id = metric.get('task_id')
+        if task_id is None:
+            return
+        self.offsets.setdefault(str(task_id), []).append(offset)
+        self.entries += 1
+
+    def _checkpoint_count(self) -> int:
+        return self.entries // self.SAVE_INTERVAL
+
+    def _dump_state(self) -> Dict[str, Any]:
+        return {'offsets': self.offsets}
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        self.offsets = {task_id: [int(offset) for offset in offsets] for task_id, offsets in state['offsets'].items()}
+        self.entries = sum(len(offsets) for offsets in self.offsets.values())
+
+    def find_offsets(self, task_id: str) -> List[int]:
+        """
+        Find the offsets of every metric line recorded for a task.
+
+        Args:
+            task_id: Task identifier
+
+        Returns:
+            Byte offsets in file order
+        """
+        self.sync()
+        return list(self.offsets.get(task_id, []))
+
+
+class IdempotencyIndex(SidecarIndex):
+    """
+    Bounded set of the idempotency keys most recently written to the file.
+
+    Appends are checked against it under the metrics lock: ``contains``
+    first catches up with lines appended since the last check (by any
+    process), so only the file's tail is read, never the whole file.
+    Keys of lines still held by a buffered writer are tracked in memory
+    until they reach the file.
+    """
+
+    KIND = 'keys'
+    DEFAULT_CAPACITY = 10000
+    SAVE_INTERVAL = 100
+
+    def __init__(self, metrics_file: Path, index_file: Optional[Path] = None, capacity: int = DEFAULT_CAPACITY):
+        """
+        Initialize idempotency index.
+
+        Args:
+            metrics_file: JSONL metrics file being indexed
+            index_file: Index path (default: <metrics stem>.keys.json)
+            capacity: Number of recent keys remembered
+        """
+        self.capacity = capacity
+        self.pending = RecentKeys(capacity)
+        super().__init__(metrics_file, index_file or metrics_file.with_suffix('.keys.json'))
+
+    def _reset_state(self) -> None:
+        self.keys = RecentKeys(self.capacity)
+        self.entries = 0
+
+    def _observe(self, offset: int, length: int, metric: Dict[str, Any]) -> None:
+        key = metric_key(metric)
+        if key is None:
+            return
+        self.keys.add(key)
+        self.entries += 1
+
+    def _checkpoint_count(self) -> int:
+        return self.entries // self.SAVE_INTERVAL
+
+    def _dump_state(self) -> Dict[str, Any]:
+        return {'capacity': self.capacity, 'entries': self.entries, 'keys': list(self.keys)}
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        if state['capacity'] != self.capacity:
+            raise ValueError("index capacity changed")
+        self.keys = RecentKeys(self.capacity, (str(key) for key in state['keys']))
+        self.entries = int(state['entries'])
+
+    def contains(self, key: str) -> bool:
+        """
+        Check whether a key was recently written (or is pending).
+
+        Args:
+            key: Idempotency key
+
+        Returns:
+            True if the key is among the recent keys
+        """
+        self.sync()
+        return key in self.keys or key in self.pending
+
+    def note_pending(self, key: str) -> None:
+        """
+        Remember the key of a line handed to a buffered writer.
+
+        Args:
+            key: Idempotency key
+        """
+        self.pending.add(key)
+
+
+class QuarantineIndex(SidecarIndex):
+    """
+    Byte offsets of corrupted lines that have already been quarantined.
+
+    Unlike the other indexes it is not built by scanning: offsets are added
+    as readers come across corrupted lines, and ``covered`` only extends to
+    the end of the last one so the file identity check still detects a
+    rewritten file.
+    """
+
+    KIND = 'quarantine'
+
+    def __init__(self, metrics_file: Path, index_file: Optional[Path] = None):
+        """
+        Initialize quarantine index.
+
+        Args:
+            metrics_file: JSONL file whose corrupted lines are tracked
+            index_file: Index path (default: <file stem>.quarantine.json)
+        """
+        super().__init__(metrics_file, index_file or metrics_file.with_suffix('.quarantine.json'))
+
+    def _reset_state(self) -> None:
+        self.offsets: Set[int] = set()
+
+    def _observe(self, offset: int, length: int, metric: Dict[str, Any]) -> None:
+        pass
+
+    def _dump_state(self) -> Dict[str, Any]:
+        return {'offsets': sorted(self.offsets)}
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        self.offsets = {int(offset) for offset in state['offsets']}
+
+    def _refresh(self) -> None:
+        """Load the persisted offsets and drop them if the file was rewritten."""
+        if not self._loaded:
+            self._load()
+        if self._is_stale():
+            self._start_over()
+
+    def contains(self, offset: int) -> bool:
+        """
+        Check whether the line at an offset was already quarantined.
+
+        Args:
+            offset: Byte offset of the line
+
+        Returns:
+            True if quarantined
+        """
+        self._refresh()
+        return offset in self.offsets
+
+    def add(self, offset: int, length: int) -> None:
+        """
+        Record a quarantined line and persist the index.
+
+        Args:
+            offset: Byte offset of the line
+            length: Line length in bytes
+        """
+        self._refresh()
+        self.offsets.add(offset)
+        self.covered = max(self.covered, offset + length)
+        self.save()
+
+
+def parse_timestamp(metric: Dict[str, Any]) -> Optional[datetime]:
+    """
+    Parse the timestamp of a metric.
+
+    Args:
+        metric: Metric dictionary
+
+    Returns:
+        Naive UTC datetime (timestamps with an offset are converted to
+        UTC), or None if missing or invalid
+    """
+    try:
+        # Handle both with and without 'Z' suffix
+        timestamp = datetime.fromisoformat(metric.get('timestamp', '').rstrip('Z'))
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if timestamp.tzinfo is not None:
+        # Naive and aware datetimes cannot be compared
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
@@ -1,24 +1,89 @@
 """JSONL-based metrics storage with atomic writes."""
-import json
+import os
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-
-from ..utils import FileOperations, PathResolver
-
-
-class MetricsStorage:
-    """Handles persistent storage of metrics in JSONL format."""
-
-    def __init__(self, metrics_file: Optional[Path] = None):
+from typing import Dict, Any, Iterator, List, Literal, Optional, Sequence, Tuple
+
+from .aggregation import MetricsAggregate
+from .aggregation_cache import AggregationCache
+from .buffered_writer import BufferedMetricsWriter
+from .metrics_archive import MetricsArchive
+from .idempotency import metric_key
+from .metrics_index import IdempotencyIndex, SidecarIndex, TaskIndex, TimestampIndex, parse_timestamp
+from .quarantine import MetricsQuarantine
+from .records import Metric, decode_metric, decode_record, encode_metric, to_record
+from .rollup import DailyRollups
+from .storage_backend import MetricsBackend
+from ..utils import FileLock, FileOperations, PathResolver
+
+MetricsEncoding = Literal['json', 'compact']
+
+
+class MetricsStorage(MetricsBackend):
+    """
+    Handles persistent storage of metrics in JSONL format.
+
+    Appends and compaction are serialised across processes with an advisory
+    lock on ``<metrics stem>.lock``; each record is written with a single
+    ``O_APPEND`` write so concurrent writers never interleave lines.
+    Corrupted lines are quarantined the first time they are read and
+    skipped silently afterwards (see ``MetricsQuarantine`` and ``repair``).
+    With the ``compact`` encoding, known metric types are written as
+    schema-tagged JSON arrays instead of objects (see ``records``); both
+    encodings are always readable. A metric whose ``idempotency_key`` is
+    among the last ``dedup_window`` keys written is a retried write: it is
+    dropped and counted in ``duplicates`` (see ``IdempotencyIndex``).
+    Opened ``read_only``, no directory, lock, sidecar index or quarantine
+    file is ever created and writes are refused.
+    """
+
+    def __init__(
+        self,
+        metrics_file: Optional[Path] = None,
+        writer: Optional[BufferedMetricsWriter] = None,
+        archive: Optional[MetricsArchive] = None,
+        encoding: MetricsEncoding = 'json',
+        dedup_window: int = IdempotencyIndex.DEFAULT_CAPACITY,
+        read_only: bool = False
+    ):
         """
         Initialize metrics storage.
 
         Args:
             metrics_file: Path to metrics file (default: from PathResolver)
+            writer: Optional buffered writer for batched appends (default:
+                one unbuffered append per metric)
+            archive: Cold tier that expired metrics are compressed into
+                instead of being deleted (default: delete)
+            encoding: Line encoding for new metrics ('json' or 'compact')
+            dedup_window: Number of recent idempotency keys checked for
+                duplicates
+            read_only: Only read the metrics file; sidecar indexes are kept
+                in memory
         """
+        if encoding not in ('json', 'compact'):
+            raise ValueError(f"Unknown metrics encoding: {encoding}")
+
+        self.compact = encoding == 'compact'
+        self.dedup_window = dedup_window
+        self.duplicates = 0
         self.metrics_file = metrics_file or PathResolver.get_metrics_file()
-        self._ensure_storage()
+        self.writer = writer
+        self.archive = archive
+        self.read_only = read_only
+        self.lock = FileLock.for_path(self.metrics_file.with_suffix('.lock'))
+        self.quarantine = MetricsQuarantine(self.metrics_file, read_only=read_only)
+        self._init_indexes()
+        if not read_only:
+            self._ensure_storage()
+
+    def _init_indexes(self) -> None:
+        """Create the sidecar indexes of the metrics file."""
+        persist = not self.read_only
+        self.timestamp_index = TimestampIndex(self.metrics_file, persist=persist)
+        self.aggregation_cache = AggregationCache(self.metrics_file, persist=persist, archive=self.archive)
+        self.task_index = TaskIndex(self.metrics_file, persist=persist)
+        self.key_index = IdempotencyIndex(self.metrics_file, capacity=self.dedup_window)
 
     def _ensure_storage(self) -> None:
         """Ensure metrics directory and .gitignore exist."""
@@ -30,135 +95,576 @@ class MetricsStorage:
         # Create .gitignore if it doesn't exist
         gitignore_path = metrics_dir / '.gitignore'
         if not gitignore_path.exists():
-            gitignore_content = "# Ignore metrics data files\n*.jsonl\n*.json\n"
+            gitignore_content = "# Ignore metrics data files\n*.jsonl\n*.json\n*.lock\n*.db*\n"
             FileOperations.atomic_write(gitignore_path, gitignore_content)
 
     def append_metric(self, metric: Dict[str, Any]) -> bool:
         """
         Append metric to JSONL file.
 
+        A metric carrying a recently written ``idempotency_key`` is dropped
+        as a retry; the write still counts as successful.
+
         Args:
             metric: Metric dictionary to append
 
         Returns:
             True if successful, False otherwise
         """
+        if self._refuse_write('append metric'):
+            return False
         # Add timestamp if not present
         if 'timestamp' not in metric:
             metric['timestamp'] = datetime.utcnow().isoformat() + 'Z'
 
         # Serialize to JSON line
         try:
-            json_line = json.dumps(metric, ensure_ascii=False) + '\n'
-            return FileOperations.safe_append(self.metrics_file, json_line)
+            json_line = encode_metric(metric, self.compact) + '\n'
+            return self._write_line(metric, json_line)
         except Exception as e:
             print(f"Warning: Failed to append metric: {e}")
             return False
 
-    def read_all_metrics(self) -> List[Dict[str, Any]]:
+    def _write_line(self, metric: Dict[str, Any], json_line: str) -> bool:
         """
-        Read all metrics from file.
+        Write a serialized metric line to storage.
+
+        Args:
+            metric: Metric dictionary being written
+            json_line: Serialized JSON line (newline terminated)
 
         Returns:
-            List of metric dictionaries
+            True if successful, False otherwise
+        """
+        data = json_line.encode('utf-8')
+        key = metric_key(metric)
+        if self.writer is not None:
+            if self._is_duplicate(self.key_index, key):
+                return True
+            if key is not None:
+                self.key_index.note_pending(key)
+            # Batched lines are folded into the index on the next read
+            return self.writer.write(data)
+
+        with self.lock:
+            if self._is_duplicate(self.key_index, key):
+                return True
+            offset = FileOperations.append_record(self.metrics_file, data)
+            if offset is None:
+                return False
+
+            self._note_append((self.timestamp_index, self.task_index, self.key_index), offset, data)
+        return True
+
+    @staticmethod
+    def _note_append(indexes: Sequence[SidecarIndex], offset: int, data: bytes) -> None:
         """
-        if not self.metrics_file.exists():
-            return []
+        Fold a line just appended into sidecar indexes.
 
-        metrics = []
-        content = FileOperations.safe_read(self.metrics_file)
+        The line is already on disk, so a failing index is dropped (to be
+        rebuilt by the next read) instead of failing the append.
 
-        if not content:
-            return []
+        Args:
+            indexes: Indexes of the file the line was appended to
+            offset: Byte offset the line was written at
+            data: Encoded line including trailing newline
+        """
+        for index in indexes:
+            try:
+                index.note_append(offset, data)
+            except Exception as e:
+                print(f"Warning: Failed to update {index.KIND} index of {index.metrics_file}: {e}")
+                try:
+                    index.invalidate()
+                except Exception:
+                    pass
+
+    def _is_duplicate(self, index: IdempotencyIndex, key: Optional[str]) -> bool:
+        """
+        Check a metric's idempotency key, counting duplicates.
 
-        for line_num, line in enumerate(content.strip().split('\n'), 1):
-            if not line.strip():
-                continue
+        Args:
+            index: Key index of the file being appended to
+            key: Idempotency key of the metric, if any
 
-            try:
-                metric = json.loads(line)
-                metrics.append(metric)
-            except json.JSONDecodeError as e:
-                # Skip corrupted lines with detailed logging (TASK-003E Phase 5 Day 2)
-                print(f"Warning: Skipping corrupted metric at line {line_num}: {e}")
-                print(f"         Line content: {line[:80]}{'...' if len(line) > 80 else ''}")
-                continue
+        Returns:
+            True if the metric is a retry of a recent write
+        """
+        if key is None or not index.contains(key):
+            return False
+        self.duplicates += 1
+        return True
 
-        return metrics
+    def flush(self) -> bool:
+        """
+        Flush metrics buffered by the writer, if any.
 
-    def read_recent_metrics(self, days: int = 30) -> List[Dict[str, Any]]:
+        Returns:
+            True if successful (or nothing to flush), False otherwise
         """
-        Read metrics from the last N days.
+        if self.writer is None:
+            return True
+        return self.writer.flush()
+
+    def iter_metrics(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over all metrics in file order.
+
+        Lines are read and decoded one at a time, so memory use is bounded
+        by the longest line rather than by the size of the file.
+
+        Yields:
+            Metric dictionaries (archived ones first)
+        """
+        self.flush()
+        if self.archive is not None:
+            yield from self.archive.iter_metrics()
+        for _offset, metric in self._iter_entries():
+            yield metric
+
+    def iter_records(self) -> Iterator[Metric]:
+        """
+        Lazily iterate over all metrics as typed records, in file order.
+
+        Lines are decoded straight into slotted records, without building
+        an intermediate dictionary for compact lines.
+
+        Yields:
+            Typed records (dictionaries for types without a record class)
+        """
+        self.flush()
+        if self.archive is not None:
+            for metric in self.archive.iter_metrics():
+                yield to_record(metric)
+        for _offset, record in self._iter_entries(decode=decode_record):
+            yield record
+
+    def iter_recent_metrics(self, days: int = 30) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over metrics from the last N days.
+
+        The sparse timestamp index is used to seek past lines that are known
+        to be older than the window before decoding starts. Archived
+        segments are only decompressed if the window reaches back to them.
 
         Args:
             days: Number of days to look back
 
-        Returns:
-            List of recent metric dictionaries
+        Yields:
+            Recent metric dictionaries
         """
+        self.flush()
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        all_metrics = self.read_all_metrics()
 
-        recent_metrics = []
-        for metric in all_metrics:
+        if self.archive is not None:
+            for metric in self.archive.iter_metrics(since_day=cutoff_date.date().isoformat()):
+                metric_date = self._parse_timestamp(metric)
+                if metric_date is not None and metric_date >= cutoff_date:
+                    yield metric
+
+        yield from self._iter_hot_since(cutoff_date)
+
+    def _iter_hot_since(self, cutoff_date: datetime) -> Iterator[Dict[str, Any]]:
+        """Iterate over metrics in the metrics file at or after a cutoff."""
+        start = self.timestamp_index.find_offset(cutoff_date)
+        for _offset, metric in self._iter_entries(start):
+            metric_date = self._parse_timestamp(metric)
+            # Skip metrics with invalid timestamps
+            if metric_date is not None and metric_date >= cutoff_date:
+                yield metric
+
+    def iter_task_metrics(self, task_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over all metrics recorded for a task.
+
+        Only the lines listed in the task index are read. If the file was
+        rewritten between the index lookup and the read, the index is
+        rebuilt and the lookup retried once.
+
+        Args:
+            task_id: Task identifier
+
+        Yields:
+            Metric dictionaries in file order
+        """
+        self.flush()
+        metrics = self._read_task_lines(self.metrics_file, self.task_index, task_id)
+        if metrics is not None:
+            yield from metrics
+            return
+
+        print(f"Warning: Task index for {self.metrics_file} is inconsistent; scanning")
+        for metric in self.iter_metrics():
+            if str(metric.get('task_id')) == task_id:
+                yield metric
+
+    @staticmethod
+    def _read_task_lines(path: Path, index: TaskIndex, task_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Read the lines a task index lists for a task.
+
+        If the file was rewritten between the index lookup and the read,
+        the index is rebuilt and the lookup retried once.
+
+        Args:
+            path: JSONL file the index belongs to
+            index: Task index of the file
+            task_id: Task identifier
+
+        Returns:
+            Metric dictionaries in file order, or None if the index is
+            still inconsistent with the file
+        """
+        for _attempt in range(2):
+            metrics = []
+            for _offset, raw_line in FileOperations.read_lines_at(path, index.find_offsets(task_id)):
+                try:
+                    metric = decode_metric(raw_line)
+                except ValueError:
+                    metric = None
+                if not isinstance(metric, dict) or str(metric.get('task_id')) != task_id:
+                    break
+                metrics.append(metric)
+            else:
+                return metrics
+            index.rebuild()
+        return None
+
+    def _iter_entries(
+        self,
+        start: int = 0,
+        path: Optional[Path] = None,
+        decode=decode_metric
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Iterate over decoded metrics together with their byte offsets.
+
+        Args:
+            start: Byte offset to start reading from
+            path: JSONL file to read (default: the metrics file)
+            decode: Line decoder (``decode_record`` yields typed records)
+
+        Yields:
+            Tuples of (byte offset, metric dictionary)
+        """
+        path = path or self.metrics_file
+        for offset, raw_line in FileOperations.iter_lines(path, start):
+            if not raw_line.strip():
+                continue
+
             try:
-                timestamp_str = metric.get('timestamp', '')
-                # Handle both with and without 'Z' suffix
-                timestamp_str = timestamp_str.rstrip('Z')
-                metric_date = datetime.fromisoformat(timestamp_str)
-
-                if metric_date >= cutoff_date:
-                    recent_metrics.append(metric)
-            except (ValueError, TypeError):
-                # Skip metrics with invalid timestamps
+                metric = decode(raw_line)
+            except ValueError as e:
+                # Quarantined (with a warning) on first sight, then skipped silently
+                self.quarantine.skip(path, offset, raw_line, e)
                 continue
 
-        return recent_metrics
+            yield offset, metric
+
+    _parse_timestamp = staticmethod(parse_timestamp)
+
+    def aggregate_recent(self, days: int = 30) -> Optional[MetricsAggregate]:
+        """
+        Aggregate recent metrics from the persisted per-day cache.
+
+        Only lines appended since the previous call are read, plus the
+        lines of the day containing the cutoff, which is clipped exactly
+        (see ``AggregationCache``).
+
+        Args:
+            days: Number of days to analyze
+
+        Returns:
+            Aggregate over the window
+        """
+        self.flush()
+        return self.aggregation_cache.aggregate(days)
+
+    def aggregate_windows(self, windows: Sequence[int]) -> Dict[int, Tuple[MetricsAggregate, MetricsAggregate]]:
+        """
+        Aggregate several windows from the persisted per-day cache.
+
+        Args:
+            windows: Window lengths in days
+
+        Returns:
+            Mapping of window length to (current, previous) aggregates
+        """
+        self.flush()
+        return self.aggregation_cache.aggregate_windows(windows)
+
+    def tail_aggregates(self) -> Optional[AggregationCache]:
+        """
+        Open an in-memory tail of the metrics file.
+
+        It starts from the persisted aggregation cache (read only) and
+        rebuilds itself if the file is rotated or truncated. Archived days
+        are merged into every window, as in ``aggregate_recent``.
+
+        Returns:
+            Non-persisting aggregation cache
+        """
+        return AggregationCache(self.metrics_file, persist=False, archive=self.archive)
 
     def count_metrics(self) -> int:
         """
-        Count total number of metrics.
+        Count total number of metrics, including archived ones.
 
         Returns:
             Total metric count
         """
-        if not self.metrics_file.exists():
-            return 0
-
-        content = FileOperations.safe_read(self.metrics_file)
-        if not content:
-            return 0
+        self.flush()
+        archived = self.archive.count_metrics() if self.archive is not None else 0
+        return archived + self._count_hot_metrics()
 
-        return len([line for line in content.strip().split('\n') if line.strip()])
+    def _count_hot_metrics(self) -> int:
+        """Count metrics in the metrics file."""
+        return sum(
+            1 for _offset, line in FileOperations.iter_lines(self.metrics_file)
+            if line.strip()
+        )
 
     def clear_old_metrics(self, retention_days: int) -> int:
         """
         Clear metrics older than retention period.
 
+        Survivors are streamed into a temp file which then atomically
+        replaces the metrics file, so memory use stays bounded. The metrics
+        lock is held throughout so concurrent appenders wait instead of
+        writing into the file being replaced.
+
+        With an archive, metrics from days before the retention window are
+        compressed into it first (and only then removed from the metrics
+        file); retention is applied at day granularity in that case.
+
         Args:
             retention_days: Number of days to retain
 
         Returns:
-            Number of metrics removed
+            Number of metrics removed from the metrics file
         """
-        recent_metrics = self.read_recent_metrics(retention_days)
-        original_count = self.count_metrics()
+        if self._refuse_write('clear old metrics'):
+            return 0
+        self.flush()
+        cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
+        with self.lock:
+            if not self.metrics_file.exists():
+                return 0
+
+            if self.archive is not None:
+                return self._archive_expired(cutoff_date.date().isoformat())
+
+            original_count = self._count_hot_metrics()
+            kept = 0
+
+            def recent_lines() -> Iterator[str]:
+                nonlocal kept
+                for metric in self._iter_hot_since(cutoff_date):
+                    try:
+                        line = encode_metric(metric, self.compact) + '\n'
+                    except Exception:
+                        continue
+                    kept += 1
+                    yield line
 
-        if not recent_metrics:
-            # Clear entire file
-            FileOperations.atomic_write(self.metrics_file, '')
-            return original_count
+            if not FileOperations.atomic_write_lines(self.metrics_file, recent_lines()):
+                return 0
 
-        # Rewrite file with only recent metrics
-        lines = []
-        for metric in recent_metrics:
+            self._invalidate_indexes()
+
+        return original_count - kept
+
+    def rollup_old_metrics(self, after_days: int) -> int:
+        """
+        Replace metrics from days older than N days with daily rollups.
+
+        Only decision and outcome events are rolled up (see
+        ``DailyRollups``). The file is rewritten atomically with each rollup
+        record (one per day, merged with any existing rollup for that day)
+        after the kept lines from its day, so it stays in timestamp order.
+
+        Args:
+            after_days: Age in days after which metrics are rolled up
+
+        Returns:
+            Number of raw metrics rolled up
+        """
+        if self._refuse_write('roll up old metrics'):
+            return 0
+        self.flush()
+        first_kept_day = (datetime.utcnow() - timedelta(days=after_days)).date().isoformat()
+        rollups = DailyRollups(first_kept_day)
+        with self.lock:
+            if not self.metrics_file.exists():
+                return 0
+
+            for _offset, metric in self._iter_entries():
+                rollups.add(metric)
+            if not rollups.changed:
+                return 0
+
+            def rewritten_lines() -> Iterator[str]:
+                pending = rollups.records()
+                for offset, raw_line in FileOperations.iter_lines(self.metrics_file):
+                    if not raw_line.strip():
+                        continue
+                    try:
+                        metric = decode_metric(raw_line)
+                    except ValueError as e:
+                        self.quarantine.add(self.metrics_file, offset, raw_line, str(e))
+                        continue
+                    if isinstance(metric, dict) and rollups.covers(metric):
+                        continue
+                    timestamp = self._parse_timestamp(metric) if isinstance(metric, dict) else None
+                    while pending and timestamp is not None and pending[0]['day'] < timestamp.date().isoformat():
+                        yield encode_metric(pending.pop(0), self.compact) + '\n'
+                    line = raw_line.decode('utf-8', errors='replace')
+                    yield line if line.endswith('\n') else line + '\n'
+                for record in pending:
+                    yield encode_metric(record, self.compact) + '\n'
+
+            if not FileOperations.atomic_write_lines(self.metrics_file, rewritten_lines()):
+                return 0
+
+            self._invalidate_indexes()
+
+        return rollups.rolled_up
+
+    def _archive_expired(self, first_kept_day: str) -> int:
+        """
+        Move metrics from days before ``first_kept_day`` into the archive.
+
+        Caller must hold the metrics lock. Lines without a valid timestamp
+        are dropped, as in plain retention.
+
+        Args:
+            first_kept_day: ISO date of the oldest day kept in the metrics file
+
+        Returns:
+            Number of metrics removed from the metrics file
+        """
+        def line_day(raw_line: bytes) -> Optional[str]:
             try:
-                line = json.dumps(metric, ensure_ascii=False) + '\n'
-                lines.append(line)
-            except Exception:
-                continue
+                metric = decode_metric(raw_line)
+            except ValueError:
+                return None
+            timestamp = self._parse_timestamp(metric) if isinstance(metric, dict) else None
+            return timestamp.date().isoformat() if timestamp else None
+
+        def expired_lines() -> Iterator[Tuple[str, bytes]]:
+            for _offset, raw_line in FileOperations.iter_lines(self.metrics_file):
+                day = line_day(raw_line)
+                if day is not None and day < first_kept_day:
+                    yield day, raw_line
+
+        try:
+            if not self.archive.add(expired_lines()):
+                return 0
+        except OSError as e:
+            print(f"Warning: Failed to archive expired metrics: {e}")
+            return 0
+
+        original_count = self._count_hot_metrics()
+        kept = 0
+
+        def kept_lines() -> Iterator[str]:
+            nonlocal kept
+            for _offset, raw_line in FileOperations.iter_lines(self.metrics_file):
+                day = line_day(raw_line)
+                if day is not None and day >= first_kept_day:
+                    kept += 1
+                    yield raw_line.decode('utf-8') if raw_line.endswith(b'\n') else raw_line.decode('utf-8') + '\n'
+
+        if not FileOperations.atomic_write_lines(self.metrics_file, kept_lines()):
+            print("Warning: Archived metrics are still present in the metrics file")
+            return 0
 
-        content = ''.join(lines)
-        FileOperations.atomic_write(self.metrics_file, content)
+        self._invalidate_indexes()
+        return original_count - kept
 
-        return original_count - len(recent_metrics)
+    def repair(self) -> Dict[str, int]:
+        """
+        Repair the metrics file after a crash and rebuild its sidecar indexes.
+
+        A final line without a trailing newline (a torn write) is completed
+        if it still decodes, and otherwise moved to quarantine and truncated
+        away. Corrupted lines are moved to quarantine and removed from the
+        file. The sidecar indexes are then rebuilt.
+
+        Returns:
+            Counts of 'torn_lines' truncated and 'corrupted_lines' removed
+        """
+        if self._refuse_write('repair metrics'):
+            return {}
+        self.flush()
+        with self.lock:
+            result = self._repair_file(self.metrics_file)
+            self.quarantine.forget(self.metrics_file)
+            self.timestamp_index.rebuild()
+            self.aggregation_cache.rebuild()
+            self.task_index.rebuild()
+            self.key_index.rebuild()
+        return result
+
+    def _repair_file(self, path: Path) -> Dict[str, int]:
+        """
+        Truncate a torn final line and strip corrupted lines from a JSONL file.
+
+        Caller must hold the metrics lock.
+
+        Args:
+            path: JSONL file to repair
+
+        Returns:
+            Counts of 'torn_lines' truncated and 'corrupted_lines' removed
+        """
+        result = {'torn_lines': 0, 'corrupted_lines': 0}
+        corrupted = set()
+        tail: Optional[Tuple[int, bytes]] = None
+
+        for offset, raw_line in FileOperations.iter_lines(path):
+            if not raw_line.endswith(b'\n'):
+                tail = (offset, raw_line)
+                break
+            if not raw_line.strip():
+                continue
+            try:
+                decode_metric(raw_line)
+            except ValueError as e:
+                self.quarantine.add(path, offset, raw_line, str(e))
+                corrupted.add(offset)
+
+        try:
+            if tail is not None:
+                offset, raw_line = tail
+                try:
+                    decode_metric(raw_line)
+                    with open(path, 'ab') as f:
+                        f.write(b'\n')
+                except ValueError:
+                    self.quarantine.add(path, offset, raw_line, 'torn final line')
+                    os.truncate(path, offset)
+                    result['torn_lines'] = 1
+        except OSError as e:
+            print(f"Warning: Failed to repair final line of {path}: {e}")
+
+        if corrupted:
+            def intact_lines() -> Iterator[str]:
+                for offset, raw_line in FileOperations.iter_lines(path):
+                    if offset not in corrupted:
+                        yield raw_line.decode('utf-8', errors='replace')
+
+            if FileOperations.atomic_write_lines(path, intact_lines()):
+                result['corrupted_lines'] = len(corrupted)
+            else:
+                print(f"Warning: Failed to remove corrupted lines from {path}")
+
+        return result
+
+    def _invalidate_indexes(self) -> None:
+        """Forget sidecar indexes after the metrics file was rewritten."""
+        self.timestamp_index.invalidate()
+        self.aggregation_cache.invalidate()
+        self.task_index.invalidate()
+        self.key_index.invalidate()
+        self.quarantine.forget(self.metrics_file)
@@ -0,0 +1,59 @@
+"""Migrate plan review metrics between storage backends.
+
+Usage:
+    python -m lib.metrics.migrate --from jsonl --to sqlite [--metrics-dir DIR]
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .storage_backend import MetricsBackend
+from .storage_factory import create_metrics_storage
+
+BACKENDS = ('jsonl', 'segmented', 'sqlite')
+
+
+def migrate_metrics(source: MetricsBackend, target: MetricsBackend) -> int:
+    """
+    Stream every metric from one backend into another.
+
+    Args:
+        source: Backend to read from
+        target: Backend to import into
+
+    Returns:
+        Number of metrics imported
+    """
+    return target.import_metrics(source.iter_metrics())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Migrate plan review metrics between storage backends")
+    parser.add_argument('--from', dest='source', choices=BACKENDS, default='jsonl')
+    parser.add_argument('--to', dest='target', choices=BACKENDS, required=True)
+    parser.add_argument('--metrics-dir', type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    if args.source == args.target:
+        parser.error("--from and --to must differ")
+
+    source = create_metrics_storage(args.source, args.metrics_dir)
+    target = create_metrics_storage(args.target, args.metrics_dir)
+
+    count = migrate_metrics(source, target)
+    print(f"Migrated {count} metrics from {args.source} to {args.target}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
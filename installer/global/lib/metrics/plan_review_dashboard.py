@@ -1,10 +1,16 @@
 """Terminal-based dashboard for plan review metrics."""
-from collections import defaultdict
-from datetime import datetime
-from typing import Dict, Any, List, Optional, Literal
+import time
+from pathlib import Path
+from typing import Callable, Dict, Any, Iterable, List, Optional, Literal, Sequence, Tuple, Union
 
-from .metrics_storage import MetricsStorage
-from ..config import PlanReviewConfig
+from .aggregation import COMPLEXITY_BUCKETS, MetricsAggregate
+from .dashboard_summary import SERIALIZERS, DashboardSummary
+from .storage_backend import MetricsBackend
+from .storage_factory import create_federated_storage, create_metrics_storage
+from ..config import ConfigWatcher, PlanReviewConfig
+
+
+OutputFormat = Literal["terminal", "json", "csv", "prometheus"]
 
 
 class PlanReviewDashboard:
@@ -14,128 +20,202 @@ class PlanReviewDashboard:
     Provides simple bar charts and summary statistics.
     """
 
-    def __init__(self, storage: Optional[MetricsStorage] = None, config: Optional[PlanReviewConfig] = None):
+    def __init__(self, storage: Optional[MetricsBackend] = None, config: Optional[PlanReviewConfig] = None):
         """
         Initialize dashboard.
 
         Args:
-            storage: Metrics storage instance (default: creates new)
+            storage: Metrics storage instance (default: backend from config,
+                federated across metrics.repositories when configured)
             config: Configuration instance (default: singleton)
         """
-        self.storage = storage or MetricsStorage()
         self.config = config or PlanReviewConfig()
+        self._owns_storage = storage is None
+        self._storage_settings = self._storage_config()
+        self.storage = storage or self._create_storage()
+
+    def _storage_config(self) -> Tuple[Any, ...]:
+        """Get the settings the dashboard's own storage is built from."""
+        return (
+            self.config.get_metrics_backend(),
+            self.config.get_metrics_archive(),
+            self.config.get_metrics_encoding(),
+            tuple(sorted(self.config.get_metrics_repositories().items())),
+        )
+
+    def _create_storage(self) -> MetricsBackend:
+        """Create the storage selected by the configuration."""
+        repositories = self.config.get_metrics_repositories()
+        if repositories:
+            return create_federated_storage(
+                {repo: Path(root) for repo, root in repositories.items()},
+                self.config.get_metrics_backend(),
+                archive=self.config.get_metrics_archive(),
+                encoding=self.config.get_metrics_encoding()
+            )
+        return create_metrics_storage(
+            self.config.get_metrics_backend(),
+            archive=self.config.get_metrics_archive(),
+            encoding=self.config.get_metrics_encoding()
+        )
+
+    def on_config_change(self, config: PlanReviewConfig) -> None:
+        """
+        Pick up a reloaded configuration (a ``ConfigWatcher`` subscriber).
+
+        A storage the dashboard created itself is recreated when the
+        metrics backend, archive, encoding or federated repositories
+        changed; a storage passed in by the caller is kept.
+
+        Args:
+            config: Reloaded configuration
+        """
+        self.config = config
+        if not self._owns_storage:
+            return
+        settings = self._storage_config()
+        if settings != self._storage_settings:
+            self._storage_settings = settings
+            self.storage = self._create_storage()
 
     def render(
         self,
-        days: int = 30,
-        format: Literal["terminal"] = "terminal"
+        days: Union[int, Sequence[int]] = 30,
+        format: Optional[OutputFormat] = None
     ) -> str:
         """
         Render dashboard in specified format.
 
         Args:
-            days: Number of days to analyze
-            format: Output format (terminal only for MVP)
+            days: Number of days to analyze, or a list of windows to compare
+                side by side (computed in a single pass)
+            format: Output format: 'terminal', 'json', 'csv' or 'prometheus'
+                (default: metrics.output_format from config)
 
         Returns:
             Rendered dashboard as string
         """
-        if format != "terminal":
-            raise ValueError("Only 'terminal' format supported in MVP")
-
-        metrics = self.storage.read_recent_metrics(days)
-        summary = self._aggregate_metrics(metrics)
-
-        return self._render_terminal(summary, days)
-
-    def _aggregate_metrics(self, metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+        format = format or self.config.get_metrics_output_format()
+        if format != "terminal" and format not in SERIALIZERS:
+            raise ValueError(f"Unsupported dashboard format: {format}")
+
+        if not isinstance(days, int):
+            windows = sorted(set(days))
+            if not windows:
+                raise ValueError("At least one window is required")
+            results = self.storage.aggregate_windows(windows)
+            if format == "terminal":
+                return self._render_comparison(results)
+            return SERIALIZERS[format]([
+                DashboardSummary.from_aggregate(current, window)
+                for window, (current, _previous) in sorted(results.items())
+            ])
+
+        return self._render_summary(self.summarize(days), format)
+
+    def summarize(self, days: int = 30) -> DashboardSummary:
         """
-        Aggregate metrics into summary statistics.
+        Compute the structured summary for a window.
 
         Args:
-            metrics: List of metric dictionaries
+            days: Number of days to analyze
 
         Returns:
-            Aggregated summary
+            Dashboard summary
         """
-        summary = {
-            'total_reviews': 0,
-            'decisions': defaultdict(int),
-            'complexity_distribution': defaultdict(int),
-            'avg_architectural_score': 0.0,
-            'avg_complexity_score': 0.0,
-            'avg_duration': 0.0,
-            'forced_reviews': 0,
-            'human_overrides': 0,
-            'by_stack': defaultdict(lambda: {'count': 0, 'avg_score': 0.0}),
-            'outcomes': defaultdict(int)
-        }
-
-        architectural_scores = []
-        complexity_scores = []
-        durations = []
-
-        for metric in metrics:
-            metric_type = metric.get('type')
-
-            if metric_type == 'decision':
-                summary['total_reviews'] += 1
-                decision = metric.get('decision', 'unknown')
-                summary['decisions'][decision] += 1
-
-                arch_score = metric.get('architectural_score', 0)
-                architectural_scores.append(arch_score)
-
-                complexity = metric.get('complexity_score', 0)
-                complexity_scores.append(complexity)
-
-                # Complexity distribution buckets
-                if complexity < 10:
-                    bucket = '0-9'
-                elif complexity < 20:
-                    bucket = '10-19'
-                elif complexity < 30:
-                    bucket = '20-29'
-                elif complexity < 40:
-                    bucket = '30-39'
-                else:
-                    bucket = '40+'
-                summary['complexity_distribution'][bucket] += 1
-
-                if metric.get('forced', False):
-                    summary['forced_reviews'] += 1
-
-                # By stack
-                stack = metric.get('stack', 'unknown')
-                summary['by_stack'][stack]['count'] += 1
-                summary['by_stack'][stack]['avg_score'] += arch_score
-
-            elif metric_type == 'outcome':
-                duration = metric.get('duration_seconds', 0)
-                durations.append(duration)
-
-                if metric.get('human_override', False):
-                    summary['human_overrides'] += 1
+        # Backends with a query engine or cache aggregate in place
+        aggregate = self.storage.aggregate_recent(days)
+        if aggregate is None:
+            aggregate = MetricsAggregate().add_all(self.storage.iter_recent_metrics(days))
+        return DashboardSummary.from_aggregate(aggregate, days)
 
-                final_status = metric.get('final_status', 'unknown')
-                summary['outcomes'][final_status] += 1
+    def watch(
+        self,
+        days: int = 30,
+        refresh_interval: float = 2.0,
+        format: Optional[OutputFormat] = None,
+        iterations: Optional[int] = None,
+        output: Optional[Callable[[str], None]] = None,
+        watcher: Optional[ConfigWatcher] = None
+    ) -> None:
+        """
+        Re-render the dashboard at a fixed rate until interrupted.
 
-        # Calculate averages
-        if architectural_scores:
-            summary['avg_architectural_score'] = sum(architectural_scores) / len(architectural_scores)
+        For the JSONL backend the metrics file is tailed: each refresh folds
+        only the records appended since the previous one into in-memory
+        daily partials, archived days are merged from the archive manifest,
+        and the tail starts over if the file is rotated or truncated (e.g.
+        by ``clear_old_metrics``). Other backends re-aggregate the window on
+        every refresh.
 
-        if complexity_scores:
-            summary['avg_complexity_score'] = sum(complexity_scores) / len(complexity_scores)
+        settings.json is checked for changes before every refresh (see
+        ``on_config_change``), so a new output format, backend or set of
+        federated repositories takes effect without a restart.
 
-        if durations:
-            summary['avg_duration'] = sum(durations) / len(durations)
+        Args:
+            days: Number of days to analyze
+            refresh_interval: Seconds between refreshes
+            format: Output format (default: metrics.output_format from config)
+            iterations: Stop after this many refreshes (default: run until
+                interrupted)
+            output: Callback receiving each rendering (default: redraw the
+                terminal)
+            watcher: Config watcher checked before every refresh (default:
+                one watching this dashboard's configuration)
+        """
+        if format is not None and format != "terminal" and format not in SERIALIZERS:
+            raise ValueError(f"Unsupported dashboard format: {format}")
+        if output is None:
+            output = self._redraw
+        if watcher is None:
+            watcher = ConfigWatcher(self.config)
+        watcher.subscribe(self.on_config_change)
+
+        tail_storage = self.storage
+        tail = tail_storage.tail_aggregates()
+        count = 0
+        try:
+            while iterations is None or count < iterations:
+                if count:
+                    time.sleep(refresh_interval)
+                watcher.check()
+                if self.storage is not tail_storage:
+                    tail_storage = self.storage
+                    tail = tail_storage.tail_aggregates()
+                if tail is not None:
+                    self.storage.flush()
+                    summary = DashboardSummary.from_aggregate(tail.aggregate(days), days)
+                else:
+                    summary = self.summarize(days)
+                output(self._render_summary(summary, format or self.config.get_metrics_output_format()))
+                count += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.unsubscribe(self.on_config_change)
+
+    def _render_summary(self, summary: DashboardSummary, format: str) -> str:
+        """Render one window's summary in the given format."""
+        if format == "terminal":
+            return self._render_terminal(summary.to_dict(), summary.days)
+        return SERIALIZERS[format]([summary])
+
+    @staticmethod
+    def _redraw(text: str) -> None:
+        """Clear the terminal and print a rendering."""
+        print("\033[H\033[2J" + text, flush=True)
+
+    def _aggregate_metrics(self, metrics: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Aggregate metrics into summary statistics.
 
-        # Calculate stack averages
-        for stack_data in summary['by_stack'].values():
-            if stack_data['count'] > 0:
-                stack_data['avg_score'] /= stack_data['count']
+        Args:
+            metrics: Iterable of metric dictionaries (consumed in a single pass)
 
-        return summary
+        Returns:
+            Aggregated summary
+        """
+        return MetricsAggregate().add_all(metrics).summary()
 
     def _render_terminal(self, summary: Dict[str, Any], days: int) -> str:
         """
@@ -162,9 +242,17 @@ class PlanReviewDashboard:
         lines.append(f"Total Reviews:           {summary['total_reviews']}")
         lines.append(f"Forced Reviews:          {summary['forced_reviews']}")
         lines.append(f"Human Overrides:         {summary['human_overrides']}")
-        lines.append(f"Avg Architectural Score: {summary['avg_architectural_score']:.1f}/100")
+        lines.append(
+            f"Avg Architectural Score: {summary['avg_architectural_score']:.1f}/100"
+            f"{self._format_stddev(summary.get('architectural_score_stddev'))}"
+        )
         lines.append(f"Avg Complexity Score:    {summary['avg_complexity_score']:.1f}")
-        lines.append(f"Avg Review Duration:     {summary['avg_duration']:.1f}s")
+        lines.append(
+            f"Avg Review Duration:     {summary['avg_duration']:.1f}s"
+            f"{self._format_stddev(summary.get('duration_stddev'), 's')}"
+        )
+        lines.append(f"Review Duration:         {self._format_percentiles(summary.get('duration_percentiles'), 's')}")
+        lines.append(f"Architectural Score:     {self._format_percentiles(summary.get('architectural_score_percentiles'))}")
         lines.append("")
 
         # Decisions breakdown
@@ -185,9 +273,8 @@ class PlanReviewDashboard:
         lines.append("-" * 80)
         if summary['complexity_distribution']:
             # Sort by bucket order
-            bucket_order = ['0-9', '10-19', '20-29', '30-39', '40+']
             max_count = max(summary['complexity_distribution'].values())
-            for bucket in bucket_order:
+            for bucket in COMPLEXITY_BUCKETS:
                 count = summary['complexity_distribution'].get(bucket, 0)
                 if count > 0 or bucket in summary['complexity_distribution']:
                     bar = self._render_bar(count, max_count, width=40)
@@ -196,27 +283,9 @@ class PlanReviewDashboard:
             lines.append("No complexity data recorded")
         lines.append("")
 
-        # By stack
-        if summary['by_stack']:
-            lines.append("BY TECHNOLOGY STACK")
-            lines.append("-" * 80)
-            for stack, data in sorted(summary['by_stack'].items()):
-                # Defensive: ensure stack, count, and avg_score are safe
-                stack_name = str(stack) if stack is not None else "unknown"
-                count = data.get('count', 0) if isinstance(data, dict) else 0
-                avg_score = data.get('avg_score') if isinstance(data, dict) else None
-
-                # Format safely
-                if avg_score is not None and isinstance(avg_score, (int, float)) and avg_score != 0:
-                    try:
-                        score_str = f"{float(avg_score):.1f}/100"
-                    except (TypeError, ValueError):
-                        score_str = "N/A"
-                else:
-                    score_str = "N/A"
-
-                lines.append(f"{stack_name:15s} Count: {count:3d}  Avg Score: {score_str}")
-            lines.append("")
+        # By stack and, for federated storage, by repository
+        self._render_groups(lines, "BY TECHNOLOGY STACK", summary['by_stack'])
+        self._render_groups(lines, "BY REPOSITORY", summary.get('by_repo'))
 
         # Outcomes
         if summary['outcomes']:
@@ -232,6 +301,155 @@ class PlanReviewDashboard:
 
         return '\n'.join(lines)
 
+    def _render_groups(self, lines: List[str], title: str, groups: Optional[Dict[str, Any]]) -> None:
+        """
+        Render a per-stack or per-repository section.
+
+        Args:
+            lines: Output lines to append to
+            title: Section title
+            groups: Mapping of group name to count, average score and
+                percentiles (section skipped when empty)
+        """
+        if not groups:
+            return
+
+        lines.append(title)
+        lines.append("-" * 80)
+        for name, data in sorted(groups.items()):
+            # Defensive: ensure name, count, and avg_score are safe
+            group_name = str(name) if name is not None else "unknown"
+            count = data.get('count', 0) if isinstance(data, dict) else 0
+            avg_score = data.get('avg_score') if isinstance(data, dict) else None
+
+            # Format safely
+            if avg_score is not None and isinstance(avg_score, (int, float)) and avg_score != 0:
+                try:
+                    score_str = f"{float(avg_score):.1f}/100"
+                except (TypeError, ValueError):
+                    score_str = "N/A"
+            else:
+                score_str = "N/A"
+
+            lines.append(f"{group_name:15s} Count: {count:3d}  Avg Score: {score_str}")
+            if isinstance(data, dict) and 'score_percentiles' in data:
+                lines.append(f"{'':15s} Score:    {self._format_percentiles(data['score_percentiles'])}")
+                lines.append(f"{'':15s} Duration: {self._format_percentiles(data.get('duration_percentiles'), 's')}")
+        lines.append("")
+
+    def _render_comparison(self, windows: Dict[int, Tuple[MetricsAggregate, MetricsAggregate]]) -> str:
+        """
+        Render several windows as a comparative table with trend columns.
+
+        Each window is followed by its change versus the preceding period of
+        the same length (week-over-week for 7 days, month-over-month for 30).
+
+        Args:
+            windows: Mapping of window length to (current, previous) aggregates
+
+        Returns:
+            Terminal-formatted comparison
+        """
+        summaries = {
+            days: (current.summary(), previous.summary())
+            for days, (current, previous) in sorted(windows.items())
+        }
+
+        rows: List[Tuple[str, Any]] = [
+            ("Total Reviews", lambda s: s['total_reviews']),
+            ("Forced Reviews", lambda s: s['forced_reviews']),
+            ("Human Overrides", lambda s: s['human_overrides']),
+            ("Avg Architectural Score", lambda s: s['avg_architectural_score']),
+            ("Avg Complexity Score", lambda s: s['avg_complexity_score']),
+            ("Avg Review Duration (s)", lambda s: s['avg_duration']),
+            ("p90 Review Duration (s)", lambda s: s['duration_percentiles']['p90']),
+        ]
+        for key, label in (('decisions', 'Decision'), ('outcomes', 'Outcome')):
+            names = sorted({name for pair in summaries.values() for summary in pair for name in summary[key]})
+            for name in names:
+                rows.append((f"{label}: {name}", lambda s, key=key, name=name: s[key].get(name, 0)))
+
+        lines = []
+        lines.append("=" * 80)
+        lines.append("Plan Review Metrics Comparison (" + ", ".join(f"{d}d" for d in summaries) + ")")
+        lines.append("=" * 80)
+        lines.append("")
+
+        header = f"{'Metric':24s}"
+        for days in summaries:
+            header += f"{str(days) + 'd':>8s}{self._trend_label(days):>9s}"
+        lines.append(header)
+        lines.append("-" * 80)
+
+        for label, value_of in rows:
+            line = f"{label[:24]:24s}"
+            for current, previous in summaries.values():
+                value = value_of(current)
+                line += f"{self._format_value(value):>8s}{self._format_trend(value, value_of(previous)):>9s}"
+            lines.append(line)
+
+        lines.append("")
+        lines.append("=" * 80)
+
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _trend_label(days: int) -> str:
+        """Column label for the change versus the previous period."""
+        return {7: "WoW", 30: "MoM", 90: "QoQ"}.get(days, f"vs -{days}d")
+
+    @staticmethod
+    def _format_value(value: Optional[float]) -> str:
+        """Format a table cell."""
+        if value is None:
+            return "-"
+        if isinstance(value, int):
+            return str(value)
+        return f"{value:.1f}"
+
+    @staticmethod
+    def _format_trend(current: Optional[float], previous: Optional[float]) -> str:
+        """Format the relative change between two periods."""
+        if current is None or previous is None or (current == 0 and previous == 0):
+            return "-"
+        if previous == 0:
+            return "new"
+        return f"{(current - previous) / previous * 100:+.1f}%"
+
+    def _format_percentiles(self, values: Optional[Dict[str, Optional[float]]], unit: str = '') -> str:
+        """
+        Format p50/p90/p99 values on one line.
+
+        Args:
+            values: Mapping of percentile name to value (None when no data)
+            unit: Unit suffix for each value
+
+        Returns:
+            Formatted percentiles, or "N/A" when there is no data
+        """
+        if not values or all(value is None for value in values.values()):
+            return "N/A"
+        return "  ".join(
+            f"{name} {value:.1f}{unit}" if value is not None else f"{name} N/A"
+            for name, value in values.items()
+        )
+
+    @staticmethod
+    def _format_stddev(value: Optional[float], unit: str = '') -> str:
+        """
+        Format a standard deviation as a suffix for an average.
+
+        Args:
+            value: Standard deviation (None when there is no data)
+            unit: Unit suffix
+
+        Returns:
+            " (± value)", or an empty string when there is no data
+        """
+        if value is None:
+            return ""
+        return f" (± {value:.1f}{unit})"
+
     def _render_bar(self, value: int, max_value: int, width: int = 40) -> str:
         """
         Render simple ASCII bar chart.
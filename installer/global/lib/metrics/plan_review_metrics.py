@@ -1,8 +1,14 @@
 """High-level metrics tracking API for plan review system."""
 from datetime import datetime
-from typing import Dict, Any, Optional, Literal
+from typing import Dict, Any, List, Optional, Literal
 
-from .metrics_storage import MetricsStorage
+from .async_sink import AsyncMetricsSink
+from .cohort_analysis import CohortKey, cohort_analysis
+from .idempotency import IDEMPOTENCY_KEY, event_key
+from .metrics_index import parse_timestamp
+from .storage_backend import MetricsBackend
+from .storage_factory import create_metrics_storage
+from .threshold_calibration import ThresholdCalibration
 from ..config import PlanReviewConfig
 
 
@@ -10,26 +16,68 @@ class PlanReviewMetrics:
     """
     High-level API for tracking plan review metrics.
 
-    Handles metric collection with automatic configuration checking.
+    Handles metric collection with automatic configuration checking. Task
+    events tracked with an ``attempt`` number (or an explicit idempotency
+    key) carry an idempotency key, so a retried review step that tracks the
+    same event again is rejected by the storage; events tracked without
+    either are never deduplicated.
     """
 
-    def __init__(self, storage: Optional[MetricsStorage] = None, config: Optional[PlanReviewConfig] = None):
+    def __init__(
+        self,
+        storage: Optional[MetricsBackend] = None,
+        config: Optional[PlanReviewConfig] = None,
+        sink: Optional[AsyncMetricsSink] = None
+    ):
         """
         Initialize metrics tracker.
 
         Args:
-            storage: Metrics storage instance (default: creates new)
+            storage: Metrics storage instance (default: backend from config)
             config: Configuration instance (default: singleton)
+            sink: Async sink to enqueue metrics on (default: one is created
+                when metrics.async_writes is enabled, otherwise metrics are
+                written synchronously)
         """
-        self.storage = storage or MetricsStorage()
         self.config = config or PlanReviewConfig()
+        self.storage = storage or create_metrics_storage(
+            self.config.get_metrics_backend(),
+            archive=self.config.get_metrics_archive(),
+            encoding=self.config.get_metrics_encoding(),
+            dedup_window=self.config.get_metrics_dedup_window(),
+            buffered=self.config.is_metrics_buffered(),
+            fsync=self.config.get_metrics_fsync_policy()
+        )
+        if sink is None and self.config.is_metrics_async():
+            sink = AsyncMetricsSink(
+                self.storage,
+                max_queue=self.config.get_metrics_queue_size(),
+                overflow=self.config.get_metrics_overflow_policy()
+            )
+        self.sink = sink
+
+    def _record(self, metric: Dict[str, Any]) -> bool:
+        """
+        Write a metric, or queue it when an async sink is configured.
+
+        Args:
+            metric: Metric dictionary
+
+        Returns:
+            True if written (or queued) successfully
+        """
+        if self.sink is not None:
+            return self.sink.submit(metric)
+        return self.storage.append_metric(metric)
 
     def track_complexity(
         self,
         task_id: str,
         complexity_score: int,
         factors: Dict[str, Any],
-        stack: Optional[str] = None
+        stack: Optional[str] = None,
+        attempt: Optional[int] = None,
+        idempotency_key: Optional[str] = None
     ) -> bool:
         """
         Track complexity calculation.
@@ -39,6 +87,10 @@ class PlanReviewMetrics:
             complexity_score: Calculated complexity score
             factors: Complexity factors breakdown
             stack: Technology stack
+            attempt: Review attempt; retries of the same attempt are
+                deduplicated (default: no deduplication)
+            idempotency_key: Explicit idempotency key (default: derived
+                from task_id, type and attempt, if given)
 
         Returns:
             True if tracked successfully
@@ -54,8 +106,11 @@ class PlanReviewMetrics:
             'stack': stack,
             'timestamp': datetime.utcnow().isoformat() + 'Z'
         }
+        key = event_key('complexity', task_id, attempt, idempotency_key)
+        if key is not None:
+            metric[IDEMPOTENCY_KEY] = key
 
-        return self.storage.append_metric(metric)
+        return self._record(metric)
 
     def track_decision(
         self,
@@ -65,7 +120,9 @@ class PlanReviewMetrics:
         complexity_score: int,
         stack: Optional[str] = None,
         forced: bool = False,
-        recommendations: Optional[list] = None
+        recommendations: Optional[list] = None,
+        attempt: Optional[int] = None,
+        idempotency_key: Optional[str] = None
     ) -> bool:
         """
         Track architectural review decision.
@@ -78,6 +135,10 @@ class PlanReviewMetrics:
             stack: Technology stack
             forced: Whether review was forced
             recommendations: List of recommendations
+            attempt: Review attempt; retries of the same attempt are
+                deduplicated (default: no deduplication)
+            idempotency_key: Explicit idempotency key (default: derived
+                from task_id, type and attempt, if given)
 
         Returns:
             True if tracked successfully
@@ -96,8 +157,11 @@ class PlanReviewMetrics:
             'recommendations': recommendations or [],
             'timestamp': datetime.utcnow().isoformat() + 'Z'
         }
+        key = event_key('decision', task_id, attempt, idempotency_key)
+        if key is not None:
+            metric[IDEMPOTENCY_KEY] = key
 
-        return self.storage.append_metric(metric)
+        return self._record(metric)
 
     def track_outcome(
         self,
@@ -106,7 +170,9 @@ class PlanReviewMetrics:
         human_override: bool,
         duration_seconds: float,
         final_status: Literal['approved', 'rejected', 'timeout'],
-        stack: Optional[str] = None
+        stack: Optional[str] = None,
+        attempt: Optional[int] = None,
+        idempotency_key: Optional[str] = None
     ) -> bool:
         """
         Track final outcome of review process.
@@ -118,6 +184,10 @@ class PlanReviewMetrics:
             duration_seconds: Total review duration
             final_status: Final outcome status
             stack: Technology stack
+            attempt: Review attempt; retries of the same attempt are
+                deduplicated (default: no deduplication)
+            idempotency_key: Explicit idempotency key (default: derived
+                from task_id, type and attempt, if given)
 
         Returns:
             True if tracked successfully
@@ -135,8 +205,11 @@ class PlanReviewMetrics:
             'stack': stack,
             'timestamp': datetime.utcnow().isoformat() + 'Z'
         }
+        key = event_key('outcome', task_id, attempt, idempotency_key)
+        if key is not None:
+            metric[IDEMPOTENCY_KEY] = key
 
-        return self.storage.append_metric(metric)
+        return self._record(metric)
 
     def track_threshold_adjustment(
         self,
@@ -144,7 +217,8 @@ class PlanReviewMetrics:
         new_threshold: int,
         threshold_type: Literal['auto_approve', 'approve_with_recommendations'],
         reason: str,
-        stack: Optional[str] = None
+        stack: Optional[str] = None,
+        idempotency_key: Optional[str] = None
     ) -> bool:
         """
         Track threshold configuration changes.
@@ -155,6 +229,8 @@ class PlanReviewMetrics:
             threshold_type: Type of threshold adjusted
             reason: Reason for adjustment
             stack: Technology stack (None for global)
+            idempotency_key: Idempotency key (default: none; adjustments
+                are not tied to a task)
 
         Returns:
             True if tracked successfully
@@ -171,8 +247,10 @@ class PlanReviewMetrics:
             'stack': stack,
             'timestamp': datetime.utcnow().isoformat() + 'Z'
         }
+        if idempotency_key is not None:
+            metric[IDEMPOTENCY_KEY] = idempotency_key
 
-        return self.storage.append_metric(metric)
+        return self._record(metric)
 
     def get_recent_metrics(self, days: int = 30) -> list:
         """
@@ -184,14 +262,104 @@ class PlanReviewMetrics:
         Returns:
             List of recent metrics
         """
+        if self.sink is not None:
+            self.sink.drain()
         return self.storage.read_recent_metrics(days)
 
+    def get_task_timeline(self, task_id: str) -> List[Dict[str, Any]]:
+        """
+        Get every metric recorded for a task in chronological order.
+
+        Events are ordered by their parsed UTC time, so timestamps written
+        with and without offsets interleave correctly; events without a
+        valid timestamp come last, in recording order.
+
+        Args:
+            task_id: Task identifier
+
+        Returns:
+            Complexity, decision, outcome (and other) events for the task
+        """
+        if self.sink is not None:
+            self.sink.drain()
+        return sorted(self.storage.iter_task_metrics(task_id), key=self._timeline_key)
+
+    @staticmethod
+    def _timeline_key(metric: Dict[str, Any]) -> tuple:
+        """Sort key placing metrics by UTC time, undated ones last."""
+        timestamp = parse_timestamp(metric)
+        return (timestamp is None, timestamp or datetime.min)
+
+    def analyze_cohorts(self, days: int = 30, by: CohortKey = 'stack') -> Dict[str, Dict[str, Any]]:
+        """
+        Compare task cohorts over recent metrics.
+
+        Rollup records are not read, so days rolled up by
+        ``cleanup_old_metrics`` do not contribute.
+
+        Args:
+            days: Number of days to look back
+            by: Cohort dimension: 'stack', 'complexity_bucket' or 'decision'
+
+        Returns:
+            Per-cohort statistics (see ``cohort_analysis``)
+        """
+        if self.sink is not None:
+            self.sink.drain()
+        return cohort_analysis(self.storage.iter_recent_metrics(days), by)
+
+    def calibrate_thresholds(
+        self,
+        days: int = 90,
+        auto_approve_override_rate: float = 0.05,
+        recommendations_override_rate: float = 0.20,
+        min_samples: int = 20
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Recommend decision thresholds from recent review outcomes.
+
+        Rollup records are not read, so ``days`` should not reach past
+        metrics.rollup_after_days for the full history to be replayed.
+
+        Args:
+            days: Number of days of history to replay
+            auto_approve_override_rate: Override budget for auto-approval
+            recommendations_override_rate: Override budget for approval with
+                recommendations
+            min_samples: Minimum approved tasks for a threshold to be trusted
+
+        Returns:
+            Per-stack recommendations compared with the configured thresholds
+            (see ``ThresholdCalibration.report``)
+        """
+        if self.sink is not None:
+            self.sink.drain()
+        calibration = ThresholdCalibration.from_metrics(self.storage.iter_recent_metrics(days))
+        return calibration.report(
+            self.config,
+            auto_approve_override_rate=auto_approve_override_rate,
+            recommendations_override_rate=recommendations_override_rate,
+            min_samples=min_samples
+        )
+
     def cleanup_old_metrics(self) -> int:
         """
         Clean up metrics older than retention period.
 
+        When metrics.rollup_after_days is set, decision and outcome events
+        older than that are first replaced by daily rollup records, which
+        then age out with the retention period like any other metric.
+        Dashboard summaries read rollups; cohort analysis, threshold
+        calibration and task timelines only see days that were not rolled
+        up.
+
         Returns:
-            Number of metrics removed
+            Number of metrics removed by retention
         """
+        if self.sink is not None:
+            self.sink.drain()
+        rollup_after_days = self.config.get_metrics_rollup_after_days()
+        if rollup_after_days:
+            self.storage.rollup_old_metrics(rollup_after_days)
         retention_days = self.config.get_metrics_retention_days()
         return self.storage.clear_old_metrics(retention_days)
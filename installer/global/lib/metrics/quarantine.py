@@ -0,0 +1,118 @@
+"""Quarantine for corrupted lines in JSONL metrics files."""
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+
+from .metrics_index import QuarantineIndex
+from ..utils import FileOperations
+
+
+class MetricsQuarantine:
+    """
+    Copies corrupted metric lines to a quarantine file, once.
+
+    The first read that hits a corrupted line appends it (with its source
+    file, byte offset and decode error) to ``<metrics stem>.quarantine.jsonl``
+    and warns once; the offset is remembered in a sidecar index next to the
+    source file so later reads skip the line silently and only bump
+    ``skipped``. An incomplete final line is never quarantined on read, as
+    it may still be being written; ``MetricsStorage.repair`` deals with it.
+    A read-only quarantine only counts skipped lines.
+    """
+
+    def __init__(self, metrics_file: Path, quarantine_file: Optional[Path] = None, read_only: bool = False):
+        """
+        Initialize metrics quarantine.
+
+        Args:
+            metrics_file: Main metrics file (names the quarantine file)
+            quarantine_file: Quarantine path (default:
+                <metrics stem>.quarantine.jsonl)
+            read_only: Never write the quarantine file or its index
+        """
+        self.quarantine_file = quarantine_file or metrics_file.with_suffix('.quarantine.jsonl')
+        self.read_only = read_only
+        self.skipped = 0
+        self._indexes: Dict[Path, QuarantineIndex] = {}
+
+    def _index(self, source: Path) -> QuarantineIndex:
+        """Get the quarantine index of a source file."""
+        index = self._indexes.get(source)
+        if index is None:
+            index = self._indexes[source] = QuarantineIndex(source)
+        return index
+
+    def add(self, source: Path, offset: int, raw_line: bytes, reason: str) -> bool:
+        """
+        Copy a line to the quarantine file unless it is already there.
+
+        Args:
+            source: File the line was read from
+            offset: Byte offset of the line
+            raw_line: Raw line bytes
+            reason: Why the line was quarantined
+
+        Returns:
+            True if newly quarantined, False if it already was (or the
+            quarantine file could not be written)
+        """
+        index = self._index(source)
+        if index.contains(offset):
+            return False
+
+        entry = {
+            'source': source.name,
+            'offset': offset,
+            'reason': reason,
+            'line': raw_line.decode('utf-8', errors='replace').rstrip('\n'),
+            'quarantined_at': datetime.utcnow().isoformat() + 'Z',
+        }
+        data = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        if FileOperations.append_record(self.quarantine_file, data) is None:
+            return False
+
+        index.add(offset, len(raw_line))
+        return True
+
+    def skip(self, source: Path, offset: int, raw_line: bytes, error: Exception) -> None:
+        """
+        Account for a corrupted line skipped by a reader.
+
+        Args:
+            source: File the line was read from
+            offset: Byte offset of the line
+            raw_line: Raw line bytes
+            error: Decode error
+        """
+        self.skipped += 1
+        if self.read_only or not raw_line.endswith(b'\n'):
+            return
+        if self.add(source, offset, raw_line, str(error)):
+            print(f"Warning: Quarantined corrupted metric at {source.name} offset {offset}: {error} "
+                  f"(see {self.quarantine_file})")
+
+    def forget(self, source: Path) -> None:
+        """
+        Drop the quarantine index of a source file that was rewritten or deleted.
+
+        Args:
+            source: Source file
+        """
+        index = self._indexes.pop(source, None) or QuarantineIndex(source)
+        index.invalidate()
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over quarantined lines.
+
+        Yields:
+            Entries with source, offset, reason, line and quarantined_at
+        """
+        for _offset, raw_line in FileOperations.iter_lines(self.quarantine_file):
+            try:
+                entry = json.loads(raw_line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if isinstance(entry, dict):
+                yield entry
@@ -0,0 +1,294 @@
+"""Typed, slotted metric records and the compact JSONL encoding."""
+import json
+from typing import Dict, Any, List, Mapping, Optional, Tuple, Type, Union
+
+SCHEMA_VERSION = 1
+
+_MISSING = object()
+
+
+class MetricRecord:
+    """
+    Base class for typed metric records.
+
+    Each subclass declares its fields in ``__slots__`` (which is also the
+    field order of the compact encoding), so a record costs one slot per
+    field instead of a per-instance dict. Keys outside the schema are kept
+    in ``extra``. Records answer ``get``, ``[]`` and ``in`` like the metric
+    dictionaries they replace, so aggregation code accepts either.
+    """
+
+    __slots__ = ('extra',)
+
+    TYPE = ''
+    TAG = ''
+    FIELDS: Tuple[str, ...] = ()
+
+    def __init__(self, **fields: Any):
+        """
+        Initialize a record.
+
+        Args:
+            **fields: Field values; fields not given are absent (as if the
+                key were missing from the metric dictionary), unknown keys
+                go to ``extra``
+        """
+        for name in self.FIELDS:
+            setattr(self, name, fields.pop(name, _MISSING))
+        fields.pop('type', None)
+        self.extra: Optional[Dict[str, Any]] = fields or None
+
+    @classmethod
+    def from_dict(cls, metric: Mapping[str, Any]) -> 'MetricRecord':
+        """
+        Build a record from a metric dictionary.
+
+        Args:
+            metric: Metric dictionary of this record's type
+
+        Returns:
+            Record instance
+        """
+        return cls(**metric)
+
+    @classmethod
+    def from_compact(cls, values: List[Any]) -> 'MetricRecord':
+        """
+        Build a record from a compact row (without its tag).
+
+        Args:
+            values: Field values in ``FIELDS`` order, optionally followed by
+                a dict of extra keys
+
+        Returns:
+            Record instance
+        """
+        record = cls.__new__(cls)
+        for name, value in zip(cls.FIELDS, values):
+            setattr(record, name, value)
+        extra = values[len(cls.FIELDS)] if len(values) > len(cls.FIELDS) else None
+        record.extra = extra if isinstance(extra, dict) and extra else None
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to a metric dictionary.
+
+        Returns:
+            Metric dictionary with ``type`` first and absent fields omitted
+        """
+        metric = {'type': self.TYPE}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not _MISSING:
+                metric[name] = value
+        if self.extra:
+            metric.update(self.extra)
+        return metric
+
+    def to_compact(self) -> Optional[List[Any]]:
+        """
+        Convert to a compact row.
+
+        Returns:
+            [tag, field values..., (extra)], or None if a field is absent
+            (absent and null fields must stay distinguishable)
+        """
+        row = [self.TAG]
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is _MISSING:
+                return None
+            row.append(value)
+        if self.extra:
+            row.append(self.extra)
+        return row
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Look up a field like ``dict.get``.
+
+        Args:
+            key: Field name (or ``'type'``)
+            default: Value for absent fields
+
+        Returns:
+            Field value, or default if absent
+        """
+        if key == 'type':
+            return self.TYPE
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, MetricRecord):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class ComplexityRecord(MetricRecord):
+    """Complexity calculation for a task."""
+
+    __slots__ = FIELDS = ('task_id', 'complexity_score', 'factors', 'stack', 'timestamp')
+    TYPE = 'complexity'
+    TAG = f'c{SCHEMA_VERSION}'
+
+
+class DecisionRecord(MetricRecord):
+    """Architectural review decision."""
+
+    __slots__ = FIELDS = (
+        'task_id', 'architectural_score', 'decision', 'complexity_score', 'stack',
+        'forced', 'recommendations', 'timestamp',
+    )
+    TYPE = 'decision'
+    TAG = f'd{SCHEMA_VERSION}'
+
+
+class OutcomeRecord(MetricRecord):
+    """Final outcome of a review."""
+
+    __slots__ = FIELDS = (
+        'task_id', 'decision', 'human_override', 'duration_seconds', 'final_status',
+        'stack', 'timestamp',
+    )
+    TYPE = 'outcome'
+    TAG = f'o{SCHEMA_VERSION}'
+
+
+class ThresholdAdjustmentRecord(MetricRecord):
+    """Threshold configuration change."""
+
+    __slots__ = FIELDS = (
+        'old_threshold', 'new_threshold', 'threshold_type', 'reason', 'stack', 'timestamp',
+    )
+    TYPE = 'threshold_adjustment'
+    TAG = f't{SCHEMA_VERSION}'
+
+
+RECORD_TYPES: Dict[str, Type[MetricRecord]] = {
+    record_type.TYPE: record_type
+    for record_type in (ComplexityRecord, DecisionRecord, OutcomeRecord, ThresholdAdjustmentRecord)
+}
+
+_BY_TAG: Dict[str, Type[MetricRecord]] = {
+    record_type.TAG: record_type for record_type in RECORD_TYPES.values()
+}
+
+Metric = Union[MetricRecord, Dict[str, Any]]
+
+
+def to_record(metric: Mapping[str, Any]) -> Metric:
+    """
+    Convert a metric dictionary to its typed record.
+
+    Args:
+        metric: Metric dictionary
+
+    Returns:
+        Typed record, or the dictionary itself for types without a record
+        class (e.g. rollups)
+    """
+    record_type = RECORD_TYPES.get(metric.get('type'))
+    return record_type.from_dict(metric) if record_type is not None else metric
+
+
+def encode_metric(metric: Metric, compact: bool = False) -> str:
+    """
+    Serialize a metric to one JSONL line (without the newline).
+
+    Args:
+        metric: Metric dictionary or record
+        compact: Write known metric types as compact rows; other metrics
+            (and records with absent fields) fall back to JSON objects
+
+    Returns:
+        JSON text
+    """
+    if compact:
+        record = metric if isinstance(metric, MetricRecord) else to_record(metric)
+        row = record.to_compact() if isinstance(record, MetricRecord) else None
+        if row is not None:
+            return json.dumps(row, ensure_ascii=False, separators=(',', ':'))
+    if isinstance(metric, MetricRecord):
+        metric = metric.to_dict()
+    return json.dumps(metric, ensure_ascii=False)
+
+
+def _load(raw_line: Union[bytes, str]) -> Any:
+    """Parse a JSONL line, rejecting values that are neither objects nor rows."""
+    value = json.loads(raw_line)
+    if isinstance(value, (dict, list)):
+        return value
+    raise ValueError("Metric line is neither a JSON object nor a compact row")
+
+
+def _compact_type(row: List[Any]) -> Type[MetricRecord]:
+    """Resolve (and check) the record type of a compact row."""
+    record_type = _BY_TAG.get(row[0]) if row and isinstance(row[0], str) else None
+    if record_type is None:
+        raise ValueError(f"Unknown compact record tag: {row[0] if row else None!r}")
+    if not len(record_type.FIELDS) < len(row) <= len(record_type.FIELDS) + 2:
+        raise ValueError(f"Compact {record_type.TYPE} row has {len(row) - 1} values")
+    return record_type
+
+
+def decode_metric(raw_line: Union[bytes, str]) -> Dict[str, Any]:
+    """
+    Decode a JSONL line in either encoding to a metric dictionary.
+
+    Args:
+        raw_line: JSON object or compact row
+
+    Returns:
+        Metric dictionary
+
+    Raises:
+        ValueError: If the line is corrupted (``json.JSONDecodeError`` and
+            ``UnicodeDecodeError`` are subclasses)
+    """
+    value = _load(raw_line)
+    if isinstance(value, dict):
+        return value
+    record_type = _compact_type(value)
+    metric = {'type': record_type.TYPE}
+    metric.update(zip(record_type.FIELDS, value[1:]))
+    if len(value) > len(record_type.FIELDS) + 1 and isinstance(value[-1], dict):
+        metric.update(value[-1])
+    return metric
+
+
+def decode_record(raw_line: Union[bytes, str]) -> Metric:
+    """
+    Decode a JSONL line in either encoding to a typed record.
+
+    Args:
+        raw_line: JSON object or compact row
+
+    Returns:
+        Typed record (a dictionary for types without a record class)
+
+    Raises:
+        ValueError: If the line is corrupted
+    """
+    value = _load(raw_line)
+    if isinstance(value, dict):
+        return to_record(value)
+    return _compact_type(value).from_compact(value[1:])
+
@@ -0,0 +1,48 @@
+"""Repair plan review metrics storage after a crash.
+
+Usage:
+    python -m lib.metrics.repair [--backend jsonl] [--metrics-dir DIR]
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .migrate import BACKENDS
+from .storage_factory import create_metrics_storage
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        description="Truncate torn writes, quarantine corrupted metrics and rebuild indexes"
+    )
+    parser.add_argument('--backend', choices=BACKENDS, default='jsonl')
+    parser.add_argument('--metrics-dir', type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    storage = create_metrics_storage(args.backend, args.metrics_dir)
+    result = storage.repair()
+
+    if not result:
+        print(f"Nothing to repair for the {args.backend} backend")
+        return 0
+
+    print(f"Truncated {result['torn_lines']} torn line(s), "
+          f"quarantined {result['corrupted_lines']} corrupted line(s)")
+    quarantine = getattr(storage, 'quarantine', None)
+    if quarantine is not None and quarantine.quarantine_file.exists():
+        print(f"Quarantined lines: {quarantine.quarantine_file}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
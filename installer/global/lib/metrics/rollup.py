@@ -0,0 +1,143 @@
+"""Downsample old metrics into one rollup record per day."""
+from collections import defaultdict
+from typing import Dict, Any, List
+
+from .aggregation import MetricsAggregate
+from .metrics_index import parse_timestamp
+
+ROLLUP_TYPE = 'rollup'
+
+# Event types MetricsAggregate summarizes; other types are never rolled up
+ROLLED_UP_TYPES = ('decision', 'outcome')
+
+# Rollups are stamped at the last instant of their day
+ROLLUP_TIME = '23:59:59.999999'
+
+
+def rollup_timestamp(day: str) -> str:
+    """
+    Get the timestamp of a day's rollup record.
+
+    A rollup stands for its whole day, so it is stamped at the day's last
+    instant: every window that includes any part of the day (a cutoff
+    falling inside it) counts the whole rollup, and it falls in exactly
+    one of two adjacent periods.
+
+    Args:
+        day: ISO date
+
+    Returns:
+        ISO timestamp
+    """
+    return f"{day}T{ROLLUP_TIME}Z"
+
+
+def rollup_record(day: str, aggregate: MetricsAggregate) -> Dict[str, Any]:
+    """
+    Build the rollup record that replaces a day's raw events.
+
+    The record is timestamped at the end of its day (see
+    ``rollup_timestamp``) and carries the day's serialized aggregate: counts per decision, complexity bucket,
+    stack and outcome, sums and sums of squares of scores and durations,
+    and their distributions.
+
+    Args:
+        day: ISO date
+        aggregate: Aggregate over the day's events
+
+    Returns:
+        Rollup metric dictionary
+    """
+    return {
+        'type': ROLLUP_TYPE,
+        'day': day,
+        'timestamp': rollup_timestamp(day),
+        'aggregate': aggregate.to_dict(),
+    }
+
+
+class DailyRollups:
+    """
+    Folds metrics from days before a cutoff into one aggregate per day.
+
+    Feed every metric to ``add``; metrics it consumes (decision and
+    outcome events and existing rollups from before ``first_kept_day``)
+    are replaced by the records from ``records``, the rest must be kept as
+    they are. Complexity, threshold adjustment and other event types are
+    never consumed, so they stay raw until retention removes them.
+
+    Only ``MetricsAggregate`` reads rollups, so dashboard summaries
+    (``aggregate_recent``, ``aggregate_windows`` and the watch tail) keep
+    counting rolled-up days. Readers that need per-task detail skip rollup
+    records: ``cohort_analysis``, ``ThresholdCalibration`` and task
+    timelines only see the decisions and outcomes of days that have not
+    been rolled up.
+    """
+
+    def __init__(self, first_kept_day: str):
+        """
+        Initialize rollup builder.
+
+        Args:
+            first_kept_day: ISO date of the oldest day whose raw events are kept
+        """
+        self.first_kept_day = first_kept_day
+        self.daily: Dict[str, MetricsAggregate] = defaultdict(MetricsAggregate)
+        self.rolled_up = 0
+        self.rollups_read = 0
+        self.restamped = 0
+
+    def covers(self, metric: Dict[str, Any]) -> bool:
+        """
+        Check whether a metric falls on a rolled-up day.
+
+        Args:
+            metric: Metric dictionary
+
+        Returns:
+            True if the metric is a rollup or an aggregated event type
+            dated before ``first_kept_day``
+        """
+        if metric.get('type') not in ROLLED_UP_TYPES and metric.get('type') != ROLLUP_TYPE:
+            return False
+        timestamp = parse_timestamp(metric)
+        return timestamp is not None and timestamp.date().isoformat() < self.first_kept_day
+
+    def add(self, metric: Dict[str, Any]) -> bool:
+        """
+        Offer a metric to the rollups.
+
+        Args:
+            metric: Metric dictionary
+
+        Returns:
+            True if the metric was folded into a rollup and should be
+            dropped, False if it must be kept
+        """
+        if not self.covers(metric):
+            return False
+
+        day = parse_timestamp(metric).date().isoformat()
+        self.daily[day].add(metric)
+        if metric.get('type') == ROLLUP_TYPE:
+            self.rollups_read += 1
+            if metric.get('timestamp') != rollup_timestamp(day):
+                # Written when rollups were stamped at the start of the day
+                self.restamped += 1
+        else:
+            self.rolled_up += 1
+        return True
+
+    @property
+    def changed(self) -> bool:
+        """Whether any raw event was rolled up (or existing rollups merged or restamped)."""
+        return self.rolled_up > 0 or self.rollups_read > len(self.daily) or self.restamped > 0
+
+    def records(self) -> List[Dict[str, Any]]:
+        """
+        Get the rollup records, one per day.
+
+        Returns:
+            Rollup metric dictionaries in day order
+        """
+        return [rollup_record(day, self.daily[day]) for day in sorted(self.daily)]
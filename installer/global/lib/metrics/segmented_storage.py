@@ -0,0 +1,537 @@
+"""Time-partitioned JSONL metrics storage with segment-level retention."""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Literal, Optional, Sequence, Tuple
+
+from .aggregation import MetricsAggregate, fold_windows
+from .aggregation_cache import AggregationCache
+from .idempotency import metric_key
+from .metrics_archive import MetricsArchive
+from .metrics_index import IdempotencyIndex, TaskIndex
+from .metrics_storage import MetricsStorage, MetricsEncoding
+from .records import Metric, decode_metric, decode_record, encode_metric, to_record
+from .rollup import DailyRollups
+from ..utils import FileOperations, JsonSerializer
+
+
+class SegmentedMetricsStorage(MetricsStorage):
+    """
+    Stores metrics as one JSONL segment per day (or hour) plus a manifest.
+
+    Layout (next to the regular metrics file)::
+
+        plan_review_metrics_segments/
+            manifest.json
+            plan_review_metrics-2025-01-31.jsonl
+            plan_review_metrics-2025-02-01.jsonl
+
+    Retention deletes whole expired segments and windowed reads only open
+    segments that overlap the window, so both cost time proportional to
+    the window rather than to the total history. Each segment has its own
+    idempotency key index and task index (``<segment stem>.keys.json`` and
+    ``.tasks.json``); a keyed metric is checked against the segment it
+    lands in and the one before it, so retries across a period boundary
+    are still caught. The base metrics file is never written or indexed.
+    """
+
+    MANIFEST_VERSION = 1
+
+    _PERIOD_FORMATS = {
+        'day': '%Y-%m-%d',
+        'hour': '%Y-%m-%dT%H',
+    }
+
+    _PERIOD_LENGTHS = {
+        'day': timedelta(days=1),
+        'hour': timedelta(hours=1),
+    }
+
+    def __init__(
+        self,
+        metrics_file: Optional[Path] = None,
+        partition: Literal['day', 'hour'] = 'day',
+        archive: Optional[MetricsArchive] = None,
+        encoding: MetricsEncoding = 'json',
+        dedup_window: int = IdempotencyIndex.DEFAULT_CAPACITY,
+        read_only: bool = False
+    ):
+        """
+        Initialize segmented metrics storage.
+
+        Args:
+            metrics_file: Base metrics file path, used to derive the segment
+                directory and segment names (default: from PathResolver)
+            partition: Segment granularity ('day' or 'hour')
+            archive: Cold tier that expired segments are compressed into
+                instead of being deleted (default: delete)
+            encoding: Line encoding for new metrics ('json' or 'compact')
+            dedup_window: Number of recent idempotency keys checked per
+                segment
+            read_only: Only read segments; the manifest is rebuilt in
+                memory if needed and task indexes are not persisted
+        """
+        if partition not in self._PERIOD_FORMATS:
+            raise ValueError(f"Unknown partition: {partition}")
+
+        self.partition = partition
+        self._known_segments: Optional[Dict[str, str]] = None
+        super().__init__(
+            metrics_file, archive=archive, encoding=encoding, dedup_window=dedup_window, read_only=read_only
+        )
+        self.segments_dir = self.metrics_file.parent / f"{self.metrics_file.stem}_segments"
+        self.manifest_file = self.segments_dir / 'manifest.json'
+        if not read_only:
+            FileOperations.ensure_directory(self.segments_dir)
+
+    def _init_indexes(self) -> None:
+        """Segments are indexed individually, as they are first touched."""
+        self._key_indexes: Dict[Path, IdempotencyIndex] = {}
+        self._task_indexes: Dict[Path, TaskIndex] = {}
+
+    def _period_start(self, timestamp: datetime) -> datetime:
+        """Truncate a timestamp to the start of its partition period."""
+        if self.partition == 'hour':
+            return timestamp.replace(minute=0, second=0, microsecond=0)
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def _segment_name(self, period_start: datetime) -> str:
+        """Build the segment filename for a partition period."""
+        suffix = period_start.strftime(self._PERIOD_FORMATS[self.partition])
+        return f"{self.metrics_file.stem}-{suffix}.jsonl"
+
+    def _parse_segment_name(self, name: str) -> Optional[datetime]:
+        """Recover the period start from a segment filename."""
+        prefix = f"{self.metrics_file.stem}-"
+        if not (name.startswith(prefix) and name.endswith('.jsonl')):
+            return None
+        try:
+            return datetime.strptime(
+                name[len(prefix):-len('.jsonl')],
+                self._PERIOD_FORMATS[self.partition]
+            )
+        except ValueError:
+            return None
+
+    def _load_manifest(self) -> Dict[str, str]:
+        """
+        Load the segment manifest, rebuilding it from the directory if needed.
+
+        Returns:
+            Mapping of segment filename to ISO period start
+        """
+        manifest = JsonSerializer.safe_load_file(self.manifest_file)
+        if (
+            manifest.get('version') == self.MANIFEST_VERSION
+            and manifest.get('partition') == self.partition
+            and isinstance(manifest.get('segments'), dict)
+        ):
+            return dict(manifest['segments'])
+
+        return self.rebuild_manifest()
+
+    def _save_manifest(self, segments: Dict[str, str]) -> bool:
+        """Atomically persist the segment manifest."""
+        manifest = {
+            'version': self.MANIFEST_VERSION,
+            'partition': self.partition,
+            'segments': dict(sorted(segments.items(), key=lambda item: item[1])),
+        }
+        return FileOperations.atomic_write(self.manifest_file, JsonSerializer.serialize(manifest))
+
+    def rebuild_manifest(self) -> Dict[str, str]:
+        """
+        Rebuild the manifest from the segment files on disk.
+
+        Returns:
+            Mapping of segment filename to ISO period start
+        """
+        segments = {}
+        if self.segments_dir.exists():
+            for path in self.segments_dir.glob(f"{self.metrics_file.stem}-*.jsonl"):
+                period_start = self._parse_segment_name(path.name)
+                if period_start is not None:
+                    segments[path.name] = period_start.isoformat()
+
+        if not self.read_only:
+            self._save_manifest(segments)
+        self._known_segments = segments
+        return segments
+
+    def _segments(self, since: Optional[datetime] = None) -> List[Tuple[datetime, Path]]:
+        """
+        List segments in chronological order.
+
+        Args:
+            since: Only include segments whose period ends after this time
+
+        Returns:
+            List of (period start, segment path) tuples
+        """
+        self._known_segments = self._load_manifest()
+        period = self._PERIOD_LENGTHS[self.partition]
+
+        segments = []
+        for name, start_str in self._known_segments.items():
+            try:
+                period_start = datetime.fromisoformat(start_str)
+            except (TypeError, ValueError):
+                continue
+            if since is not None and period_start + period <= since:
+                continue
+            segments.append((period_start, self.segments_dir / name))
+
+        segments.sort(key=lambda item: item[0])
+        return segments
+
+    def _write_line(self, metric: Dict[str, Any], json_line: str) -> bool:
+        """Append a serialized metric to the segment covering its timestamp."""
+        timestamp = self._parse_timestamp(metric) or datetime.utcnow()
+        period_start = self._period_start(timestamp)
+        name = self._segment_name(period_start)
+
+        path = self.segments_dir / name
+
+        with self.lock:
+            # Another process may have expired a segment we saw earlier
+            if self._known_segments is None or name not in self._known_segments or not path.exists():
+                # Register the segment before writing so readers never miss it
+                segments = self._load_manifest()
+                if name not in segments:
+                    segments[name] = period_start.isoformat()
+                    self._save_manifest(segments)
+                self._known_segments = segments
+
+            key = metric_key(metric)
+            if key is not None:
+                earlier = [
+                    (start, segment) for segment, start in self._known_segments.items()
+                    if start < period_start.isoformat()
+                ]
+                checked = [path]
+                if earlier:
+                    checked.append(self.segments_dir / max(earlier)[1])
+                if any(self._is_duplicate(self._key_index(segment), key) for segment in checked):
+                    return True
+
+            data = json_line.encode('utf-8')
+            offset = FileOperations.append_record(path, data)
+            if offset is not None:
+                self._note_append((self._key_index(path), self._task_index(path)), offset, data)
+        return offset is not None
+
+    def _key_index(self, path: Path) -> IdempotencyIndex:
+        """Get the idempotency key index of a segment."""
+        index = self._key_indexes.get(path)
+        if index is None:
+            index = self._key_indexes[path] = IdempotencyIndex(path, capacity=self.dedup_window)
+        return index
+
+    def _task_index(self, path: Path) -> TaskIndex:
+        """Get the task index of a segment."""
+        index = self._task_indexes.get(path)
+        if index is None:
+            index = self._task_indexes[path] = TaskIndex(path, persist=not self.read_only)
+        return index
+
+    def _forget_segment(self, path: Path) -> None:
+        """Drop the quarantine, key and task indexes of a rewritten or deleted segment."""
+        self.quarantine.forget(path)
+        index = self._key_indexes.pop(path, None) or IdempotencyIndex(path, capacity=self.dedup_window)
+        index.invalidate()
+        (self._task_indexes.pop(path, None) or TaskIndex(path)).invalidate()
+
+    def iter_metrics(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over all metrics, segment by segment.
+
+        Yields:
+            Metric dictionaries (archived ones first)
+        """
+        self.flush()
+        if self.archive is not None:
+            yield from self.archive.iter_metrics()
+        for _period_start, path in self._segments():
+            for _offset, metric in self._iter_entries(path=path):
+                yield metric
+
+    def iter_records(self) -> Iterator[Metric]:
+        """
+        Lazily iterate over all metrics as typed records, segment by segment.
+
+        Yields:
+            Typed records (dictionaries for types without a record class)
+        """
+        self.flush()
+        if self.archive is not None:
+            for metric in self.archive.iter_metrics():
+                yield to_record(metric)
+        for _period_start, path in self._segments():
+            for _offset, record in self._iter_entries(path=path, decode=decode_record):
+                yield record
+
+    def iter_recent_metrics(self, days: int = 30) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over metrics from the last N days.
+
+        Only segments (live or archived) overlapping the window are opened.
+
+        Args:
+            days: Number of days to look back
+
+        Yields:
+            Recent metric dictionaries
+        """
+        self.flush()
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+
+        if self.archive is not None:
+            for metric in self.archive.iter_metrics(since_day=cutoff_date.date().isoformat()):
+                metric_date = self._parse_timestamp(metric)
+                if metric_date is not None and metric_date >= cutoff_date:
+                    yield metric
+
+        for _period_start, path in self._segments(since=cutoff_date):
+            for _offset, metric in self._iter_entries(path=path):
+                metric_date = self._parse_timestamp(metric)
+                if metric_date is not None and metric_date >= cutoff_date:
+                    yield metric
+
+    def aggregate_recent(self, days: int = 30) -> Optional[MetricsAggregate]:
+        """
+        Let the caller fold the window itself.
+
+        Windowed reads already only open overlapping segments.
+
+        Args:
+            days: Number of days to analyze
+
+        Returns:
+            None
+        """
+        return None
+
+    def aggregate_windows(self, windows: Sequence[int]) -> Dict[int, Tuple[MetricsAggregate, MetricsAggregate]]:
+        """
+        Aggregate several windows in one read of the overlapping segments.
+
+        Args:
+            windows: Window lengths in days
+
+        Returns:
+            Mapping of window length to (current, previous) aggregates
+        """
+        return fold_windows(self.iter_recent_metrics(2 * max(windows)), windows)
+
+    def iter_task_metrics(self, task_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over all metrics recorded for a task.
+
+        Each segment's task index lists the task's lines, so only those
+        lines are read; a segment whose index stays inconsistent with it
+        is scanned instead. As with ``MetricsStorage``, archived metrics
+        are not included.
+
+        Args:
+            task_id: Task identifier
+
+        Yields:
+            Metric dictionaries in segment order
+        """
+        self.flush()
+        for _period_start, path in self._segments():
+            metrics = self._read_task_lines(path, self._task_index(path), task_id)
+            if metrics is None:
+                print(f"Warning: Task index for {path} is inconsistent; scanning")
+                metrics = (
+                    metric for _offset, metric in self._iter_entries(path=path)
+                    if str(metric.get('task_id')) == task_id
+                )
+            yield from metrics
+
+    def tail_aggregates(self) -> Optional[AggregationCache]:
+        """
+        Segments have no single log to tail.
+
+        Returns:
+            None
+        """
+        return None
+
+    def count_metrics(self) -> int:
+        """
+        Count total number of metrics across all segments, including archived ones.
+
+        Returns:
+            Total metric count
+        """
+        archived = self.archive.count_metrics() if self.archive is not None else 0
+        return archived + sum(self._count_lines(path) for _period_start, path in self._segments())
+
+    @staticmethod
+    def _count_lines(path: Path) -> int:
+        """Count non-blank lines in a segment file."""
+        return sum(1 for _offset, line in FileOperations.iter_lines(path) if line.strip())
+
+    def clear_old_metrics(self, retention_days: int) -> int:
+        """
+        Delete (or archive) segments that lie entirely outside the retention period.
+
+        Retention is applied at segment granularity: a segment is kept as
+        long as any part of its period falls inside the window. With an
+        archive, expired segments are compressed into it before removal.
+
+        Args:
+            retention_days: Number of days to retain
+
+        Returns:
+            Number of metrics removed
+        """
+        if self._refuse_write('clear old metrics'):
+            return 0
+        with self.lock:
+            return self._clear_expired_segments(retention_days)
+
+    def repair(self) -> Dict[str, int]:
+        """
+        Repair every segment after a crash and rebuild the manifest.
+
+        Each segment's torn final line and corrupted lines are handled as
+        in ``MetricsStorage.repair``.
+
+        Returns:
+            Counts of 'torn_lines' truncated and 'corrupted_lines' removed
+        """
+        if self._refuse_write('repair metrics'):
+            return {}
+        result = {'torn_lines': 0, 'corrupted_lines': 0}
+        with self.lock:
+            for _period_start, path in self._segments():
+                for key, count in self._repair_file(path).items():
+                    result[key] += count
+                self._forget_segment(path)
+            self.rebuild_manifest()
+        return result
+
+    def rollup_old_metrics(self, after_days: int) -> int:
+        """
+        Collapse each day older than N days into one segment holding its rollup.
+
+        A day's segments (one, or up to 24 with hourly partitioning) are
+        replaced by its first segment, rewritten to contain the day's rollup
+        record plus the lines that are not rolled up (event types other than
+        decision and outcome, and lines that could not be dated). Days
+        already reduced to a single segment are left alone.
+
+        Args:
+            after_days: Age in days after which metrics are rolled up
+
+        Returns:
+            Number of raw metrics rolled up
+        """
+        if self._refuse_write('roll up old metrics'):
+            return 0
+        first_kept_day = (datetime.utcnow() - timedelta(days=after_days)).date().isoformat()
+        rolled_up = 0
+        with self.lock:
+            segments = self._load_manifest()
+            by_day: Dict[str, List[str]] = defaultdict(list)
+            for name, start_str in segments.items():
+                if start_str[:10] < first_kept_day:
+                    by_day[start_str[:10]].append(name)
+
+            for day, names in sorted(by_day.items()):
+                rollups = DailyRollups(first_kept_day)
+                kept: List[str] = []
+                for name in sorted(names, key=segments.get):
+                    path = self.segments_dir / name
+                    for offset, raw_line in FileOperations.iter_lines(path):
+                        if not raw_line.strip():
+                            continue
+                        try:
+                            metric = decode_metric(raw_line)
+                        except ValueError as e:
+                            self.quarantine.add(path, offset, raw_line, str(e))
+                            continue
+                        if not (isinstance(metric, dict) and rollups.add(metric)):
+                            line = raw_line.decode('utf-8', errors='replace')
+                            kept.append(line if line.endswith('\n') else line + '\n')
+
+                if not rollups.changed and len(names) == 1:
+                    continue
+
+                period_start = self._period_start(datetime.fromisoformat(day))
+                target = self._segment_name(period_start)
+                lines = [encode_metric(record, self.compact) + '\n' for record in rollups.records()]
+                if not FileOperations.atomic_write_lines(self.segments_dir / target, lines + kept):
+                    continue
+
+                segments[target] = period_start.isoformat()
+                replaced = [name for name in names if name != target]
+                for name in replaced:
+                    del segments[name]
+                self._save_manifest(segments)
+                self._known_segments = segments
+
+                for name in names:
+                    self._forget_segment(self.segments_dir / name)
+                for name in replaced:
+                    try:
+                        (self.segments_dir / name).unlink()
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        print(f"Warning: Failed to delete metrics segment {name}: {e}")
+                rolled_up += rollups.rolled_up
+
+        return rolled_up
+
+    def _clear_expired_segments(self, retention_days: int) -> int:
+        """Delete expired segments; caller must hold the metrics lock."""
+        cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
+        period = self._PERIOD_LENGTHS[self.partition]
+        segments = self._load_manifest()
+
+        expired = []
+        for name, start_str in segments.items():
+            try:
+                period_start = datetime.fromisoformat(start_str)
+            except (TypeError, ValueError):
+                continue
+            if period_start + period <= cutoff_date:
+                expired.append(name)
+
+        if not expired:
+            return 0
+
+        if self.archive is not None:
+            try:
+                self.archive.add(
+                    (segments[name][:10], raw_line)
+                    for name in sorted(expired, key=segments.get)
+                    for _offset, raw_line in FileOperations.iter_lines(self.segments_dir / name)
+                    if raw_line.strip()
+                )
+            except OSError as e:
+                print(f"Warning: Failed to archive expired metrics segments: {e}")
+                return 0
+
+        # Drop expired segments from the manifest first so readers skip them
+        for name in expired:
+            del segments[name]
+        self._save_manifest(segments)
+        self._known_segments = segments
+
+        removed = 0
+        for name in expired:
+            path = self.segments_dir / name
+            removed += self._count_lines(path)
+            self._forget_segment(path)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Warning: Failed to delete metrics segment {path}: {e}")
+
+        return removed
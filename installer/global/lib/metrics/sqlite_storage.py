@@ -0,0 +1,468 @@
+"""SQLite-backed metrics storage with indexed queries."""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .aggregation import MetricsAggregate
+from .idempotency import metric_key
+from .metrics_index import parse_timestamp
+from .rollup import ROLLED_UP_TYPES, ROLLUP_TYPE, DailyRollups
+from .storage_backend import MetricsBackend
+from ..utils import FileOperations, PathResolver
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT,
+    task_id TEXT,
+    stack TEXT,
+    timestamp TEXT,
+    decision TEXT,
+    architectural_score REAL,
+    complexity_score REAL,
+    forced INTEGER,
+    human_override INTEGER,
+    duration_seconds REAL,
+    final_status TEXT,
+    idempotency_key TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_type_timestamp ON metrics (type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON metrics (timestamp);
+CREATE INDEX IF NOT EXISTS idx_metrics_task_id ON metrics (task_id);
+CREATE INDEX IF NOT EXISTS idx_metrics_stack ON metrics (stack);
+"""
+
+# Created after databases from before idempotency keys gained the column
+_KEY_INDEX = """
+CREATE UNIQUE INDEX IF NOT EXISTS idx_metrics_idempotency_key
+ON metrics (idempotency_key) WHERE idempotency_key IS NOT NULL
+"""
+
+_INSERT = """
+INSERT OR IGNORE INTO metrics (
+    type, task_id, stack, timestamp, decision, architectural_score,
+    complexity_score, forced, human_override, duration_seconds, final_status,
+    idempotency_key, data
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_COMPLEXITY_BUCKET = """
+CASE
+    WHEN COALESCE(complexity_score, 0) < 10 THEN '0-9'
+    WHEN COALESCE(complexity_score, 0) < 20 THEN '10-19'
+    WHEN COALESCE(complexity_score, 0) < 30 THEN '20-29'
+    WHEN COALESCE(complexity_score, 0) < 40 THEN '30-39'
+    ELSE '40+'
+END
+"""
+
+
+class SqliteMetricsStorage(MetricsBackend):
+    """
+    Stores metrics in a SQLite database in WAL mode.
+
+    The full metric is kept as JSON in ``data``; the fields used for
+    filtering and dashboard aggregation are also stored as columns, indexed
+    on ``(type, timestamp)``, ``timestamp``, ``task_id`` and ``stack``.
+    Timestamps are normalised to naive UTC ISO strings so they compare
+    correctly as text. Idempotency keys are unique (over the whole table,
+    not a recent window), so retried writes are ignored by the insert and
+    counted in ``duplicates``. Opened ``read_only``, the database is
+    queried through a read-only connection (an empty in-memory one if it
+    does not exist; SQLite may still recreate its ``-wal`` and ``-shm``
+    files) and writes are refused.
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, db_file: Optional[Path] = None, read_only: bool = False):
+        """
+        Initialize SQLite metrics storage.
+
+        Args:
+            db_file: Path to database file (default: plan_review_metrics.db
+                in the metrics directory)
+            read_only: Never create or write the database
+        """
+        self.db_file = db_file or PathResolver.get_metrics_file('plan_review_metrics.db')
+        self.read_only = read_only
+        if not read_only:
+            FileOperations.ensure_directory(self.db_file.parent)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.RLock()
+        self.duplicates = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open (or reopen after fork) the database connection."""
+        if self._conn is None or self._pid != os.getpid():
+            if self.read_only:
+                conn = self._read_only_connection()
+            else:
+                conn = sqlite3.connect(str(self.db_file), timeout=30.0, check_same_thread=False)
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.executescript(_SCHEMA)
+                columns = {row[1] for row in conn.execute('PRAGMA table_info(metrics)')}
+                if 'idempotency_key' not in columns:
+                    conn.execute('ALTER TABLE metrics ADD COLUMN idempotency_key TEXT')
+                conn.execute(_KEY_INDEX)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _read_only_connection(self) -> sqlite3.Connection:
+        """Open the database read-only, or an empty schema if it does not exist."""
+        if self.db_file.exists():
+            return sqlite3.connect(
+                f"{self.db_file.resolve().as_uri()}?mode=ro", uri=True, timeout=30.0, check_same_thread=False
+            )
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _row_for(metric: Dict[str, Any]) -> Tuple:
+        """Build the insert parameters for a metric."""
+        timestamp = parse_timestamp(metric)
+
+        def number(key: str) -> Optional[float]:
+            value = metric.get(key)
+            return value if isinstance(value, (int, float)) else None
+
+        def flag(key: str) -> Optional[int]:
+            return int(bool(metric[key])) if key in metric else None
+
+        return (
+            metric.get('type'),
+            metric.get('task_id'),
+            metric.get('stack'),
+            timestamp.isoformat() if timestamp else None,
+            metric.get('decision'),
+            number('architectural_score'),
+            number('complexity_score'),
+            flag('forced'),
+            flag('human_override'),
+            number('duration_seconds'),
+            metric.get('final_status'),
+            metric_key(metric),
+            json.dumps(metric, ensure_ascii=False),
+        )
+
+    def append_metric(self, metric: Dict[str, Any]) -> bool:
+        """
+        Insert a metric.
+
+        A metric whose ``idempotency_key`` is already stored is ignored as
+        a retry; the write still counts as successful.
+
+        Args:
+            metric: Metric dictionary to append
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if self._refuse_write('append metric'):
+            return False
+        if 'timestamp' not in metric:
+            metric['timestamp'] = datetime.utcnow().isoformat() + 'Z'
+
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    cursor = conn.execute(_INSERT, self._row_for(metric))
+                if cursor.rowcount == 0:
+                    self.duplicates += 1
+            return True
+        except Exception as e:
+            print(f"Warning: Failed to append metric: {e}")
+            return False
+
+    def import_metrics(self, metrics: Iterable[Dict[str, Any]]) -> int:
+        """
+        Bulk-import metrics in batched transactions.
+
+        Args:
+            metrics: Metric dictionaries to import
+
+        Returns:
+            Number of metrics imported (metrics whose idempotency key is
+            already stored are skipped)
+        """
+        if self._refuse_write('import metrics'):
+            return 0
+        imported = 0
+        batch: List[Tuple] = []
+
+        with self._lock:
+            conn = self._connection()
+            for metric in metrics:
+                try:
+                    batch.append(self._row_for(metric))
+                except (TypeError, ValueError):
+                    continue
+                if len(batch) >= self.BATCH_SIZE:
+                    with conn:
+                        imported += conn.executemany(_INSERT, batch).rowcount
+                    batch = []
+
+            if batch:
+                with conn:
+                    imported += conn.executemany(_INSERT, batch).rowcount
+
+        return imported
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        """Run a read query and return all rows."""
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def _iter_data(self, sql: str, params: Tuple = ()) -> Iterator[Dict[str, Any]]:
+        """Stream decoded ``data`` column values for a query."""
+        with self._lock:
+            cursor = self._connection().execute(sql, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(self.BATCH_SIZE)
+            if not rows:
+                return
+            for (data,) in rows:
+                try:
+                    yield json.loads(data)
+                except json.JSONDecodeError:
+                    continue
+
+    def iter_metrics(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over all metrics in insertion order.
+
+        Yields:
+            Metric dictionaries
+        """
+        return self._iter_data('SELECT data FROM metrics ORDER BY id')
+
+    def iter_recent_metrics(self, days: int = 30) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over metrics from the last N days using the timestamp index.
+
+        Args:
+            days: Number of days to look back
+
+        Yields:
+            Recent metric dictionaries
+        """
+        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        return self._iter_data(
+            'SELECT data FROM metrics WHERE timestamp >= ? ORDER BY id', (cutoff,)
+        )
+
+    def iter_task_metrics(self, task_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over all metrics recorded for a task.
+
+        Args:
+            task_id: Task identifier
+
+        Yields:
+            Metric dictionaries in insertion order
+        """
+        return self._iter_data(
+            'SELECT data FROM metrics WHERE task_id = ? ORDER BY id', (task_id,)
+        )
+
+    def count_metrics(self) -> int:
+        """
+        Count total number of metrics.
+
+        Returns:
+            Total metric count
+        """
+        return self._query('SELECT COUNT(*) FROM metrics')[0][0]
+
+    def clear_old_metrics(self, retention_days: int) -> int:
+        """
+        Delete metrics older than retention period (or without a valid timestamp).
+
+        Args:
+            retention_days: Number of days to retain
+
+        Returns:
+            Number of metrics removed
+        """
+        if self._refuse_write('clear old metrics'):
+            return 0
+        cutoff = (datetime.utcnow() - timedelta(days=retention_days)).isoformat()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute(
+                    'DELETE FROM metrics WHERE timestamp < ? OR timestamp IS NULL', (cutoff,)
+                )
+            return cursor.rowcount
+
+    def rollup_old_metrics(self, after_days: int) -> int:
+        """
+        Replace rows from days older than N days with one rollup row per day.
+
+        Only decision and outcome rows (and earlier rollups) are folded
+        and replaced, in a single transaction; other event types are kept.
+
+        Args:
+            after_days: Age in days after which metrics are rolled up
+
+        Returns:
+            Number of raw metrics rolled up
+        """
+        if self._refuse_write('roll up old metrics'):
+            return 0
+        first_kept_day = (datetime.utcnow() - timedelta(days=after_days)).date().isoformat()
+        rollups = DailyRollups(first_kept_day)
+        types = ROLLED_UP_TYPES + (ROLLUP_TYPE,)
+        rolled_up_rows = f"FROM metrics WHERE timestamp < ? AND type IN ({', '.join('?' * len(types))})"
+        params = (first_kept_day,) + types
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                for (data,) in conn.execute(f'SELECT data {rolled_up_rows} ORDER BY id', params):
+                    rollups.add(json.loads(data))
+                if not rollups.changed:
+                    return 0
+
+                conn.execute(f'DELETE {rolled_up_rows}', params)
+                conn.executemany(_INSERT, [self._row_for(record) for record in rollups.records()])
+        return rollups.rolled_up
+
+    def aggregate_recent(self, days: int = 30) -> Optional[MetricsAggregate]:
+        """
+        Aggregate recent metrics with SQL aggregate queries.
+
+        Args:
+            days: Number of days to analyze
+
+        Returns:
+            Aggregate over the window
+        """
+        return self._aggregate_between(datetime.utcnow() - timedelta(days=days))
+
+    def aggregate_windows(self, windows: Sequence[int]) -> Dict[int, Tuple[MetricsAggregate, MetricsAggregate]]:
+        """
+        Aggregate several windows with indexed range queries.
+
+        Args:
+            windows: Window lengths in days
+
+        Returns:
+            Mapping of window length to (current, previous) aggregates
+        """
+        now = datetime.utcnow()
+        result = {}
+        for days in windows:
+            start = now - timedelta(days=days)
+            result[days] = (
+                self._aggregate_between(start),
+                self._aggregate_between(start - timedelta(days=days), start),
+            )
+        return result
+
+    def _aggregate_between(self, start: datetime, end: Optional[datetime] = None) -> MetricsAggregate:
+        """
+        Aggregate metrics with ``start <= timestamp < end`` in SQL.
+
+        Args:
+            start: Inclusive lower bound
+            end: Exclusive upper bound (default: unbounded)
+
+        Returns:
+            Aggregate over the range
+        """
+        window: Tuple = (start.isoformat(),)
+        time_filter = 'timestamp >= ?'
+        if end is not None:
+            window += (end.isoformat(),)
+            time_filter += ' AND timestamp < ?'
+        aggregate = MetricsAggregate()
+
+        decision_filter = f"FROM metrics WHERE type = 'decision' AND {time_filter}"
+        outcome_filter = f"FROM metrics WHERE type = 'outcome' AND {time_filter}"
+
+        (
+            aggregate.total_reviews,
+            aggregate.architectural_score_sum,
+            aggregate.architectural_score_sq_sum,
+            aggregate.complexity_score_sum,
+            aggregate.forced_reviews,
+        ) = self._query(
+            'SELECT COUNT(*), COALESCE(SUM(COALESCE(architectural_score, 0)), 0), '
+            'COALESCE(SUM(COALESCE(architectural_score, 0) * COALESCE(architectural_score, 0)), 0), '
+            'COALESCE(SUM(COALESCE(complexity_score, 0)), 0), COALESCE(SUM(forced), 0) '
+            + decision_filter,
+            window
+        )[0]
+
+        for decision, count in self._query(
+            "SELECT COALESCE(decision, 'unknown'), COUNT(*) " + decision_filter + ' GROUP BY 1', window
+        ):
+            aggregate.decisions[decision] = count
+
+        for bucket, count in self._query(
+            f'SELECT {_COMPLEXITY_BUCKET}, COUNT(*) ' + decision_filter + ' GROUP BY 1', window
+        ):
+            aggregate.complexity_distribution[bucket] = count
+
+        # Histograms are filled from (stack, value) counts so no per-row
+        # data is materialised in Python.
+        for stack, score, count in self._query(
+            "SELECT COALESCE(NULLIF(stack, ''), 'unknown'), COALESCE(architectural_score, 0), COUNT(*) "
+            + decision_filter + ' GROUP BY 1, 2', window
+        ):
+            stack_aggregate = aggregate.by_stack[stack]
+            stack_aggregate.count += count
+            stack_aggregate.score_sum += score * count
+            stack_aggregate.scores.add(score, count)
+            aggregate.architectural_scores.add(score, count)
+
+        for stack, duration, count in self._query(
+            "SELECT COALESCE(NULLIF(stack, ''), 'unknown'), COALESCE(duration_seconds, 0), COUNT(*) "
+            + outcome_filter + ' GROUP BY 1, 2', window
+        ):
+            aggregate.by_stack[stack].durations.add(duration, count)
+            aggregate.durations.add(duration, count)
+
+        (
+            aggregate.outcome_count,
+            aggregate.duration_sum,
+            aggregate.duration_sq_sum,
+            aggregate.human_overrides,
+        ) = self._query(
+            'SELECT COUNT(*), COALESCE(SUM(COALESCE(duration_seconds, 0)), 0), '
+            'COALESCE(SUM(COALESCE(duration_seconds, 0) * COALESCE(duration_seconds, 0)), 0), '
+            'COALESCE(SUM(human_override), 0) ' + outcome_filter,
+            window
+        )[0]
+
+        for status, count in self._query(
+            "SELECT COALESCE(final_status, 'unknown'), COUNT(*) " + outcome_filter + ' GROUP BY 1', window
+        ):
+            aggregate.outcomes[status] = count
+
+        # Rolled-up days carry their aggregate in the row data
+        for (data,) in self._query(
+            f"SELECT data FROM metrics WHERE type = '{ROLLUP_TYPE}' AND {time_filter}", window
+        ):
+            aggregate.add(json.loads(data))
+
+        return aggregate
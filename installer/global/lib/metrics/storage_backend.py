@@ -0,0 +1,236 @@
+"""Abstract interface for plan review metrics storage backends."""
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple
+
+from .aggregation import MetricsAggregate, fold_windows
+from .aggregation_cache import AggregationCache
+from .records import Metric, to_record
+
+
+class MetricsBackend(ABC):
+    """
+    Interface implemented by every metrics storage backend.
+
+    Backends must provide appends, streaming reads, counting and retention.
+    List-returning readers and bulk import are derived from those, and
+    ``aggregate_recent`` lets a backend push dashboard aggregation down to
+    its own query engine or cache. A backend opened ``read_only`` (e.g. a
+    federated repository) never creates or writes files: its writes are
+    refused with a warning.
+    """
+
+    read_only = False
+
+    def _refuse_write(self, action: str) -> bool:
+        """
+        Warn about and refuse a write to read-only storage.
+
+        Args:
+            action: Description of the write, for the warning
+
+        Returns:
+            True if the storage is read-only and the write must not happen
+        """
+        if self.read_only:
+            print(f"Warning: Cannot {action}: metrics storage is read-only")
+        return self.read_only
+
+    @abstractmethod
+    def append_metric(self, metric: Dict[str, Any]) -> bool:
+        """
+        Append a metric.
+
+        Args:
+            metric: Metric dictionary to append
+
+        Returns:
+            True if successful, False otherwise
+        """
+
+    @abstractmethod
+    def iter_metrics(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over all metrics in insertion order.
+
+        Yields:
+            Metric dictionaries
+        """
+
+    @abstractmethod
+    def iter_recent_metrics(self, days: int = 30) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over metrics from the last N days.
+
+        Args:
+            days: Number of days to look back
+
+        Yields:
+            Recent metric dictionaries
+        """
+
+    def iter_records(self) -> Iterator[Metric]:
+        """
+        Lazily iterate over all metrics as typed, slotted records.
+
+        The default implementation converts ``iter_metrics``; file backends
+        decode lines into records directly.
+
+        Yields:
+            Typed records (dictionaries for types without a record class)
+        """
+        for metric in self.iter_metrics():
+            yield to_record(metric)
+
+    def iter_task_metrics(self, task_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over all metrics recorded for a task.
+
+        The default implementation scans every metric; backends with a
+        task index override it.
+
+        Args:
+            task_id: Task identifier
+
+        Yields:
+            Metric dictionaries in insertion order
+        """
+        for metric in self.iter_metrics():
+            if metric.get('task_id') == task_id:
+                yield metric
+
+    @abstractmethod
+    def count_metrics(self) -> int:
+        """
+        Count total number of metrics.
+
+        Returns:
+            Total metric count
+        """
+
+    @abstractmethod
+    def clear_old_metrics(self, retention_days: int) -> int:
+        """
+        Clear metrics older than retention period.
+
+        Args:
+            retention_days: Number of days to retain
+
+        Returns:
+            Number of metrics removed
+        """
+
+    def rollup_old_metrics(self, after_days: int) -> int:
+        """
+        Replace raw metrics older than N days with one rollup record per day.
+
+        Rollups are folded by ``MetricsAggregate`` like raw events, so
+        dashboards over long windows stay accurate while old history costs
+        one record per day. The default implementation keeps raw events.
+
+        Args:
+            after_days: Age in days after which metrics are rolled up
+
+        Returns:
+            Number of raw metrics rolled up
+        """
+        return 0
+
+    def repair(self) -> Dict[str, int]:
+        """
+        Repair storage left inconsistent by a crash and rebuild derived indexes.
+
+        The default implementation has nothing to repair.
+
+        Returns:
+            Counts of repaired problems by kind
+        """
+        return {}
+
+    def flush(self) -> bool:
+        """
+        Flush any buffered writes.
+
+        Returns:
+            True if successful (or nothing to flush), False otherwise
+        """
+        return True
+
+    def read_all_metrics(self) -> List[Dict[str, Any]]:
+        """
+        Read all metrics.
+
+        Returns:
+            List of metric dictionaries
+        """
+        return list(self.iter_metrics())
+
+    def read_recent_metrics(self, days: int = 30) -> List[Dict[str, Any]]:
+        """
+        Read metrics from the last N days.
+
+        Args:
+            days: Number of days to look back
+
+        Returns:
+            List of recent metric dictionaries
+        """
+        return list(self.iter_recent_metrics(days))
+
+    def import_metrics(self, metrics: Iterable[Dict[str, Any]]) -> int:
+        """
+        Bulk-import metrics, e.g. when migrating between backends.
+
+        Args:
+            metrics: Metric dictionaries to import
+
+        Returns:
+            Number of metrics imported
+        """
+        imported = 0
+        for metric in metrics:
+            if self.append_metric(metric):
+                imported += 1
+        self.flush()
+        return imported
+
+    def aggregate_recent(self, days: int = 30) -> Optional[MetricsAggregate]:
+        """
+        Aggregate recent metrics inside the backend, if supported.
+
+        Args:
+            days: Number of days to analyze
+
+        Returns:
+            Aggregate over the window, or None if the caller should fold
+            ``iter_recent_metrics`` itself
+        """
+        return None
+
+    def aggregate_windows(self, windows: Sequence[int]) -> Dict[int, Tuple[MetricsAggregate, MetricsAggregate]]:
+        """
+        Aggregate several trailing windows and their previous periods.
+
+        The default implementation reads the last ``2 * max(windows)`` days
+        once and buckets each metric into every window it falls in.
+
+        Args:
+            windows: Window lengths in days
+
+        Returns:
+            Mapping of window length to (current, previous) aggregates
+        """
+        return fold_windows(self.iter_recent_metrics(2 * max(windows)), windows)
+
+    def tail_aggregates(self) -> Optional[AggregationCache]:
+        """
+        Open an in-memory, incrementally updated aggregate of the backing log.
+
+        Used by live views that re-aggregate repeatedly: each ``aggregate``
+        call then only reads records appended since the previous one.
+
+        Returns:
+            Non-persisting aggregation cache, or None if the backend has no
+            single append-only log to tail
+        """
+        return None
+
@@ -0,0 +1,107 @@
+"""Factory for metrics storage backends selected through MetricsConfig."""
+from pathlib import Path
+from typing import Mapping, Optional
+
+from .buffered_writer import BufferedMetricsWriter
+from .federated_storage import FederatedMetricsStorage
+from .metrics_archive import MetricsArchive
+from .metrics_index import IdempotencyIndex
+from .metrics_storage import MetricsStorage
+from .segmented_storage import SegmentedMetricsStorage
+from .sqlite_storage import SqliteMetricsStorage
+from .storage_backend import MetricsBackend
+from ..utils import PathResolver
+
+METRICS_FILENAME = 'plan_review_metrics.jsonl'
+METRICS_DB_FILENAME = 'plan_review_metrics.db'
+
+
+def create_metrics_storage(
+    backend: str = 'jsonl',
+    metrics_dir: Optional[Path] = None,
+    archive: str = 'none',
+    encoding: str = 'json',
+    dedup_window: int = IdempotencyIndex.DEFAULT_CAPACITY,
+    buffered: bool = False,
+    fsync: str = 'never',
+    read_only: bool = False
+) -> MetricsBackend:
+    """
+    Create the metrics storage for a backend identifier.
+
+    Args:
+        backend: 'jsonl', 'segmented' or 'sqlite'
+        metrics_dir: Metrics directory (default: from PathResolver)
+        archive: Compression for archiving expired metrics ('none', 'gzip'
+            or 'lzma'); the SQLite backend always deletes them
+        encoding: JSONL line encoding ('json' or 'compact'); SQLite stores
+            JSON objects regardless
+        dedup_window: Number of recent idempotency keys the JSONL backends
+            check; SQLite enforces unique keys over the whole table
+        buffered: Batch appends through a ``BufferedMetricsWriter`` (JSONL
+            backend only; segments and SQLite are written directly)
+        fsync: Fsync policy of the buffered writer ('never', 'batch' or
+            'record')
+        read_only: Open the storage read-only: nothing is created or
+            written under ``metrics_dir`` (buffering is ignored)
+
+    Returns:
+        Metrics storage backend
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    metrics_dir = metrics_dir or PathResolver.get_metrics_dir()
+
+    metrics_archive = None
+    if archive != 'none' and backend in ('jsonl', 'segmented'):
+        stem = Path(METRICS_FILENAME).stem
+        metrics_archive = MetricsArchive(metrics_dir / f"{stem}_archive", compression=archive, stem=stem)
+
+    if backend == 'jsonl':
+        metrics_file = metrics_dir / METRICS_FILENAME
+        writer = BufferedMetricsWriter(metrics_file, fsync=fsync) if buffered and not read_only else None
+        return MetricsStorage(
+            metrics_file, writer=writer, archive=metrics_archive, encoding=encoding,
+            dedup_window=dedup_window, read_only=read_only
+        )
+    if backend == 'segmented':
+        return SegmentedMetricsStorage(
+            metrics_dir / METRICS_FILENAME, archive=metrics_archive, encoding=encoding,
+            dedup_window=dedup_window, read_only=read_only
+        )
+    if backend == 'sqlite':
+        return SqliteMetricsStorage(metrics_dir / METRICS_DB_FILENAME, read_only=read_only)
+
+    raise ValueError(f"Unknown metrics backend: {backend}")
+
+
+def create_federated_storage(
+    repositories: Mapping[str, Path],
+    backend: str = 'jsonl',
+    archive: str = 'none',
+    encoding: str = 'json'
+) -> FederatedMetricsStorage:
+    """
+    Create a storage that reads the metrics of several repositories as one.
+
+    Each repository's storage is opened read-only, so reading another
+    repository never creates directories, locks, sidecar indexes or
+    aggregation caches in it, and writes through the federation are
+    refused.
+
+    Args:
+        repositories: Mapping of repository name to project root
+        backend: Backend every repository uses ('jsonl', 'segmented' or 'sqlite')
+        archive: Archive compression every repository uses
+        encoding: JSONL line encoding every repository uses
+
+    Returns:
+        Federated metrics storage
+    """
+    return FederatedMetricsStorage({
+        repo: create_metrics_storage(
+            backend, PathResolver.get_metrics_dir(Path(root)), archive, encoding, read_only=True
+        )
+        for repo, root in repositories.items()
+    })
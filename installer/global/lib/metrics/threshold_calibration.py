@@ -0,0 +1,295 @@
+"""Calibrate review score thresholds against historical decisions and outcomes."""
+from typing import Dict, Any, Iterable, List, Optional
+
+from ..config import PlanReviewConfig
+
+ALL_STACKS = 'all'
+
+MAX_SCORE = 100
+
+
+class ScoreOutcomes:
+    """
+    Reviewed and overridden task counts per integer score (0-100).
+
+    Suffix sums over the two arrays give, for every candidate threshold at
+    once, how many tasks would have been auto-approved and how many of
+    those a human overrode.
+    """
+
+    __slots__ = ('reviewed', 'overridden')
+
+    def __init__(self):
+        """Initialize empty counts."""
+        self.reviewed = [0] * (MAX_SCORE + 1)
+        self.overridden = [0] * (MAX_SCORE + 1)
+
+    def add(self, score: float, overridden: bool) -> None:
+        """
+        Count one reviewed task.
+
+        Args:
+            score: Architectural score (rounded and clamped to 0-100)
+            overridden: Whether a human overrode the review decision
+        """
+        index = min(MAX_SCORE, max(0, int(round(score))))
+        self.reviewed[index] += 1
+        if overridden:
+            self.overridden[index] += 1
+
+    def merge(self, other: 'ScoreOutcomes') -> 'ScoreOutcomes':
+        """
+        Merge another set of counts into this one.
+
+        Args:
+            other: Counts to merge
+
+        Returns:
+            These counts (for chaining)
+        """
+        for score in range(MAX_SCORE + 1):
+            self.reviewed[score] += other.reviewed[score]
+            self.overridden[score] += other.overridden[score]
+        return self
+
+    @property
+    def total(self) -> int:
+        """Number of reviewed tasks."""
+        return sum(self.reviewed)
+
+    def sweep(self) -> List[Dict[str, Any]]:
+        """
+        Evaluate every threshold from 0 to 100.
+
+        Returns:
+            One entry per threshold with the number of tasks scoring at or
+            above it (``approved``), how many of those were overridden, the
+            override rate and the share of all tasks approved
+        """
+        total = self.total
+        points: List[Dict[str, Any]] = [{}] * (MAX_SCORE + 1)
+        approved = overrides = 0
+        for threshold in range(MAX_SCORE, -1, -1):
+            approved += self.reviewed[threshold]
+            overrides += self.overridden[threshold]
+            points[threshold] = {
+                'threshold': threshold,
+                'approved': approved,
+                'overrides': overrides,
+                'override_rate': overrides / approved if approved else 0.0,
+                'approval_rate': approved / total if total else 0.0,
+            }
+        return points
+
+    def recommend(
+        self,
+        max_override_rate: float,
+        min_samples: int,
+        below: int = MAX_SCORE + 1,
+        floor: int = 0
+    ) -> Optional[int]:
+        """
+        Find the lowest threshold whose approvals stay within an override budget.
+
+        The lowest qualifying threshold approves the most tasks while the
+        override rate among them stays at or below ``max_override_rate``.
+
+        Args:
+            max_override_rate: Highest acceptable override rate
+            min_samples: Minimum approved tasks for a threshold to be trusted
+            below: Only consider thresholds strictly below this one
+            floor: Lowest threshold to consider
+
+        Returns:
+            Recommended threshold, or None if no threshold qualifies
+        """
+        for point in self.sweep()[max(0, floor):max(0, below)]:
+            if point['approved'] >= min_samples and point['override_rate'] <= max_override_rate:
+                return point['threshold']
+        return None
+
+
+class ThresholdCalibration:
+    """
+    Replays historical reviews against every candidate threshold.
+
+    Decisions are joined with their outcomes by task_id; a task counts as
+    overridden when its outcome has ``human_override`` set. Counts are kept
+    per stack and for all stacks combined (``'all'``), so a full 0-100 sweep
+    costs 101 steps per stack regardless of how many reviews were replayed.
+    """
+
+    def __init__(self):
+        """Initialize empty calibration data."""
+        self.stacks: Dict[str, ScoreOutcomes] = {}
+        self.pending = 0
+
+    @classmethod
+    def from_metrics(cls, metrics: Iterable[Dict[str, Any]]) -> 'ThresholdCalibration':
+        """
+        Build calibration data from decision and outcome metrics.
+
+        Args:
+            metrics: Metric dictionaries (any order)
+
+        Returns:
+            ThresholdCalibration instance
+        """
+        decisions: Dict[Any, tuple] = {}
+        overrides: Dict[Any, bool] = {}
+        for metric in metrics:
+            metric_type = metric.get('type')
+            task_id = metric.get('task_id')
+            if task_id is None:
+                continue
+            if metric_type == 'decision':
+                decisions[task_id] = (metric.get('stack') or 'unknown', metric.get('architectural_score', 0))
+            elif metric_type == 'outcome':
+                overrides[task_id] = bool(metric.get('human_override', False))
+
+        calibration = cls()
+        for task_id, (stack, score) in decisions.items():
+            overridden = overrides.get(task_id)
+            if overridden is None:
+                calibration.pending += 1
+            else:
+                calibration.add(stack, score, overridden)
+        return calibration
+
+    def add(self, stack: str, score: float, overridden: bool) -> None:
+        """
+        Count one reviewed task.
+
+        Args:
+            stack: Technology stack
+            score: Architectural score
+            overridden: Whether a human overrode the review decision
+        """
+        outcomes = self.stacks.get(stack)
+        if outcomes is None:
+            outcomes = self.stacks[stack] = ScoreOutcomes()
+        outcomes.add(score, overridden)
+
+    def outcomes_for(self, stack: str = ALL_STACKS) -> ScoreOutcomes:
+        """
+        Get the score counts for a stack.
+
+        Args:
+            stack: Technology stack, or 'all' for every stack combined
+
+        Returns:
+            Score counts (empty if the stack has no reviews)
+        """
+        if stack == ALL_STACKS:
+            combined = ScoreOutcomes()
+            for outcomes in self.stacks.values():
+                combined.merge(outcomes)
+            return combined
+        return self.stacks.get(stack) or ScoreOutcomes()
+
+    def sweep(self, stack: str = ALL_STACKS) -> List[Dict[str, Any]]:
+        """
+        Evaluate every threshold from 0 to 100 for a stack.
+
+        Args:
+            stack: Technology stack, or 'all' for every stack combined
+
+        Returns:
+            Per-threshold approval and override statistics
+        """
+        return self.outcomes_for(stack).sweep()
+
+    def report(
+        self,
+        config: Optional[PlanReviewConfig] = None,
+        auto_approve_override_rate: float = 0.05,
+        recommendations_override_rate: float = 0.20,
+        min_samples: int = 20
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Recommend thresholds per stack.
+
+        ``auto_approve`` is the lowest threshold at which approved tasks stay
+        within ``auto_approve_override_rate``; ``approve_with_recommendations``
+        is the lowest threshold strictly below ``auto_approve`` (the
+        recommended one, else the configured one) within the looser
+        ``recommendations_override_rate``. With a config, recommendations
+        also stay at or above the stack's reject threshold, so applying
+        them to the current thresholds always passes schema validation; an
+        ``auto_approve`` that would leave the configured
+        ``approve_with_recommendations`` at or above it, with no qualifying
+        replacement, is not recommended.
+
+        Args:
+            config: PlanReviewConfig to compare against current thresholds
+            auto_approve_override_rate: Override budget for auto-approval
+            recommendations_override_rate: Override budget for approval with
+                recommendations
+            min_samples: Minimum approved tasks for a threshold to be trusted
+
+        Returns:
+            Mapping of stack (and 'all') to reviewed count, recommended
+            thresholds and, with a config, the current thresholds and their
+            observed override rates
+        """
+        report = {}
+        for stack in sorted(self.stacks) + [ALL_STACKS]:
+            outcomes = self.outcomes_for(stack)
+            points = outcomes.sweep()
+
+            thresholds = None
+            reject = 0
+            if config is not None:
+                stack_name = None if stack == ALL_STACKS else stack
+                thresholds = config.get_stack_thresholds(stack_name)
+                reject = config.get_reject_threshold(stack_name)
+
+            auto_approve = outcomes.recommend(auto_approve_override_rate, min_samples, floor=reject + 1)
+            with_recommendations = self._recommend_below(
+                outcomes, auto_approve, thresholds, recommendations_override_rate, min_samples, reject
+            )
+            if (
+                auto_approve is not None and with_recommendations is None and thresholds is not None
+                and thresholds['approve_with_recommendations'] >= auto_approve
+            ):
+                # Applying auto_approve alone would break the threshold ordering
+                auto_approve = None
+                with_recommendations = self._recommend_below(
+                    outcomes, None, thresholds, recommendations_override_rate, min_samples, reject
+                )
+
+            entry: Dict[str, Any] = {
+                'reviewed': outcomes.total,
+                'overrides': points[0]['overrides'],
+                'recommended': {
+                    'auto_approve': auto_approve,
+                    'approve_with_recommendations': with_recommendations,
+                },
+            }
+
+            if thresholds is not None:
+                entry['current'] = {
+                    name: {
+                        'threshold': value,
+                        'override_rate': points[min(MAX_SCORE, max(0, value))]['override_rate'],
+                    }
+                    for name, value in thresholds.items()
+                }
+
+            report[stack] = entry
+        return report
+
+    @staticmethod
+    def _recommend_below(
+        outcomes: ScoreOutcomes,
+        auto_approve: Optional[int],
+        thresholds: Optional[Dict[str, int]],
+        max_override_rate: float,
+        min_samples: int,
+        reject: int
+    ) -> Optional[int]:
+        """Recommend approve_with_recommendations below the effective auto_approve."""
+        if auto_approve is None and thresholds is not None:
+            auto_approve = thresholds['auto_approve']
+        below = auto_approve if auto_approve is not None else MAX_SCORE + 1
+        return outcomes.recommend(max_override_rate, min_samples, below=below, floor=reject)
@@ -2,12 +2,14 @@
 from .json_serializer import JsonSerializer
 from .file_operations import FileOperations
 from .path_resolver import PathResolver
+from .file_lock import FileLock
 from .file_io import safe_read_file, safe_write_file
 
 __all__ = [
     'JsonSerializer',
     'FileOperations',
     'PathResolver',
+    'FileLock',
     'safe_read_file',
     'safe_write_file',
 ]
@@ -0,0 +1,114 @@
+"""Advisory inter-process file locking."""
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+class FileLock:
+    """
+    Exclusive advisory lock backed by ``fcntl.flock`` on a lock file.
+
+    The lock is re-entrant within a thread and also serialises threads of
+    the same process. On platforms without ``fcntl`` only the in-process
+    lock is taken.
+
+    Usage:
+        lock = FileLock.for_path(Path('metrics.lock'))
+        with lock:
+            ...  # exclusive access across processes
+    """
+
+    _registry: Dict[Path, 'FileLock'] = {}
+    _registry_lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, path: Path) -> 'FileLock':
+        """
+        Get the shared lock instance for a lock file path.
+
+        Components of one process must share an instance: flock() locks
+        taken through separate descriptors conflict even within a process.
+
+        Args:
+            path: Lock file path
+
+        Returns:
+            FileLock shared by all callers in this process
+        """
+        key = Path(os.path.abspath(path))
+        with cls._registry_lock:
+            lock = cls._registry.get(key)
+            if lock is None:
+                lock = cls(key)
+                cls._registry[key] = lock
+            return lock
+
+    def __init__(self, path: Path):
+        """
+        Initialize file lock.
+
+        Args:
+            path: Lock file path (created on first acquire)
+        """
+        self.path = path
+        self._fd: Optional[int] = None
+        self._depth = 0
+        self._thread_lock = threading.RLock()
+        self._pid = os.getpid()
+
+    def _check_fork(self) -> None:
+        """
+        Drop state inherited across fork().
+
+        flock() locks belong to the open file description, which a forked
+        child shares with its parent, so the child must open its own.
+        """
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._fd = None
+            self._depth = 0
+            self._thread_lock = threading.RLock()
+
+    def acquire(self) -> None:
+        """Block until the lock is held by the calling thread."""
+        self._check_fork()
+        self._thread_lock.acquire()
+        try:
+            if self._depth == 0 and fcntl is not None:
+                if self._fd is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+        except Exception:
+            self._thread_lock.release()
+            raise
+        self._depth += 1
+
+    def release(self) -> None:
+        """Release one level of the lock."""
+        self._depth -= 1
+        try:
+            if self._depth == 0 and fcntl is not None and self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            self._thread_lock.release()
+
+    def close(self) -> None:
+        """Close the lock file descriptor (lock must not be held)."""
+        with self._thread_lock:
+            if self._fd is not None and self._depth == 0:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
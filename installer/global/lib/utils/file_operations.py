@@ -2,7 +2,7 @@
 import os
 import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Tuple
 
 
 class FileOperations:
@@ -24,6 +24,24 @@ class FileOperations:
         Note:
             Uses temp file in same directory to ensure atomic operation
         """
+        return FileOperations.atomic_write_lines(path, [content], encoding=encoding)
+
+    @staticmethod
+    def atomic_write_lines(path: Path, lines: Iterable[str], encoding: str = 'utf-8') -> bool:
+        """
+        Atomically write an iterable of lines using temp file + rename pattern.
+
+        Lines are written as they are produced, so callers can stream large
+        content without materialising it in memory.
+
+        Args:
+            path: Destination file path
+            lines: Lines to write (written verbatim, newlines not added)
+            encoding: Text encoding (default: utf-8)
+
+        Returns:
+            True if successful, False otherwise
+        """
         try:
             # Ensure parent directory exists
             path.parent.mkdir(parents=True, exist_ok=True)
@@ -38,7 +56,7 @@ class FileOperations:
             try:
                 # Write content to temp file
                 with os.fdopen(fd, 'w', encoding=encoding) as f:
-                    f.write(content)
+                    f.writelines(lines)
 
                 # Atomic rename
                 os.replace(temp_path, path)
@@ -74,6 +92,87 @@ class FileOperations:
             print(f"Warning: Failed to read {path}: {e}")
             return None
 
+    @staticmethod
+    def append_record(path: Path, data: bytes) -> Optional[int]:
+        """
+        Append a record to a file with a single O_APPEND write.
+
+        Args:
+            path: File path to append to
+            data: Encoded record to append
+
+        Returns:
+            Byte offset the record was written at, or None on failure
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                written = os.write(fd, data)
+                while written < len(data):
+                    written += os.write(fd, data[written:])
+                end = os.lseek(fd, 0, os.SEEK_CUR)
+            finally:
+                os.close(fd)
+            return end - len(data)
+        except Exception as e:
+            print(f"Warning: Failed to append to {path}: {e}")
+            return None
+
+    @staticmethod
+    def iter_lines(path: Path, start: int = 0) -> Iterator[Tuple[int, bytes]]:
+        """
+        Lazily iterate over the lines of a file with bounded memory.
+
+        Args:
+            path: File path to read
+            start: Byte offset to start reading from (default: 0)
+
+        Yields:
+            Tuples of (byte offset, raw line including trailing newline)
+
+        Note:
+            Yields nothing if the file does not exist or cannot be read
+        """
+        try:
+            with open(path, 'rb') as f:
+                if start:
+                    f.seek(start)
+                offset = start
+                for line in f:
+                    yield offset, line
+                    offset += len(line)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"Warning: Failed to read {path}: {e}")
+
+    @staticmethod
+    def read_lines_at(path: Path, offsets: Iterable[int]) -> Iterator[Tuple[int, bytes]]:
+        """
+        Read the lines starting at the given byte offsets.
+
+        Args:
+            path: File path to read
+            offsets: Byte offsets of line starts
+
+        Yields:
+            Tuples of (byte offset, raw line including trailing newline)
+
+        Note:
+            Yields nothing if the file does not exist or cannot be read
+        """
+        try:
+            with open(path, 'rb') as f:
+                for offset in offsets:
+                    f.seek(offset)
+                    yield offset, f.readline()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"Warning: Failed to read {path}: {e}")
+
     @staticmethod
     def ensure_directory(path: Path) -> bool:
         """
@@ -1,11 +1,30 @@
 """Path resolution utilities for configuration and metrics."""
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
+
+from .file_operations import FileOperations
+from .json_serializer import JsonSerializer
+
+PROJECT_ROOT_ENV = 'REQUIREKIT_PROJECT_ROOT'
+ROOT_CACHE_ENV = 'REQUIREKIT_ROOT_CACHE'
 
 
 class PathResolver:
-    """Resolves paths for settings and metrics consistently."""
+    """
+    Resolves paths for settings and metrics consistently.
+
+    The project root is resolved once per working directory and memoized
+    for the life of the process. ``REQUIREKIT_PROJECT_ROOT`` overrides the
+    lookup entirely. When ``REQUIREKIT_ROOT_CACHE`` names a file, resolved
+    roots are also persisted there, keyed by working directory and checked
+    against its device and inode, so new processes skip the walk too.
+    """
+
+    ROOT_CACHE_VERSION = 1
+    ROOT_CACHE_LIMIT = 256
+
+    _roots: Dict[Path, Path] = {}
 
     @staticmethod
     def resolve_project_root() -> Path:
@@ -16,18 +35,76 @@ class PathResolver:
             Path to project root
 
         Note:
-            Looks for .git directory or uses current working directory
+            Uses $REQUIREKIT_PROJECT_ROOT if set, otherwise looks for a .git
+            directory above the current working directory (falling back to
+            the working directory itself)
         """
+        override = os.getenv(PROJECT_ROOT_ENV)
+        if override:
+            return Path(override)
+
         current = Path.cwd()
+        root = PathResolver._roots.get(current)
+        if root is None:
+            root = PathResolver._roots[current] = PathResolver._find_project_root(current)
+        return root
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget memoized project roots (e.g. after creating a repository)."""
+        PathResolver._roots.clear()
+
+    @staticmethod
+    def _find_project_root(current: Path) -> Path:
+        """
+        Find the project root of a directory, using the persistent cache.
+
+        Args:
+            current: Working directory
+
+        Returns:
+            Nearest ancestor (or self) containing .git, else current
+        """
+        cache_file = os.getenv(ROOT_CACHE_ENV)
+        cache: Dict[str, List] = {}
+        identity = None
+        if cache_file:
+            data = JsonSerializer.safe_load_file(Path(cache_file)) if Path(cache_file).exists() else {}
+            if data.get('version') == PathResolver.ROOT_CACHE_VERSION and isinstance(data.get('roots'), dict):
+                cache = data['roots']
+            try:
+                stat = current.stat()
+                identity = [stat.st_dev, stat.st_ino]
+            except OSError:
+                identity = None
+
+            entry = cache.get(str(current))
+            if (identity and isinstance(entry, list) and len(entry) == 3
+                    and entry[:2] == identity and (Path(entry[2]) / '.git').exists()):
+                return Path(entry[2])
 
         # Walk up looking for .git directory
         for parent in [current] + list(current.parents):
             if (parent / '.git').exists():
+                if identity:
+                    PathResolver._save_root(Path(cache_file), cache, current, identity, parent)
                 return parent
 
-        # Fallback to current directory
+        # Fallback to current directory (not persisted: it cannot be
+        # validated without walking again)
         return current
 
+    @staticmethod
+    def _save_root(cache_file: Path, cache: Dict[str, List], current: Path, identity: List, root: Path) -> None:
+        """Persist a resolved root, keeping the most recent entries."""
+        cache.pop(str(current), None)
+        cache[str(current)] = identity + [str(root)]
+        while len(cache) > PathResolver.ROOT_CACHE_LIMIT:
+            del cache[next(iter(cache))]
+        data = {'version': PathResolver.ROOT_CACHE_VERSION, 'roots': cache}
+        FileOperations.ensure_directory(cache_file.parent)
+        FileOperations.atomic_write(cache_file, JsonSerializer.serialize(data, indent=None))
+
     @staticmethod
     def get_settings_path() -> Path:
         """
@@ -40,14 +117,18 @@ class PathResolver:
         return root / '.claude' / 'settings.json'
 
     @staticmethod
-    def get_metrics_dir() -> Path:
+    def get_metrics_dir(project_root: Optional[Path] = None) -> Path:
         """
         Get path to metrics directory.
 
+        Args:
+            project_root: Project whose metrics directory to return
+                (default: the current project)
+
         Returns:
             Path to docs/state/metrics/
         """
-        root = PathResolver.resolve_project_root()
+        root = project_root or PathResolver.resolve_project_root()
         return root / 'docs' / 'state' / 'metrics'
 
     @staticmethod
@@ -0,0 +1,73 @@
+"""Benchmark metric append throughput for each write/fsync policy.
+
+Compares the unbuffered MetricsStorage append path against
+BufferedMetricsWriter with the 'never', 'batch' and 'record' fsync
+policies and reports events per second.
+
+Usage:
+    python tests/benchmarks/bench_buffered_writer.py [--events N]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR / "installer" / "global"))
+
+from lib.metrics.buffered_writer import BufferedMetricsWriter  # noqa: E402
+from lib.metrics.metrics_storage import MetricsStorage  # noqa: E402
+
+
+def _sample_metric(i: int) -> dict:
+    return {
+        "type": "decision",
+        "task_id": f"TASK-{i:06d}",
+        "architectural_score": i % 101,
+        "decision": "auto_approve",
+        "complexity_score": i % 50,
+        "stack": "python",
+        "forced": False,
+        "recommendations": [],
+    }
+
+
+def run(label: str, storage: MetricsStorage, events: int) -> float:
+    """Append ``events`` metrics and return events per second."""
+    start = time.perf_counter()
+    for i in range(events):
+        storage.append_metric(_sample_metric(i))
+    storage.flush()
+    elapsed = time.perf_counter() - start
+
+    rate = events / elapsed if elapsed else float("inf")
+    print(f"{label:28s} {events:8d} events  {elapsed:8.3f}s  {rate:12,.0f} events/s")
+    return rate
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+
+        run("unbuffered (append_record)", MetricsStorage(tmp_dir / "unbuffered.jsonl"), args.events)
+
+        for policy in ("never", "batch", "record"):
+            metrics_file = tmp_dir / f"buffered_{policy}.jsonl"
+            writer = BufferedMetricsWriter(metrics_file, fsync=policy)
+            try:
+                run(f"buffered fsync={policy}", MetricsStorage(metrics_file, writer=writer), args.events)
+            finally:
+                writer.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Benchmark PlanReviewConfig startup with and without the config snapshot.
+
+Spawns N fresh interpreters that each load the configuration, first with
+snapshots disabled (full pydantic validation every time), then warm from
+a snapshot written by a priming run.
+
+Usage:
+    python tests/benchmarks/bench_config_startup.py [--runs N]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+_CHILD = (
+    "import sys; sys.path.insert(0, {path!r}); "
+    "from lib.config import PlanReviewConfig; "
+    "PlanReviewConfig().get_stack_thresholds(); "
+    "print('pydantic' in sys.modules)"
+).format(path=str(LIB_PARENT))
+
+
+def _run(runs: int, env: dict) -> tuple:
+    """Start N interpreters, returning (mean seconds, pydantic imported)."""
+    imported = set()
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", _CHILD], env=env, capture_output=True, text=True, check=True
+        )
+        imported.add(result.stdout.strip())
+    return (time.perf_counter() - start) / runs, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, REQUIREKIT_CACHE_DIR=cache_dir)
+
+        baseline, _ = _run(args.runs, dict(env, REQUIREKIT_CONFIG_CACHE="0"))
+        _run(1, env)
+        warm, imported = _run(args.runs, env)
+
+    print(f"cold (validate every start)   {baseline * 1000:8.1f} ms/process")
+    print(f"warm (snapshot)               {warm * 1000:8.1f} ms/process")
+    print(f"pydantic imported when warm:  {', '.join(sorted(imported))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Benchmark score classification against the configured thresholds.
+
+Classifies N scores across a few stacks three ways: resolving overrides
+and stack thresholds per call (the pre-table path), per-call
+get_threshold (precompiled table lookup) and one classify_scores call.
+
+Usage:
+    python tests/benchmarks/bench_decision_table.py [--scores N]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR / "installer" / "global"))
+os.environ.setdefault("REQUIREKIT_CONFIG_CACHE", "0")
+
+from lib.config import PlanReviewConfig  # noqa: E402
+
+STACKS = ("python", "typescript", "react", None)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scores", type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    scores = [rng.randint(0, 100) for _ in range(args.scores)]
+    stacks = [STACKS[i % len(STACKS)] for i in range(args.scores)]
+    config = PlanReviewConfig()
+    config.set_cli_override("thresholds.approve_with_recommendations", 55)
+
+    start = time.perf_counter()
+    resolved = [config._decide(score, *config._stack_thresholds(stack)) for score, stack in zip(scores, stacks)]
+    per_call = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tabled = [config.get_threshold(score, stack) for score, stack in zip(scores, stacks)]
+    lookup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = config.classify_scores(scores, stacks)
+    batch = time.perf_counter() - start
+
+    assert resolved == tabled == batched
+    print(f"resolve per call     {args.scores:8d} scores  {per_call:8.3f}s")
+    print(f"get_threshold table  {args.scores:8d} scores  {lookup:8.3f}s  ({per_call / lookup:4.1f}x)")
+    print(f"classify_scores      {args.scores:8d} scores  {batch:8.3f}s  ({per_call / batch:4.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
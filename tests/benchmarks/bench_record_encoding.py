@@ -0,0 +1,95 @@
+"""Benchmark JSON vs compact metric lines and dict vs slotted records.
+
+Encodes N decision + outcome pairs both ways, then compares bytes per
+line, decode time and the memory held by the decoded metrics.
+
+Usage:
+    python tests/benchmarks/bench_record_encoding.py [--records N]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR / "installer" / "global"))
+
+from lib.metrics.records import decode_metric, decode_record, encode_metric  # noqa: E402
+
+STACKS = ("python", "typescript", "react", "dotnet")
+
+
+def _metrics(pairs: int) -> list:
+    """Synthetic decision + outcome pairs."""
+    rng = random.Random(42)
+    metrics = []
+    for i in range(pairs):
+        task_id = f"TASK-{i:06d}"
+        stack = STACKS[i % len(STACKS)]
+        metrics.append({
+            "type": "decision",
+            "task_id": task_id,
+            "architectural_score": rng.randint(30, 100),
+            "decision": "auto_approve",
+            "complexity_score": rng.randint(0, 50),
+            "stack": stack,
+            "forced": False,
+            "recommendations": [],
+            "timestamp": f"2026-01-{i % 28 + 1:02d}T12:00:00Z",
+        })
+        metrics.append({
+            "type": "outcome",
+            "task_id": task_id,
+            "decision": "auto_approve",
+            "human_override": rng.random() < 0.1,
+            "duration_seconds": round(rng.expovariate(1 / 60), 3),
+            "final_status": "approved",
+            "stack": stack,
+            "timestamp": f"2026-01-{i % 28 + 1:02d}T12:05:00Z",
+        })
+    return metrics
+
+
+def _decode(lines: list, decode) -> tuple:
+    """Decode all lines, returning (seconds, bytes held by the result)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    decoded = [decode(line) for line in lines]
+    elapsed = time.perf_counter() - start
+    held, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del decoded
+    return elapsed, held
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+
+    metrics = _metrics(args.records // 2)
+    json_lines = [encode_metric(metric) for metric in metrics]
+    compact_lines = [encode_metric(metric, compact=True) for metric in metrics]
+    count = len(metrics)
+
+    for label, lines in (("json", json_lines), ("compact", compact_lines)):
+        size = sum(len(line.encode("utf-8")) + 1 for line in lines)
+        print(f"{label:8s} lines  {size / count:7.1f} bytes/record  {size / 1e6:8.2f} MB")
+
+    for label, lines, decode in (
+        ("json    -> dict", json_lines, decode_metric),
+        ("compact -> dict", compact_lines, decode_metric),
+        ("json    -> record", json_lines, decode_record),
+        ("compact -> record", compact_lines, decode_record),
+    ):
+        elapsed, held = _decode(lines, decode)
+        print(f"{label:18s} {elapsed:7.3f}s  {held / count:7.1f} bytes/record held")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Benchmark a full threshold sweep over historical review decisions.
+
+Builds per-stack score/override counts from N decision + outcome pairs,
+sweeps every threshold 0-100 for each stack and produces recommendations.
+
+Usage:
+    python tests/benchmarks/bench_threshold_calibration.py [--decisions N]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(BASE_DIR / "installer" / "global"))
+
+from lib.metrics.threshold_calibration import ThresholdCalibration  # noqa: E402
+
+STACKS = ("python", "typescript", "react", "dotnet")
+
+
+def _history(decisions: int) -> list:
+    """Synthetic decisions whose override odds fall as the score rises."""
+    rng = random.Random(42)
+    metrics = []
+    for i in range(decisions):
+        task_id = f"TASK-{i:06d}"
+        stack = STACKS[i % len(STACKS)]
+        score = rng.randint(30, 100)
+        metrics.append({
+            "type": "decision",
+            "task_id": task_id,
+            "stack": stack,
+            "architectural_score": score,
+            "decision": "auto_approve",
+            "complexity_score": rng.randint(0, 50),
+        })
+        metrics.append({
+            "type": "outcome",
+            "task_id": task_id,
+            "stack": stack,
+            "human_override": rng.random() < (100 - score) / 150,
+            "duration_seconds": rng.expovariate(1 / 60),
+            "final_status": "approved",
+        })
+    return metrics
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--decisions", type=int, default=100000)
+    args = parser.parse_args()
+
+    metrics = _history(args.decisions)
+
+    start = time.perf_counter()
+    calibration = ThresholdCalibration.from_metrics(metrics)
+    built = time.perf_counter()
+    report = calibration.report()
+    done = time.perf_counter()
+
+    print(f"join + count  {args.decisions:8d} decisions  {built - start:8.3f}s")
+    print(f"sweep + recommend ({len(report)} groups)  {done - built:8.3f}s")
+    print(f"total                                {done - start:8.3f}s")
+    for stack, entry in report.items():
+        print(f"  {stack:12s} reviewed={entry['reviewed']:6d}  recommended={entry['recommended']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
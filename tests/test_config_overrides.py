@@ -0,0 +1,166 @@
+"""Tests that context-scoped CLI overrides stay isolated between contexts.
+
+Overrides set inside ``PlanReviewConfig.cli_overrides`` live in a
+``contextvars`` layer: concurrent threads and asyncio tasks must each see
+only their own, and the precompiled decision tables must never hand one
+context's decisions to another.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+AUTO = "thresholds.auto_approve"
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.config requires pydantic")
+class TestContextOverrides(unittest.TestCase):
+    """Scoped overrides are visible only in the context that set them."""
+
+    def setUp(self) -> None:
+        from lib.config import PlanReviewConfig
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        env = mock.patch.dict(os.environ, {
+            "REQUIREKIT_PROJECT_ROOT": self.tmp.name,
+            "REQUIREKIT_CACHE_DIR": os.path.join(self.tmp.name, "cache"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        PlanReviewConfig._instance = None
+        self.addCleanup(setattr, PlanReviewConfig, "_instance", None)
+        self.config = PlanReviewConfig()
+        self.addCleanup(self.config.reload)
+
+    def _auto(self) -> int:
+        return self.config.get_stack_thresholds()["auto_approve"]
+
+    def test_scope_is_discarded_on_exit(self) -> None:
+        with self.config.cli_overrides({AUTO: 70}):
+            self.assertEqual(self._auto(), 70)
+            self.assertEqual(self.config.get_threshold(75), "auto_approve")
+        self.assertEqual(self._auto(), 80)
+        self.assertEqual(self.config.get_threshold(75), "approve_with_recommendations")
+
+    def test_nested_scopes(self) -> None:
+        with self.config.cli_overrides({AUTO: 70, "thresholds.approve_with_recommendations": 50}):
+            with self.config.cli_overrides({AUTO: 95}):
+                self.assertEqual(self.config.get_stack_thresholds(), {
+                    "auto_approve": 95, "approve_with_recommendations": 50,
+                })
+            self.assertEqual(self._auto(), 70)
+        self.assertEqual(self.config.get_stack_thresholds()["approve_with_recommendations"], 60)
+
+    def test_set_inside_scope_does_not_leak(self) -> None:
+        with self.config.cli_overrides():
+            self.config.set_cli_override(AUTO, 65)
+            self.assertEqual(self._auto(), 65)
+        self.assertEqual(self._auto(), 80)
+
+        self.config.set_cli_override(AUTO, 90)
+        self.assertEqual(self._auto(), 90)
+        with self.config.cli_overrides({AUTO: 60}):
+            self.assertEqual(self._auto(), 60)
+        self.assertEqual(self._auto(), 90)
+
+    def test_context_layer_shadows_process_layer_per_key(self) -> None:
+        self.config.set_cli_override(AUTO, 90)
+        self.config.set_cli_override("force_triggers.min_complexity", 10)
+        with self.config.cli_overrides({AUTO: 60}):
+            self.assertEqual(self._auto(), 60)
+            self.assertTrue(self.config.should_force_review(10))
+        self.assertEqual(self._auto(), 90)
+
+    def test_override_layers_are_immutable(self) -> None:
+        self.config.set_cli_override(AUTO, 90)
+        layer = self.config._cli_overrides
+        with self.assertRaises(TypeError):
+            layer[AUTO] = 50
+        self.config.set_cli_override(AUTO, 85)
+        self.assertEqual(layer[AUTO], 90)
+        self.assertIsNot(self.config._cli_overrides, layer)
+
+    def test_threads_see_only_their_own_overrides(self) -> None:
+        thresholds = {"a": 60, "b": 90, "none": None}
+        barrier = threading.Barrier(len(thresholds))
+        results = {}
+        errors = []
+
+        def evaluate(name: str) -> None:
+            threshold = thresholds[name]
+            scope = self.config.cli_overrides({AUTO: threshold}) if threshold else contextlib.nullcontext()
+            try:
+                seen = set()
+                with scope:
+                    for _ in range(50):
+                        # Line every thread up so lookups really interleave
+                        barrier.wait(5)
+                        seen.add((self._auto(), tuple(self.config.classify_scores([59, 75, 95]))))
+                results[name] = seen
+            except Exception as e:  # surfaced in the main thread
+                errors.append(e)
+
+        threads = [threading.Thread(target=evaluate, args=(name,)) for name in thresholds]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(results["a"], {(60, ("reject", "auto_approve", "auto_approve"))})
+        self.assertEqual(results["b"], {(90, ("reject", "approve_with_recommendations", "auto_approve"))})
+        self.assertEqual(results["none"], {(80, ("reject", "approve_with_recommendations", "auto_approve"))})
+        self.assertEqual(self._auto(), 80)
+
+    def test_asyncio_tasks_see_only_their_own_overrides(self) -> None:
+        async def evaluate(threshold: int) -> list:
+            seen = []
+            with self.config.cli_overrides({AUTO: threshold}):
+                for _ in range(20):
+                    await asyncio.sleep(0)
+                    seen.append(self.config.get_threshold(75))
+            return seen
+
+        async def main() -> tuple:
+            return await asyncio.gather(evaluate(70), evaluate(85), evaluate(75))
+
+        low, high, equal = asyncio.run(main())
+        self.assertEqual(set(low), {"auto_approve"})
+        self.assertEqual(set(high), {"approve_with_recommendations"})
+        self.assertEqual(set(equal), {"auto_approve"})
+        self.assertEqual(self.config.get_threshold(75), "approve_with_recommendations")
+
+    def test_tasks_inherit_but_do_not_leak_back(self) -> None:
+        async def child() -> int:
+            inherited = self._auto()
+            self.config.set_cli_override(AUTO, 55)
+            return inherited
+
+        async def main() -> tuple:
+            with self.config.cli_overrides({AUTO: 70}):
+                inherited = await asyncio.create_task(child())
+                return inherited, self._auto()
+
+        self.assertEqual(asyncio.run(main()), (70, 70))
+        self.assertEqual(self._auto(), 80)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+"""Tests for validated configuration snapshots and their invalidation.
+
+Every test points REQUIREKIT_CACHE_DIR at a temporary directory so no
+snapshot is ever read from or written to the user's cache.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.config requires pydantic")
+class TestConfigSnapshot(unittest.TestCase):
+    """Snapshots are reused while their inputs match and rebuilt otherwise."""
+
+    def setUp(self) -> None:
+        from lib.config import PlanReviewConfig
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.cache_dir = self.root / "cache"
+        self.settings = self.root / ".claude" / "settings.json"
+        self.settings.parent.mkdir()
+
+        env = mock.patch.dict(os.environ, {
+            "REQUIREKIT_PROJECT_ROOT": str(self.root),
+            "REQUIREKIT_CACHE_DIR": str(self.cache_dir),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        for name in PlanReviewConfig.ENV_VARS + ("REQUIREKIT_CONFIG_CACHE",):
+            os.environ.pop(name, None)
+        PlanReviewConfig._instance = None
+        self.addCleanup(setattr, PlanReviewConfig, "_instance", None)
+
+    def _write_settings(self, plan_review: dict) -> None:
+        self.settings.write_text(json.dumps({"plan_review": plan_review}))
+
+    def _fresh_config(self):
+        """Load the configuration as a new process would."""
+        from lib.config import PlanReviewConfig
+
+        PlanReviewConfig._instance = None
+        return PlanReviewConfig()
+
+    def _snapshots(self) -> list:
+        return sorted(self.cache_dir.glob("plan_review_config-*.json")) if self.cache_dir.exists() else []
+
+    def test_warm_start_loads_snapshot(self) -> None:
+        from lib.config.config_snapshot import ConfigSnapshot
+
+        self._write_settings({"metrics": {"retention_days": 45}})
+        cold = self._fresh_config()
+        self.assertNotIsInstance(cold._config, ConfigSnapshot)
+        self.assertEqual(len(self._snapshots()), 1)
+
+        warm = self._fresh_config()
+        self.assertIsInstance(warm._config, ConfigSnapshot)
+        self.assertEqual(warm.get_raw_config(), cold.get_raw_config())
+        self.assertEqual(warm.get_stack_thresholds("python"), cold.get_stack_thresholds("python"))
+
+    def test_settings_change_invalidates_snapshot(self) -> None:
+        from lib.config.config_snapshot import ConfigSnapshot
+
+        self._write_settings({"metrics": {"retention_days": 45}})
+        self._fresh_config()
+
+        self._write_settings({"metrics": {"retention_days": 120}, "default_mode": "always"})
+        config = self._fresh_config()
+        self.assertNotIsInstance(config._config, ConfigSnapshot)
+        self.assertEqual(config.get_raw_config()["metrics"]["retention_days"], 120)
+        self.assertEqual(self._fresh_config().get_raw_config()["metrics"]["retention_days"], 120)
+
+    def test_same_size_rewrite_invalidates_snapshot(self) -> None:
+        self._write_settings({"metrics": {"retention_days": 45}})
+        self._fresh_config()
+
+        before = self.settings.stat().st_mtime_ns
+        self._write_settings({"metrics": {"retention_days": 46}})
+        os.utime(self.settings, ns=(before + 10**9, before + 10**9))
+        self.assertEqual(self._fresh_config().get_raw_config()["metrics"]["retention_days"], 46)
+
+    def test_removed_settings_invalidate_snapshot(self) -> None:
+        self._write_settings({"metrics": {"retention_days": 45}})
+        self._fresh_config()
+
+        self.settings.unlink()
+        self.assertEqual(self._fresh_config().get_raw_config()["metrics"]["retention_days"], 90)
+
+    def test_environment_change_invalidates_snapshot(self) -> None:
+        self._write_settings({})
+        self.assertEqual(self._fresh_config().get_raw_config()["metrics"]["backend"], "jsonl")
+
+        with mock.patch.dict(os.environ, {"PLAN_REVIEW_METRICS_BACKEND": "sqlite"}):
+            self.assertEqual(self._fresh_config().get_raw_config()["metrics"]["backend"], "sqlite")
+        self.assertEqual(self._fresh_config().get_raw_config()["metrics"]["backend"], "jsonl")
+
+    def test_schema_change_invalidates_snapshot(self) -> None:
+        from lib.config.config_snapshot import ConfigSnapshot, ConfigSnapshotCache
+
+        self._write_settings({})
+        self._fresh_config()
+
+        real_key = ConfigSnapshotCache.key
+
+        def bumped_key(settings_path, env):
+            key = real_key(settings_path, env)
+            key["version"] += 1
+            return key
+
+        with mock.patch.object(ConfigSnapshotCache, "key", staticmethod(bumped_key)):
+            self.assertNotIsInstance(self._fresh_config()._config, ConfigSnapshot)
+
+    def test_corrupted_snapshot_is_rebuilt(self) -> None:
+        from lib.config.config_snapshot import ConfigSnapshot
+
+        self._write_settings({"metrics": {"retention_days": 45}})
+        self._fresh_config()
+        self._snapshots()[0].write_text("{not json")
+
+        config = self._fresh_config()
+        self.assertNotIsInstance(config._config, ConfigSnapshot)
+        self.assertEqual(config.get_raw_config()["metrics"]["retention_days"], 45)
+        self.assertIsInstance(self._fresh_config()._config, ConfigSnapshot)
+
+    def test_invalid_settings_are_not_snapshotted(self) -> None:
+        self._write_settings({"metrics": {"retention_days": -1}})
+        with mock.patch("builtins.print"):
+            self.assertEqual(self._fresh_config().get_raw_config()["metrics"]["retention_days"], 90)
+        self.assertEqual(self._snapshots(), [])
+
+    def test_disabled_cache_writes_nothing(self) -> None:
+        from lib.config.config_snapshot import ConfigSnapshot
+
+        self._write_settings({})
+        with mock.patch.dict(os.environ, {"REQUIREKIT_CONFIG_CACHE": "0"}):
+            self.assertNotIsInstance(self._fresh_config()._config, ConfigSnapshot)
+            self.assertNotIsInstance(self._fresh_config()._config, ConfigSnapshot)
+        self.assertEqual(self._snapshots(), [])
+
+    def test_snapshot_path_follows_cache_dir(self) -> None:
+        from lib.config.config_snapshot import ConfigSnapshotCache
+
+        path = ConfigSnapshotCache._cache_file(self.settings)
+        self.assertEqual(path.parent, self.cache_dir)
+        other = ConfigSnapshotCache._cache_file(self.root / "other" / "settings.json")
+        self.assertNotEqual(path, other)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Tests for hot-reloading settings.json through ConfigWatcher."""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.config requires pydantic")
+class TestConfigWatcher(unittest.TestCase):
+    """Edits to settings.json reach the configuration and its subscribers."""
+
+    def setUp(self) -> None:
+        from lib.config import PlanReviewConfig
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+        self.settings = root / ".claude" / "settings.json"
+        self.settings.parent.mkdir()
+        self._write_settings({"thresholds": {"default": {"auto_approve": 80}}})
+
+        env = mock.patch.dict(os.environ, {
+            "REQUIREKIT_PROJECT_ROOT": str(root),
+            "REQUIREKIT_CACHE_DIR": str(root / "cache"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        PlanReviewConfig._instance = None
+        self.addCleanup(setattr, PlanReviewConfig, "_instance", None)
+        self.config = PlanReviewConfig()
+        self.addCleanup(self.config.reload)
+
+    def _write_settings(self, plan_review: dict) -> None:
+        """Rewrite settings.json, making sure its stat changes."""
+        before = self.settings.stat().st_mtime_ns if self.settings.exists() else 0
+        self.settings.write_text(json.dumps({"plan_review": plan_review}))
+        if self.settings.stat().st_mtime_ns <= before:
+            os.utime(self.settings, ns=(before + 10**9, before + 10**9))
+
+    def _auto_approve(self) -> int:
+        return self.config.get_stack_thresholds()["auto_approve"]
+
+    def test_check_reloads_only_on_change(self) -> None:
+        from lib.config import ConfigWatcher
+
+        watcher = ConfigWatcher(self.config, interval=60)
+        self.assertFalse(watcher.check())
+
+        self._write_settings({"thresholds": {"default": {"auto_approve": 90}}})
+        self.assertTrue(watcher.check())
+        self.assertEqual(self._auto_approve(), 90)
+        self.assertFalse(watcher.check())
+        self.assertEqual(watcher.reloads, 1)
+
+    def test_subscribers_receive_reloaded_config(self) -> None:
+        from lib.config import ConfigWatcher
+
+        watcher = ConfigWatcher(self.config, interval=60)
+        seen = []
+        watcher.subscribe(lambda config: seen.append(config.get_stack_thresholds()["auto_approve"]))
+
+        def failing(_config) -> None:
+            raise RuntimeError("boom")
+
+        watcher.subscribe(failing)
+        self._write_settings({"thresholds": {"default": {"auto_approve": 95}}})
+        with mock.patch("builtins.print") as printed:
+            self.assertTrue(watcher.check())
+        self.assertEqual(seen, [95])
+        self.assertIn("boom", printed.call_args[0][0])
+
+        watcher.unsubscribe(failing)
+        self._write_settings({"thresholds": {"default": {"auto_approve": 85}}})
+        watcher.check()
+        self.assertEqual(seen, [95, 85])
+
+    def test_reload_keeps_cli_overrides(self) -> None:
+        from lib.config import ConfigWatcher
+
+        watcher = ConfigWatcher(self.config, interval=60)
+        self.config.set_cli_override("thresholds.auto_approve", 70)
+        self._write_settings({"thresholds": {"default": {"auto_approve": 90}}, "default_mode": "always"})
+        self.assertTrue(watcher.check())
+        self.assertEqual(self._auto_approve(), 70)
+        self.assertEqual(self.config.get_raw_config()["default_mode"], "always")
+
+    def test_removed_settings_fall_back_to_defaults(self) -> None:
+        from lib.config import ConfigWatcher
+
+        self._write_settings({"thresholds": {"default": {"auto_approve": 90}}})
+        self.config.reload()
+        watcher = ConfigWatcher(self.config, interval=60)
+        self.settings.unlink()
+        self.assertTrue(watcher.check())
+        self.assertEqual(self._auto_approve(), 80)
+
+    def test_background_thread_reloads(self) -> None:
+        from lib.config import ConfigWatcher
+
+        reloaded = threading.Event()
+        watcher = ConfigWatcher(self.config, interval=0.01)
+        watcher.subscribe(lambda _config: reloaded.set())
+        with watcher:
+            self._write_settings({"thresholds": {"default": {"auto_approve": 92}}})
+            self.assertTrue(reloaded.wait(5))
+        self.assertEqual(self._auto_approve(), 92)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+"""Parity tests for the precompiled plan review decision tables.
+
+``get_threshold`` and ``classify_scores`` answer integer scores from cached
+per-stack tables. Whatever the stack, score or override in effect, they must
+agree with a plain comparison against the configured thresholds, and must
+not disturb ``should_force_review``.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+AUTO = "thresholds.auto_approve"
+RECOMMEND = "thresholds.approve_with_recommendations"
+MIN_COMPLEXITY = "force_triggers.min_complexity"
+
+STACKS = (None, "python", "go", "unknown")
+SCORES = list(range(-5, 106)) + [-0.5, 0.0, 39.5, 59.999, 60.0, 69.5, 79.5, 80.0, 89.99, 100.0, 100.5]
+
+
+def _expected(score: float, auto_approve: int, approve_with_recommendations: int) -> str:
+    """The decision rule, written out independently of the library."""
+    if score >= auto_approve:
+        return "auto_approve"
+    if score >= approve_with_recommendations:
+        return "approve_with_recommendations"
+    return "reject"
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.config requires pydantic")
+class TestDecisionTableParity(unittest.TestCase):
+    """Table lookups agree with direct threshold comparison."""
+
+    def setUp(self) -> None:
+        from lib.config import PlanReviewConfig
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+        self.settings = root / ".claude" / "settings.json"
+        self.settings.parent.mkdir()
+        self._write_settings({
+            "thresholds": {
+                "stack_overrides": {
+                    "python": {"auto_approve": 90, "approve_with_recommendations": 70, "reject": 40},
+                    "go": {"auto_approve": 75, "approve_with_recommendations": 50, "reject": 20},
+                },
+            },
+            "force_triggers": {"min_complexity": 25, "critical_keywords": ["security", "Payment"]},
+        })
+
+        env = mock.patch.dict(os.environ, {
+            "REQUIREKIT_PROJECT_ROOT": str(root),
+            "REQUIREKIT_CACHE_DIR": str(root / "cache"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        PlanReviewConfig._instance = None
+        self.addCleanup(setattr, PlanReviewConfig, "_instance", None)
+        self.config = PlanReviewConfig()
+        self.addCleanup(self.config.reload)
+
+        self.thresholds = {None: (80, 60), "python": (90, 70), "go": (75, 50), "unknown": (80, 60)}
+
+    def _write_settings(self, plan_review: dict) -> None:
+        self.settings.write_text(json.dumps({"plan_review": plan_review}))
+
+    def assertParity(self, thresholds: dict) -> None:
+        """Check every stack and score against the expected thresholds."""
+        for stack in STACKS:
+            expected = [_expected(score, *thresholds[stack]) for score in SCORES]
+            with self.subTest(stack=stack):
+                self.assertEqual([self.config.get_threshold(score, stack) for score in SCORES], expected)
+                self.assertEqual(self.config.classify_scores(SCORES, stack), expected)
+                self.assertEqual(self.config.classify_scores(SCORES, [stack] * len(SCORES)), expected)
+
+    def test_every_score_matches_direct_comparison(self) -> None:
+        self.assertParity(self.thresholds)
+        # A second pass answers from the cached tables
+        self.assertParity(self.thresholds)
+
+    def test_mixed_stacks_match_single_lookups(self) -> None:
+        stacks = [STACKS[i % len(STACKS)] for i in range(len(SCORES))]
+        self.assertEqual(
+            self.config.classify_scores(SCORES, stacks),
+            [self.config.get_threshold(score, stack) for score, stack in zip(SCORES, stacks)],
+        )
+        self.assertEqual(
+            self.config.classify_scores(SCORES),
+            [_expected(score, *self.thresholds[None]) for score in SCORES],
+        )
+        self.assertEqual(self.config.classify_scores([]), [])
+
+    def test_stack_count_mismatch_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            self.config.classify_scores([50, 90], ["python"])
+        with self.assertRaises(ValueError):
+            self.config.classify_scores([50], ["python", "go"])
+
+    def test_process_overrides_rebuild_tables(self) -> None:
+        self.assertParity(self.thresholds)
+
+        self.config.set_cli_override(AUTO, 85)
+        self.assertParity({stack: (85, recommend) for stack, (_auto, recommend) in self.thresholds.items()})
+
+        self.config.set_cli_override(RECOMMEND, 30)
+        self.assertParity({stack: (85, 30) for stack in STACKS})
+
+    def test_context_overrides_rebuild_tables(self) -> None:
+        self.assertParity(self.thresholds)
+        with self.config.cli_overrides({AUTO: 65, RECOMMEND: 45}):
+            self.assertParity({stack: (65, 45) for stack in STACKS})
+            with self.config.cli_overrides({AUTO: 95}):
+                self.assertParity({stack: (95, 45) for stack in STACKS})
+            self.assertParity({stack: (65, 45) for stack in STACKS})
+        self.assertParity(self.thresholds)
+
+    def test_reload_rebuilds_tables(self) -> None:
+        self.assertParity(self.thresholds)
+        self._write_settings({
+            "thresholds": {
+                "default": {"auto_approve": 70, "approve_with_recommendations": 40, "reject": 0},
+                "stack_overrides": {
+                    "go": {"auto_approve": 95, "approve_with_recommendations": 85, "reject": 50},
+                },
+            },
+        })
+        self.config.reload()
+        self.assertParity({None: (70, 40), "python": (80, 60), "go": (95, 85), "unknown": (70, 40)})
+
+    def test_table_cache_is_bounded(self) -> None:
+        for i in range(self.config.MAX_DECISION_TABLES + 10):
+            self.assertEqual(self.config.get_threshold(85, f"stack-{i}"), "auto_approve")
+        self.assertLessEqual(len(self.config._decision_tables), self.config.MAX_DECISION_TABLES)
+        self.assertParity(self.thresholds)
+
+    def test_force_review_is_unaffected_by_decision_tables(self) -> None:
+        def expected(complexity: int, keywords, min_complexity: int) -> bool:
+            return complexity >= min_complexity or any(
+                keyword.lower() in ("security", "payment") for keyword in keywords or ()
+            )
+
+        cases = [
+            (complexity, keywords)
+            for complexity in range(0, 40)
+            for keywords in (None, [], ["docs"], ["SECURITY"], ["payment", "ui"], ["Database"])
+        ]
+
+        def check(min_complexity: int) -> None:
+            self.assertEqual(
+                [self.config.should_force_review(complexity, keywords) for complexity, keywords in cases],
+                [expected(complexity, keywords, min_complexity) for complexity, keywords in cases],
+            )
+
+        check(25)
+        self.config.classify_scores(SCORES, "python")
+        check(25)
+
+        self.config.set_cli_override(MIN_COMPLEXITY, 10)
+        self.config.set_cli_override(AUTO, 85)
+        check(10)
+        with self.config.cli_overrides({MIN_COMPLEXITY: 35}):
+            self.config.classify_scores(SCORES, "go")
+            check(35)
+            self.assertEqual(self.config.get_threshold(86, "go"), "auto_approve")
+        check(10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+"""Tests for the mergeable distributions behind the dashboard percentiles."""
+from __future__ import annotations
+
+import importlib.util
+import math
+import random
+import statistics
+import sys
+import unittest
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+QUANTILES = (0.0, 0.25, 0.5, 0.9, 0.95, 0.99, 1.0)
+
+
+def _exact(values: list, q: float) -> float:
+    """The value at the rank the sketch estimates (lower nearest rank)."""
+    ordered = sorted(values)
+    return ordered[int(math.floor(q * (len(ordered) - 1)))]
+
+
+def _durations(seed: int, n: int) -> list:
+    """Review durations in seconds: log-normal, spanning seconds to hours."""
+    rng = random.Random(seed)
+    return [rng.lognormvariate(5, 1.5) for _ in range(n)]
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestQuantileSketch(unittest.TestCase):
+    """Duration quantiles stay within the sketch's relative error."""
+
+    def test_relative_error_bound(self) -> None:
+        from lib.metrics.aggregation import QuantileSketch
+
+        for accuracy in (0.01, 0.02, 0.05):
+            values = _durations(7, 5000)
+            sketch = QuantileSketch(accuracy)
+            for value in values:
+                sketch.add(value)
+            for q in QUANTILES:
+                with self.subTest(accuracy=accuracy, q=q):
+                    exact = _exact(values, q)
+                    self.assertLessEqual(abs(sketch.quantile(q) - exact), accuracy * exact + 1e-9)
+
+    def test_merge_matches_single_pass(self) -> None:
+        from lib.metrics.aggregation import QuantileSketch
+
+        values = _durations(11, 3000)
+        whole = QuantileSketch()
+        for value in values:
+            whole.add(value)
+
+        merged = QuantileSketch()
+        for start in range(0, len(values), 700):
+            part = QuantileSketch()
+            for value in values[start:start + 700]:
+                part.add(value)
+            merged.merge(part)
+
+        self.assertEqual(merged.count, whole.count)
+        self.assertEqual(dict(merged.bins), dict(whole.bins))
+        self.assertEqual([merged.quantile(q) for q in QUANTILES], [whole.quantile(q) for q in QUANTILES])
+
+    def test_zero_and_weighted_values(self) -> None:
+        from lib.metrics.aggregation import QuantileSketch
+
+        sketch = QuantileSketch()
+        sketch.add(0, count=6)
+        sketch.add(-1)
+        sketch.add(100, count=3)
+        self.assertEqual(sketch.count, 10)
+        self.assertEqual(sketch.quantile(0.5), 0.0)
+        self.assertAlmostEqual(sketch.quantile(0.99), 100, delta=2)
+
+    def test_round_trip(self) -> None:
+        from lib.metrics.aggregation import QuantileSketch
+
+        sketch = QuantileSketch(0.05)
+        for value in _durations(3, 500) + [0.0]:
+            sketch.add(value)
+        restored = QuantileSketch.from_dict(sketch.to_dict())
+        self.assertEqual(restored.count, sketch.count)
+        self.assertEqual([restored.quantile(q) for q in QUANTILES], [sketch.quantile(q) for q in QUANTILES])
+
+    def test_empty_sketch(self) -> None:
+        from lib.metrics.aggregation import QuantileSketch, percentiles
+
+        self.assertEqual(percentiles(QuantileSketch()), {'p50': None, 'p90': None, 'p99': None})
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestScoreHistogram(unittest.TestCase):
+    """Score quantiles are exact and merge losslessly."""
+
+    def test_quantiles_are_exact(self) -> None:
+        from lib.metrics.aggregation import ScoreHistogram
+
+        rng = random.Random(5)
+        scores = [rng.randint(0, 100) for _ in range(1000)]
+        histogram = ScoreHistogram()
+        for score in scores:
+            histogram.add(score)
+        for q in QUANTILES:
+            self.assertEqual(histogram.quantile(q), _exact(scores, q))
+
+    def test_scores_are_rounded_and_clamped(self) -> None:
+        from lib.metrics.aggregation import ScoreHistogram
+
+        histogram = ScoreHistogram()
+        for score in (-5, 49.6, 120):
+            histogram.add(score)
+        self.assertEqual([histogram.quantile(q) for q in (0.0, 0.5, 1.0)], [0.0, 50.0, 100.0])
+
+    def test_merge_matches_single_pass(self) -> None:
+        from lib.metrics.aggregation import ScoreHistogram, percentiles
+
+        scores = [random.Random(9).randint(0, 100) for _ in range(10)] + list(range(0, 100, 3))
+        whole = ScoreHistogram()
+        first, second = ScoreHistogram(), ScoreHistogram()
+        for i, score in enumerate(scores):
+            whole.add(score)
+            (first if i % 2 else second).add(score)
+        merged = first.merge(second)
+        self.assertEqual(percentiles(merged), percentiles(whole))
+        self.assertEqual(ScoreHistogram.from_dict(merged.to_dict()).count, len(scores))
+
+    def test_empty_histogram(self) -> None:
+        from lib.metrics.aggregation import ScoreHistogram, percentiles
+
+        self.assertEqual(percentiles(ScoreHistogram()), {'p50': None, 'p90': None, 'p99': None})
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestAggregateDistributions(unittest.TestCase):
+    """Aggregate standard deviations and percentiles, merged or not."""
+
+    def _metrics(self, seed: int, n: int) -> list:
+        rng = random.Random(seed)
+        metrics = []
+        for i in range(n):
+            metrics.append({'type': 'decision', 'task_id': f'T-{i}', 'architectural_score': rng.randint(30, 100),
+                            'complexity_score': rng.randint(0, 50), 'stack': rng.choice(['python', 'go'])})
+            metrics.append({'type': 'outcome', 'task_id': f'T-{i}', 'duration_seconds': rng.lognormvariate(5, 1),
+                            'stack': metrics[-1]['stack']})
+        return metrics
+
+    def test_stddev_matches_statistics(self) -> None:
+        from lib.metrics.aggregation import MetricsAggregate, stddev
+
+        metrics = self._metrics(1, 400)
+        summary = MetricsAggregate().add_all(metrics).summary()
+        scores = [m['architectural_score'] for m in metrics if m['type'] == 'decision']
+        durations = [m['duration_seconds'] for m in metrics if m['type'] == 'outcome']
+        self.assertAlmostEqual(summary['architectural_score_stddev'], statistics.pstdev(scores), places=6)
+        self.assertAlmostEqual(summary['duration_stddev'], statistics.pstdev(durations), places=6)
+
+        self.assertIsNone(stddev(0, 0.0, 0.0))
+        self.assertEqual(stddev(3, 15.0, 75.0), 0.0)
+        self.assertIsNone(MetricsAggregate().summary()['duration_stddev'])
+
+    def test_merged_partials_match_one_aggregate(self) -> None:
+        from lib.metrics.aggregation import MetricsAggregate
+
+        metrics = self._metrics(2, 300)
+        whole = MetricsAggregate().add_all(metrics).summary()
+        merged = MetricsAggregate()
+        for start in range(0, len(metrics), 130):
+            partial = MetricsAggregate().add_all(metrics[start:start + 130])
+            merged.merge(MetricsAggregate.from_dict(partial.to_dict()))
+        summary = merged.summary()
+
+        for key in ('architectural_score_percentiles', 'duration_percentiles', 'by_stack', 'decisions'):
+            self.assertEqual(summary[key], whole[key], key)
+        for key in ('architectural_score_stddev', 'duration_stddev', 'avg_duration'):
+            self.assertAlmostEqual(summary[key], whole[key], places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Tests for archiving expired metrics into the compressed cold tier."""
+from __future__ import annotations
+
+import importlib.util
+import io
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+def _metrics(now: datetime, days: int) -> list:
+    """One complexity, decision and outcome at noon of each day, oldest first."""
+    # Retention with an archive works on whole days; noon keeps every day
+    # on one side of the cutoff whatever the time of day
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    metrics = []
+    for days_ago in range(days, 0, -1):
+        stamp = midnight - timedelta(days=days_ago) + timedelta(hours=12)
+        task_id = f"T-{days_ago}"
+        metrics.append({"type": "complexity", "task_id": task_id, "complexity_score": days_ago % 50,
+                        "factors": {"files": days_ago}, "stack": "python",
+                        "timestamp": stamp.isoformat() + "Z"})
+        metrics.append({"type": "decision", "task_id": task_id, "architectural_score": 50 + days_ago,
+                        "decision": "auto_approve", "complexity_score": days_ago % 50, "stack": "python",
+                        "forced": False, "recommendations": [],
+                        "timestamp": (stamp + timedelta(minutes=1)).isoformat() + "Z"})
+        metrics.append({"type": "outcome", "task_id": task_id, "decision": "auto_approve",
+                        "human_override": days_ago % 4 == 0, "duration_seconds": float(days_ago),
+                        "final_status": "approved", "stack": "python",
+                        "timestamp": (stamp + timedelta(minutes=2)).isoformat() + "Z"})
+    return metrics
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestArchiveRoundTrip(unittest.TestCase):
+    """Archived metrics read back unchanged, from every backend and codec."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.metrics = _metrics(datetime.utcnow(), 40)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _storage(self, backend: str, compression: str, encoding: str = "json"):
+        from lib.metrics.storage_factory import create_metrics_storage
+
+        storage = create_metrics_storage(backend, self.root / f"{backend}-{compression}-{encoding}",
+                                         archive=compression, encoding=encoding)
+        for metric in self.metrics:
+            self.assertTrue(storage.append_metric(dict(metric)))
+        return storage
+
+    def test_round_trip(self) -> None:
+        for backend in ("jsonl", "segmented"):
+            for compression in ("gzip", "lzma"):
+                for encoding in ("json", "compact"):
+                    with self.subTest(backend=backend, compression=compression, encoding=encoding):
+                        storage = self._storage(backend, compression, encoding)
+                        before = storage.read_all_metrics()
+
+                        self.assertEqual(storage.clear_old_metrics(10), 30 * 3)
+                        self.assertEqual(len(storage.archive.days()), 30)
+                        self.assertEqual(storage.archive.count_metrics(), 90)
+                        self.assertEqual(storage.count_metrics(), 120)
+                        self.assertEqual(storage.read_all_metrics(), before)
+                        self.assertEqual(storage.read_recent_metrics(20), [
+                            metric for metric in before
+                            if datetime.fromisoformat(metric["timestamp"].rstrip("Z"))
+                            >= datetime.utcnow() - timedelta(days=20)
+                        ])
+
+    def test_segments_use_configured_codec(self) -> None:
+        for compression, suffix in (("gzip", ".gz"), ("lzma", ".xz")):
+            with self.subTest(compression=compression):
+                storage = self._storage("jsonl", compression)
+                storage.clear_old_metrics(10)
+                names = {path.name for path in storage.archive.archive_dir.iterdir()}
+                self.assertIn("manifest.json", names)
+                self.assertTrue(all(name.endswith(suffix) for name in names - {"manifest.json"}))
+
+    def test_repeated_archive_runs_append_streams(self) -> None:
+        storage = self._storage("jsonl", "gzip")
+        before = storage.read_all_metrics()
+        self.assertEqual(storage.clear_old_metrics(20), 60)
+        # Re-append metrics of an already archived day, then archive again
+        late = {"type": "decision", "task_id": "T-late", "architectural_score": 70,
+                "decision": "auto_approve", "timestamp": self.metrics[0]["timestamp"]}
+        self.assertTrue(storage.append_metric(dict(late)))
+        self.assertEqual(storage.clear_old_metrics(10), 31)
+
+        archived = list(storage.archive.iter_metrics())
+        self.assertEqual(len(archived), 91)
+        self.assertEqual(sorted(m["task_id"] for m in storage.read_all_metrics()),
+                         sorted([m["task_id"] for m in before] + ["T-late"]))
+        first_day = storage.archive.days()[0]
+        self.assertIn("T-late", [metric["task_id"] for _ts, metric in storage.archive.scan_day(first_day)])
+
+    def test_aggregates_include_archive_without_decompressing_full_days(self) -> None:
+        from lib.metrics.aggregation import MetricsAggregate
+
+        storage = self._storage("jsonl", "lzma")
+        storage.clear_old_metrics(10)
+        expected = MetricsAggregate().add_all(storage.iter_recent_metrics(30))
+        aggregate = storage.aggregate_recent(30)
+        self.assertEqual(aggregate.total_reviews, expected.total_reviews)
+        self.assertEqual(aggregate.outcome_count, expected.outcome_count)
+        self.assertEqual(aggregate.human_overrides, expected.human_overrides)
+
+    def test_missing_segment_is_skipped(self) -> None:
+        storage = self._storage("jsonl", "gzip")
+        storage.clear_old_metrics(10)
+        oldest = sorted(storage.archive.archive_dir.glob("*.gz"))[0]
+        oldest.unlink()
+        with redirect_stdout(io.StringIO()) as out:
+            metrics = storage.read_all_metrics()
+        self.assertEqual(len(metrics), 117)
+        self.assertIn("is missing", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,240 @@
+"""Tests for the background-thread metric sink."""
+from __future__ import annotations
+
+import contextlib
+import gc
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import weakref
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+class _RecordingBackend:
+    """Backend stand-in that records writes and can be held up."""
+
+    def __init__(self) -> None:
+        self.metrics = []
+        self.flushes = 0
+        self.release = threading.Event()
+        self.release.set()
+        self.writing = threading.Event()
+
+    def append_metric(self, metric: dict) -> bool:
+        self.writing.set()
+        self.release.wait(10)
+        self.metrics.append(metric)
+        return True
+
+    def flush(self) -> bool:
+        self.flushes += 1
+        return True
+
+
+def _metric(i: int) -> dict:
+    return {"type": "decision", "task_id": f"T-{i}", "architectural_score": 85, "decision": "auto_approve"}
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestAsyncMetricsSink(unittest.TestCase):
+    """Queueing, overflow and shutdown of the sink."""
+
+    def _sink(self, backend, **kwargs):
+        from lib.metrics.async_sink import AsyncMetricsSink
+
+        sink = AsyncMetricsSink(backend, **kwargs)
+        self.addCleanup(sink.close, 5)
+        self.addCleanup(backend.release.set)  # runs first
+        return sink
+
+    def _hold(self, sink, backend) -> None:
+        """Park the worker inside a write so the queue fills up."""
+        backend.release.clear()
+        self.assertTrue(sink.submit(_metric(0)))
+        self.assertTrue(backend.writing.wait(5))
+
+    def test_counters_after_close(self) -> None:
+        backend = _RecordingBackend()
+        sink = self._sink(backend)
+        for i in range(20):
+            self.assertTrue(sink.submit(_metric(i)))
+        sink.close()
+
+        self.assertEqual([m["task_id"] for m in backend.metrics], [f"T-{i}" for i in range(20)])
+        self.assertEqual(sink.stats(), {"submitted": 20, "written": 20, "failed": 0, "dropped": 0, "queued": 0})
+        self.assertGreaterEqual(backend.flushes, 1)
+
+    def test_drop_policy_discards_when_full(self) -> None:
+        backend = _RecordingBackend()
+        sink = self._sink(backend, max_queue=2, overflow="drop")
+        self._hold(sink, backend)
+
+        results = [sink.submit(_metric(i)) for i in range(1, 5)]
+        self.assertEqual(results, [True, True, False, False])
+        self.assertEqual(sink.dropped, 2)
+
+        backend.release.set()
+        sink.close()
+        self.assertEqual(sink.stats()["submitted"], 3)
+        self.assertEqual(sink.written, 3)
+
+    def test_block_policy_waits_for_room(self) -> None:
+        backend = _RecordingBackend()
+        sink = self._sink(backend, max_queue=1, overflow="block")
+        self._hold(sink, backend)
+        self.assertTrue(sink.submit(_metric(1)))
+
+        threading.Timer(0.1, backend.release.set).start()
+        self.assertTrue(sink.submit(_metric(2)))
+        sink.close()
+        self.assertEqual(sink.written, 3)
+        self.assertEqual(sink.dropped, 0)
+
+    def test_block_policy_gives_up_after_timeout(self) -> None:
+        backend = _RecordingBackend()
+        sink = self._sink(backend, max_queue=1, overflow="block", block_timeout=0.05)
+        self._hold(sink, backend)
+        self.assertTrue(sink.submit(_metric(1)))
+        self.assertFalse(sink.submit(_metric(2)))
+        self.assertEqual(sink.dropped, 1)
+
+    def test_submit_after_close_is_dropped(self) -> None:
+        backend = _RecordingBackend()
+        sink = self._sink(backend)
+        sink.close()
+        self.assertFalse(sink.submit(_metric(1)))
+        self.assertEqual((sink.submitted, sink.dropped), (0, 1))
+
+    def test_close_with_stuck_backend_returns(self) -> None:
+        backend = _RecordingBackend()
+        sink = self._sink(backend, max_queue=3, overflow="drop")
+        self._hold(sink, backend)
+        for i in range(1, 4):
+            self.assertTrue(sink.submit(_metric(i)))
+
+        output = io.StringIO()
+        started = time.monotonic()
+        with contextlib.redirect_stdout(output):
+            sink.close(timeout=0.2)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertIn("did not drain", output.getvalue())
+        self.assertEqual(sink.dropped, 3)
+        self.assertEqual(sink.stats()["queued"], 1)  # only the stop marker
+
+        # The write in progress still completes; the discarded ones never do
+        backend.release.set()
+        sink._thread.join(5)
+        self.assertFalse(sink._thread.is_alive())
+        self.assertEqual(sink.written, 1)
+
+    def test_submit_racing_close_is_written_or_dropped(self) -> None:
+        backend = _RecordingBackend()
+        sink = self._sink(backend, max_queue=10000)
+        stop = threading.Event()
+
+        def produce() -> None:
+            i = 0
+            while not stop.is_set():
+                sink.submit(_metric(i))
+                i += 1
+
+        producers = [threading.Thread(target=produce) for _ in range(4)]
+        for thread in producers:
+            thread.start()
+        time.sleep(0.05)
+        sink.close()
+        stop.set()
+        for thread in producers:
+            thread.join(5)
+
+        self.assertEqual(sink.submitted, sink.written)
+        self.assertEqual(len(backend.metrics), sink.written)
+
+    def test_closed_sink_is_released(self) -> None:
+        from lib.metrics.async_sink import AsyncMetricsSink
+
+        sink = AsyncMetricsSink(_RecordingBackend())
+        sink.submit(_metric(1))
+        sink.close()
+        ref = weakref.ref(sink)
+        del sink
+        gc.collect()
+        self.assertIsNone(ref())
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestAsyncPlanReviewMetrics(unittest.TestCase):
+    """PlanReviewMetrics reads see every metric submitted before them."""
+
+    def setUp(self) -> None:
+        from lib.config import PlanReviewConfig
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        env = mock.patch.dict(os.environ, {
+            "REQUIREKIT_PROJECT_ROOT": self.tmp.name,
+            "REQUIREKIT_CACHE_DIR": os.path.join(self.tmp.name, "cache"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        PlanReviewConfig._instance = None
+        self.addCleanup(setattr, PlanReviewConfig, "_instance", None)
+
+    def test_reads_drain_the_queue(self) -> None:
+        from lib.metrics.async_sink import AsyncMetricsSink
+        from lib.metrics.metrics_storage import MetricsStorage
+        from lib.metrics.plan_review_metrics import PlanReviewMetrics
+
+        storage = MetricsStorage(Path(self.tmp.name) / "metrics.jsonl")
+        slow = mock.patch.object(storage, "append_metric", side_effect=self._slow(storage.append_metric))
+        slow.start()
+        self.addCleanup(slow.stop)
+        sink = AsyncMetricsSink(storage)
+        self.addCleanup(sink.close, 5)
+        tracker = PlanReviewMetrics(storage=storage, sink=sink)
+
+        for i in range(5):
+            self.assertTrue(tracker.track_decision(f"T-{i}", 85, "auto_approve", 12, stack="python"))
+        self.assertEqual(len(tracker.get_recent_metrics(1)), 5)
+        self.assertEqual(len(tracker.get_task_timeline("T-3")), 1)
+
+    def test_close_flushes_backend(self) -> None:
+        from lib.metrics.async_sink import AsyncMetricsSink
+        from lib.metrics.plan_review_metrics import PlanReviewMetrics
+        from lib.metrics.storage_factory import create_metrics_storage
+
+        metrics_dir = Path(self.tmp.name) / "metrics"
+        storage = create_metrics_storage("jsonl", metrics_dir, buffered=True)
+        sink = AsyncMetricsSink(storage)
+        tracker = PlanReviewMetrics(storage=storage, sink=sink)
+        for i in range(3):
+            tracker.track_decision(f"T-{i}", 85, "auto_approve", 12, stack="python")
+        sink.close()
+
+        reader = create_metrics_storage("jsonl", metrics_dir)
+        self.assertEqual(len(list(reader.iter_metrics())), 3)
+
+    @staticmethod
+    def _slow(append):
+        def slow_append(metric):
+            time.sleep(0.01)
+            return append(metric)
+        return slow_append
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Tests for selecting the buffered metrics writer through configuration."""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestBufferedWritesConfig(unittest.TestCase):
+    """metrics.buffered_writes and metrics.fsync reach the JSONL backend."""
+
+    def setUp(self) -> None:
+        from lib.config import PlanReviewConfig
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.env = mock.patch.dict(os.environ, {
+            "REQUIREKIT_PROJECT_ROOT": str(self.root),
+            "REQUIREKIT_CACHE_DIR": str(self.root / "cache"),
+        })
+        self.env.start()
+        self.addCleanup(self.env.stop)
+        self.addCleanup(setattr, PlanReviewConfig, "_instance", None)
+        PlanReviewConfig._instance = None
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _write_settings(self, metrics: dict) -> None:
+        settings = self.root / ".claude" / "settings.json"
+        settings.parent.mkdir(parents=True, exist_ok=True)
+        settings.write_text(json.dumps({"plan_review": {"metrics": metrics}}), encoding="utf-8")
+
+    def test_defaults_write_directly(self) -> None:
+        from lib.config import PlanReviewConfig
+        from lib.metrics.plan_review_metrics import PlanReviewMetrics
+
+        config = PlanReviewConfig()
+        self.assertFalse(config.is_metrics_buffered())
+        self.assertEqual(config.get_metrics_fsync_policy(), "never")
+        self.assertIsNone(PlanReviewMetrics(config=config).storage.writer)
+
+    def test_settings_select_buffered_writer(self) -> None:
+        from lib.metrics.buffered_writer import BufferedMetricsWriter
+        from lib.metrics.plan_review_metrics import PlanReviewMetrics
+
+        self._write_settings({"buffered_writes": True, "fsync": "batch"})
+        tracker = PlanReviewMetrics()
+        writer = tracker.storage.writer
+        self.addCleanup(writer.close)
+
+        self.assertIsInstance(writer, BufferedMetricsWriter)
+        self.assertEqual(writer.fsync, "batch")
+        self.assertEqual(writer.metrics_file, tracker.storage.metrics_file)
+
+        self.assertTrue(tracker.track_decision("T-1", 85, "auto_approve", 4))
+        # Reads flush the batch first
+        self.assertEqual([m["task_id"] for m in tracker.get_recent_metrics(1)], ["T-1"])
+        with open(tracker.storage.metrics_file, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_invalid_fsync_policy_falls_back_to_defaults(self) -> None:
+        from lib.config import PlanReviewConfig
+
+        self._write_settings({"buffered_writes": True, "fsync": "sometimes"})
+        with mock.patch("builtins.print"):
+            config = PlanReviewConfig()
+        self.assertFalse(config.is_metrics_buffered())
+
+    def test_factory_only_buffers_jsonl(self) -> None:
+        from lib.metrics.storage_factory import create_metrics_storage
+
+        metrics_dir = self.root / "metrics"
+        jsonl = create_metrics_storage("jsonl", metrics_dir, buffered=True, fsync="record")
+        self.addCleanup(jsonl.writer.close)
+        self.assertEqual(jsonl.writer.fsync, "record")
+        segmented = create_metrics_storage("segmented", metrics_dir, buffered=True)
+        self.assertIsNone(segmented.writer)
+
+
+if __name__ == "__main__":
+    unittest.main()
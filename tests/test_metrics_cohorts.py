@@ -0,0 +1,110 @@
+"""Tests for cohort analysis and task timelines over mixed timestamp formats."""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+def _lifecycle(task_id: str, stack: str, decided: datetime, latency: timedelta,
+               decided_format: str, completed_format: str) -> list:
+    """Decision and outcome events whose timestamps use the given formats."""
+    def stamp(moment: datetime, fmt: str) -> str:
+        if fmt == "naive":
+            return moment.isoformat()
+        if fmt == "z":
+            return moment.isoformat() + "Z"
+        # +02:00 local time for the same instant
+        return (moment + timedelta(hours=2)).isoformat() + "+02:00"
+
+    return [
+        {"type": "decision", "task_id": task_id, "stack": stack, "decision": "approve_with_recommendations",
+         "architectural_score": 75, "complexity_score": 12, "timestamp": stamp(decided, decided_format)},
+        {"type": "outcome", "task_id": task_id, "stack": stack, "human_override": False,
+         "duration_seconds": 30.0, "final_status": "approved",
+         "timestamp": stamp(decided + latency, completed_format)},
+    ]
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestCohortsWithMixedTimestamps(unittest.TestCase):
+    """Decision-to-outcome latency is computed in UTC whatever the format."""
+
+    def setUp(self) -> None:
+        from lib.config import PlanReviewConfig
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        env = mock.patch.dict(os.environ, {
+            "REQUIREKIT_PROJECT_ROOT": self.tmp.name,
+            "REQUIREKIT_CACHE_DIR": os.path.join(self.tmp.name, "cache"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        PlanReviewConfig._instance = None
+        self.addCleanup(setattr, PlanReviewConfig, "_instance", None)
+
+        self.decided = datetime.utcnow() - timedelta(days=1)
+        self.metrics = (
+            _lifecycle("T-1", "python", self.decided, timedelta(minutes=10), "naive", "offset")
+            + _lifecycle("T-2", "python", self.decided, timedelta(minutes=20), "offset", "z")
+            + _lifecycle("T-3", "react", self.decided, timedelta(minutes=30), "z", "naive")
+        )
+
+    def test_cohort_latency(self) -> None:
+        from lib.metrics.cohort_analysis import cohort_analysis
+
+        result = cohort_analysis(self.metrics, by="stack")
+        self.assertEqual(result["python"]["completed"], 2)
+        self.assertAlmostEqual(result["python"]["avg_decision_to_outcome"], 900.0)
+        self.assertAlmostEqual(result["react"]["avg_decision_to_outcome"], 1800.0)
+
+    def test_analyze_cohorts_from_storage(self) -> None:
+        from lib.metrics.metrics_storage import MetricsStorage
+        from lib.metrics.plan_review_metrics import PlanReviewMetrics
+
+        storage = MetricsStorage(Path(self.tmp.name) / "plan_review_metrics.jsonl")
+        for metric in self.metrics:
+            self.assertTrue(storage.append_metric(dict(metric)))
+        tracker = PlanReviewMetrics(storage=storage)
+        result = tracker.analyze_cohorts(days=7, by="decision")
+        self.assertEqual(result["approve_with_recommendations"]["completed"], 3)
+        self.assertAlmostEqual(result["approve_with_recommendations"]["avg_decision_to_outcome"], 1200.0)
+
+        timeline = tracker.get_task_timeline("T-2")
+        self.assertEqual([metric["type"] for metric in timeline], ["decision", "outcome"])
+
+    def test_timeline_orders_by_utc_time(self) -> None:
+        from lib.metrics.metrics_storage import MetricsStorage
+        from lib.metrics.plan_review_metrics import PlanReviewMetrics
+
+        # Lexically "12:00+02:00" > "11:00Z" although it is an hour earlier
+        events = [
+            {"type": "outcome", "task_id": "T-9", "timestamp": "2026-10-16T11:00:00Z"},
+            {"type": "complexity", "task_id": "T-9"},
+            {"type": "decision", "task_id": "T-9", "timestamp": "2026-10-16T12:00:00+02:00"},
+        ]
+        storage = MetricsStorage(Path(self.tmp.name) / "plan_review_metrics.jsonl")
+        with open(storage.metrics_file, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(event) + "\n" for event in events)
+        tracker = PlanReviewMetrics(storage=storage)
+        self.assertEqual([m["type"] for m in tracker.get_task_timeline("T-9")],
+                         ["decision", "outcome", "complexity"])
+
+
+if __name__ == "__main__":
+    unittest.main()
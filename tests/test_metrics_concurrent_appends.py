@@ -0,0 +1,137 @@
+"""Stress tests for multi-process appends to the plan review metrics log.
+
+Spawns many writer processes appending records larger than PIPE_BUF to the
+same JSONL file (unbuffered and through BufferedMetricsWriter) while another
+process repeatedly compacts it with clear_old_metrics(), then checks that
+every record arrived exactly once and no line was torn or interleaved.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import multiprocessing
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+try:
+    import fcntl  # noqa: F401
+    HAS_FCNTL = True
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    HAS_FCNTL = False
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+WRITERS = 8
+RECORDS_PER_WRITER = 150
+PAYLOAD = "x" * 8192  # well above PIPE_BUF (4096 on Linux)
+
+
+def _append_worker(metrics_file: str, worker_id: int, buffered: bool) -> None:
+    """Append RECORDS_PER_WRITER large metrics from one process."""
+    if str(LIB_PARENT) not in sys.path:
+        sys.path.insert(0, str(LIB_PARENT))
+    from lib.metrics.buffered_writer import BufferedMetricsWriter
+    from lib.metrics.metrics_storage import MetricsStorage
+
+    path = Path(metrics_file)
+    writer = BufferedMetricsWriter(path, max_records=7) if buffered else None
+    storage = MetricsStorage(path, writer=writer)
+    for i in range(RECORDS_PER_WRITER):
+        storage.append_metric({
+            "type": "decision",
+            "task_id": f"W{worker_id}-{i}",
+            "worker": worker_id,
+            "seq": i,
+            "payload": PAYLOAD,
+        })
+    if writer is not None:
+        writer.close()
+
+
+def _compact_worker(metrics_file: str, stop) -> None:
+    """Repeatedly compact the log until told to stop."""
+    if str(LIB_PARENT) not in sys.path:
+        sys.path.insert(0, str(LIB_PARENT))
+    from lib.metrics.metrics_storage import MetricsStorage
+
+    storage = MetricsStorage(Path(metrics_file))
+    while not stop.is_set():
+        storage.clear_old_metrics(retention_days=30)
+
+
+@unittest.skipUnless(HAS_FCNTL, "advisory locking requires fcntl")
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestConcurrentAppends(unittest.TestCase):
+    """N concurrent writers plus a compactor never corrupt or lose records."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.metrics_file = Path(self.tmp.name) / "plan_review_metrics.jsonl"
+        methods = multiprocessing.get_all_start_methods()
+        self.ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _run_writers(self, buffered: bool, with_compactor: bool) -> None:
+        stop = self.ctx.Event()
+        compactor = None
+        if with_compactor:
+            compactor = self.ctx.Process(target=_compact_worker, args=(str(self.metrics_file), stop))
+            compactor.start()
+
+        writers = [
+            self.ctx.Process(target=_append_worker, args=(str(self.metrics_file), worker_id, buffered))
+            for worker_id in range(WRITERS)
+        ]
+        for process in writers:
+            process.start()
+        for process in writers:
+            process.join(timeout=120)
+            self.assertEqual(process.exitcode, 0)
+
+        if compactor is not None:
+            stop.set()
+            compactor.join(timeout=120)
+            self.assertEqual(compactor.exitcode, 0)
+
+    def _assert_all_records_intact(self) -> None:
+        seen = set()
+        with open(self.metrics_file, "rb") as f:
+            for line_num, line in enumerate(f, 1):
+                self.assertTrue(line.endswith(b"\n"), f"line {line_num} is not terminated")
+                record = json.loads(line)
+                self.assertEqual(record["payload"], PAYLOAD, f"line {line_num} is torn")
+                key = (record["worker"], record["seq"])
+                self.assertNotIn(key, seen, f"duplicate record {key}")
+                seen.add(key)
+
+        expected = {(w, i) for w in range(WRITERS) for i in range(RECORDS_PER_WRITER)}
+        self.assertEqual(seen, expected)
+
+    def test_unbuffered_writers(self) -> None:
+        """Single-write O_APPEND records from many processes stay intact."""
+        self._run_writers(buffered=False, with_compactor=False)
+        self._assert_all_records_intact()
+
+    def test_unbuffered_writers_with_compaction(self) -> None:
+        """Compaction racing with appenders never drops rows."""
+        self._run_writers(buffered=False, with_compactor=True)
+        self._assert_all_records_intact()
+
+    def test_buffered_writers_with_compaction(self) -> None:
+        """Buffered batches follow the file across compaction."""
+        self._run_writers(buffered=True, with_compactor=True)
+        self._assert_all_records_intact()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+"""Tests for the dashboard summary serializers.
+
+Each export is parsed back from a known ``MetricsAggregate`` so that what
+monitoring scrapes is checked, not just that rendering succeeds.
+"""
+from __future__ import annotations
+
+import csv
+import importlib.util
+import io
+import json
+import re
+import sys
+import unittest
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+# name{labels} value
+SAMPLE = re.compile(r'^(?P<name>[a-z_]+)\{(?P<labels>.*)\} (?P<value>\S+)$')
+LABEL = re.compile(r'(?P<key>[a-z_]+)="(?P<value>(?:[^"\\]|\\.)*)"')
+
+
+def _unescape(value: str) -> str:
+    return re.sub(r'\\(.)', lambda m: '\n' if m.group(1) == 'n' else m.group(1), value)
+
+
+def _parse_prometheus(text: str) -> tuple:
+    """Parse exposition text into (help, type, samples) following the format rules."""
+    helps, types, samples = {}, {}, []
+    for line in text.splitlines():
+        if line.startswith('# HELP '):
+            name, _, text = line[len('# HELP '):].partition(' ')
+            helps[name] = text
+        elif line.startswith('# TYPE '):
+            name, _, kind = line[len('# TYPE '):].partition(' ')
+            types[name] = kind
+        else:
+            match = SAMPLE.match(line)
+            assert match, f"unparseable line: {line!r}"
+            labels_text = match.group('labels')
+            labels = {m.group('key'): _unescape(m.group('value')) for m in LABEL.finditer(labels_text)}
+            assert ','.join(m.group(0) for m in LABEL.finditer(labels_text)) == labels_text, labels_text
+            samples.append((match.group('name'), labels, float(match.group('value'))))
+    return helps, types, samples
+
+
+def _metrics() -> list:
+    metrics = []
+    for i, (score, stack, repo) in enumerate([
+        (90, 'python', 'api'), (70, 'python', 'api'), (40, 'go', 'web "main"\\\nrepo'),
+    ]):
+        metrics.append({
+            'type': 'decision', 'task_id': f'T-{i}', 'architectural_score': score,
+            'complexity_score': 10 * i + 5, 'decision': 'auto_approve' if score >= 80 else 'reject',
+            'forced': i == 2, 'stack': stack, 'repo': repo,
+        })
+    metrics.append({
+        'type': 'outcome', 'task_id': 'T-0', 'duration_seconds': 120.0, 'final_status': 'completed',
+        'human_override': True, 'stack': 'python', 'repo': 'api',
+    })
+    return metrics
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestDashboardSerializers(unittest.TestCase):
+    """JSON, CSV and Prometheus exports of a known aggregate."""
+
+    def setUp(self) -> None:
+        from lib.metrics.aggregation import MetricsAggregate
+        from lib.metrics.dashboard_summary import DashboardSummary
+
+        aggregate = MetricsAggregate().add_all(_metrics())
+        self.week = DashboardSummary.from_aggregate(aggregate, 7)
+        self.month = DashboardSummary.from_aggregate(MetricsAggregate().add_all(_metrics()[:1]), 30)
+
+    def test_json_single_and_multiple_windows(self) -> None:
+        from lib.metrics.dashboard_summary import to_json
+
+        single = json.loads(to_json([self.week]))
+        self.assertEqual(single['days'], 7)
+        self.assertEqual(single['total_reviews'], 3)
+        self.assertEqual(single['decisions'], {'auto_approve': 1, 'reject': 2})
+        self.assertEqual(single['by_stack']['python']['count'], 2)
+        self.assertIsNone(single['by_stack']['go']['duration_percentiles']['p50'])
+
+        both = json.loads(to_json([self.week, self.month]))
+        self.assertEqual([window['days'] for window in both['windows']], [7, 30])
+
+    def test_csv_columns_and_rows(self) -> None:
+        from lib.metrics.dashboard_summary import to_csv
+
+        rows = list(csv.DictReader(io.StringIO(to_csv([self.week, self.month]))))
+        self.assertEqual(list(rows[0]), ['window_days', 'metric', 'labels', 'value'])
+
+        week = {(row['metric'], row['labels']): float(row['value']) for row in rows if row['window_days'] == '7'}
+        self.assertEqual(week[('reviews', '')], 3)
+        self.assertEqual(week[('forced_reviews', '')], 1)
+        self.assertEqual(week[('human_overrides', '')], 1)
+        self.assertEqual(week[('decisions', 'decision=reject')], 2)
+        self.assertEqual(week[('architectural_score', 'quantile=0.5')], 70)
+        self.assertEqual(week[('stack_reviews', 'stack=python')], 2)
+        self.assertEqual(week[('stack_architectural_score', 'stack=python;quantile=0.9')],
+                         self.week.by_stack['python']['score_percentiles']['p90'])
+
+        month = {row['metric'] for row in rows if row['window_days'] == '30'}
+        self.assertIn('reviews', month)
+        self.assertNotIn('duration_seconds', month)
+        self.assertEqual(len(rows), len(list(self.week.samples())) + len(list(self.month.samples())))
+
+    def test_prometheus_help_and_type_per_series(self) -> None:
+        from lib.metrics.dashboard_summary import PROMETHEUS_PREFIX, _SERIES, to_prometheus
+
+        text = to_prometheus([self.week, self.month])
+        self.assertTrue(text.endswith('\n'))
+        helps, types, samples = _parse_prometheus(text)
+
+        names = {name for name, _labels, _value in samples}
+        self.assertEqual(set(helps), names)
+        self.assertEqual(set(types), names)
+        self.assertEqual(set(types.values()), {'gauge'})
+        for name in names:
+            self.assertTrue(name.startswith(PROMETHEUS_PREFIX))
+            self.assertEqual(helps[name], _SERIES[name[len(PROMETHEUS_PREFIX):]])
+
+        # HELP and TYPE come once, immediately before the series' samples
+        lines = text.splitlines()
+        for name in names:
+            start = lines.index(f'# HELP {name} {helps[name]}')
+            self.assertEqual(lines[start + 1], f'# TYPE {name} gauge')
+            self.assertEqual(sum(line.startswith(f'# HELP {name} ') for line in lines), 1)
+            block = lines[start + 2:]
+            count = next((i for i, line in enumerate(block) if line.startswith('#')), len(block))
+            self.assertTrue(all(line.startswith(name + '{') for line in block[:count]))
+
+    def test_prometheus_labels(self) -> None:
+        from lib.metrics.dashboard_summary import to_prometheus
+
+        _helps, _types, samples = _parse_prometheus(to_prometheus([self.week, self.month]))
+        by_key = {(name, tuple(sorted(labels.items()))): value for name, labels, value in samples}
+
+        self.assertTrue(all(list(labels)[0] == 'window_days' for _name, labels, _value in samples))
+        self.assertEqual(by_key[('plan_review_reviews', (('window_days', '7'),))], 3.0)
+        self.assertEqual(by_key[('plan_review_reviews', (('window_days', '30'),))], 1.0)
+        self.assertEqual(
+            by_key[('plan_review_duration_seconds', (('quantile', '0.99'), ('window_days', '7')))],
+            self.week.duration_percentiles['p99'],
+        )
+        self.assertEqual(
+            {labels['quantile'] for name, labels, _value in samples if name == 'plan_review_architectural_score'},
+            {'0.5', '0.9', '0.99'},
+        )
+
+    def test_prometheus_escapes_label_values(self) -> None:
+        from lib.metrics.dashboard_summary import _escape_label, to_prometheus
+
+        self.assertEqual(_escape_label('a\\b"c\nd'), 'a\\\\b\\"c\\nd')
+
+        text = to_prometheus([self.week])
+        self.assertIn('repo="web \\"main\\"\\\\\\nrepo"', text)
+        _helps, _types, samples = _parse_prometheus(text)
+        repos = {labels['repo'] for name, labels, _value in samples if name == 'plan_review_repo_reviews'}
+        self.assertEqual(repos, {'api', 'web "main"\\\nrepo'})
+
+    def test_prometheus_skips_empty_series(self) -> None:
+        from lib.metrics.dashboard_summary import to_prometheus
+
+        text = to_prometheus([self.month])
+        helps, _types, samples = _parse_prometheus(text)
+        names = {name for name, _labels, _value in samples}
+        for empty in ('plan_review_duration_seconds', 'plan_review_duration_seconds_stddev',
+                      'plan_review_outcomes', 'plan_review_stack_duration_seconds'):
+            self.assertNotIn(empty, names)
+            self.assertNotIn(empty, helps)
+        self.assertIn('plan_review_architectural_score_stddev', names)
+        # The empty window's averages are still exported as zero
+        self.assertIn(('plan_review_duration_seconds_avg', {'window_days': '30'}, 0.0), samples)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+"""Tests for reading several repositories' metrics through one federated storage."""
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+BACKENDS = ("jsonl", "segmented", "sqlite")
+
+
+def _decision(task_id: str, stamp: datetime) -> dict:
+    return {
+        "type": "decision", "task_id": task_id, "stack": "python",
+        "architectural_score": 85, "decision": "auto_approve",
+        "timestamp": stamp.isoformat() + "Z",
+    }
+
+
+def _files(root: Path) -> dict:
+    """Snapshot of every file under a directory with its size and mtime.
+
+    SQLite's own WAL coordination files are left out: a read-only
+    connection to a WAL database may recreate them.
+    """
+    return {
+        str(path.relative_to(root)): (path.stat().st_size, path.stat().st_mtime_ns)
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and not path.name.endswith(("-wal", "-shm"))
+    }
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestFederatedMergeOrder(unittest.TestCase):
+    """The merged stream interleaves repositories by timestamp."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.now = datetime.utcnow().replace(microsecond=0)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _record(self, backend: str, repo: str, task_ids_and_hours: list) -> None:
+        from lib.metrics.storage_factory import create_metrics_storage
+        from lib.utils import PathResolver
+
+        storage = create_metrics_storage(backend, PathResolver.get_metrics_dir(self.root / repo))
+        for task_id, hours_ago in task_ids_and_hours:
+            self.assertTrue(storage.append_metric(_decision(task_id, self.now - timedelta(hours=hours_ago))))
+        storage.flush()
+        if hasattr(storage, "close"):
+            storage.close()
+
+    def _federated(self, backend: str, repos: tuple):
+        from lib.metrics.storage_factory import create_federated_storage
+
+        storage = create_federated_storage({repo: self.root / repo for repo in repos}, backend)
+        for source in storage.sources.values():
+            if hasattr(source, "close"):
+                self.addCleanup(source.close)
+        return storage
+
+    def test_merge_interleaves_by_timestamp(self) -> None:
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self._record(backend, f"{backend}-a", [("A-1", 50), ("A-2", 30), ("A-3", 10)])
+                self._record(backend, f"{backend}-b", [("B-1", 40), ("B-2", 20), ("B-3", 5)])
+                storage = self._federated(backend, (f"{backend}-a", f"{backend}-b"))
+
+                merged = [(metric["repo"], metric["task_id"]) for metric in storage.iter_recent_metrics(7)]
+                self.assertEqual([task_id for _repo, task_id in merged], ["A-1", "B-1", "A-2", "B-2", "A-3", "B-3"])
+                self.assertEqual({repo for repo, task_id in merged if task_id.startswith("A")}, {f"{backend}-a"})
+                self.assertEqual(
+                    [metric["task_id"] for metric in storage.iter_metrics()],
+                    ["A-1", "B-1", "A-2", "B-2", "A-3", "B-3"],
+                )
+
+    def test_equal_timestamps_keep_source_order(self) -> None:
+        self._record("jsonl", "first", [("F-1", 10), ("F-2", 10)])
+        self._record("jsonl", "second", [("S-1", 10)])
+        storage = self._federated("jsonl", ("second", "first"))
+        self.assertEqual([m["task_id"] for m in storage.iter_metrics()], ["S-1", "F-1", "F-2"])
+
+    def test_aggregate_breaks_down_by_repo(self) -> None:
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self._record(backend, f"{backend}-a", [("A-1", 50), ("A-2", 30)])
+                self._record(backend, f"{backend}-b", [("B-1", 40)])
+                storage = self._federated(backend, (f"{backend}-a", f"{backend}-b"))
+
+                aggregate = storage.aggregate_recent(7)
+                self.assertEqual(aggregate.total_reviews, 3)
+                self.assertEqual(
+                    {repo: group.count for repo, group in aggregate.by_repo.items()},
+                    {f"{backend}-a": 2, f"{backend}-b": 1},
+                )
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestFederatedReadOnly(unittest.TestCase):
+    """Reading through a federation never writes into the federated repositories."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _read_everything(self, storage) -> None:
+        list(storage.iter_metrics())
+        list(storage.iter_recent_metrics(30))
+        list(storage.iter_task_metrics("T-1"))
+        storage.count_metrics()
+        storage.aggregate_recent(30)
+        storage.aggregate_windows((1, 7))
+
+    def test_missing_repository_is_not_created(self) -> None:
+        from lib.metrics.storage_factory import create_federated_storage
+
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                repo = self.root / f"missing-{backend}"
+                repo.mkdir()
+                storage = create_federated_storage({"missing": repo}, backend)
+                self._read_everything(storage)
+                self.assertEqual(storage.count_metrics(), 0)
+                self.assertEqual(list(repo.iterdir()), [])
+
+    def test_reads_leave_repository_untouched(self) -> None:
+        from lib.metrics.storage_factory import create_federated_storage, create_metrics_storage
+        from lib.utils import PathResolver
+
+        now = datetime.utcnow()
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                repo = self.root / f"repo-{backend}"
+                source = create_metrics_storage(backend, PathResolver.get_metrics_dir(repo))
+                for hours_ago in range(1, 30):
+                    self.assertTrue(source.append_metric(_decision(f"T-{hours_ago}", now - timedelta(hours=hours_ago))))
+                # Corrupted lines must not be quarantined into the other repository either
+                if backend == "jsonl":
+                    with open(source.metrics_file, "ab") as f:
+                        f.write(b"not json\n")
+                if hasattr(source, "close"):
+                    source.close()
+                before = _files(repo)
+
+                storage = create_federated_storage({"repo": repo}, backend)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    self._read_everything(storage)
+                self.assertEqual(len(list(storage.iter_metrics())), 29)
+                for federated_source in storage.sources.values():
+                    if hasattr(federated_source, "close"):
+                        federated_source.close()
+                self.assertEqual(_files(repo), before)
+
+    def test_writes_are_refused(self) -> None:
+        from lib.metrics.storage_factory import create_federated_storage
+
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                repo = self.root / f"refused-{backend}"
+                repo.mkdir()
+                storage = create_federated_storage({"repo": repo}, backend)
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    self.assertFalse(storage.append_metric(dict(_decision("T-1", datetime.utcnow()), repo="repo")))
+                    self.assertEqual(storage.clear_old_metrics(1), 0)
+                    self.assertEqual(storage.rollup_old_metrics(1), 0)
+                    self.assertEqual(storage.repair(), {})
+                self.assertIn("read-only", output.getvalue())
+                self.assertEqual(list(repo.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
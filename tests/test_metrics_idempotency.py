@@ -0,0 +1,104 @@
+"""Tests for idempotency keys on tracked plan review events.
+
+Retries of the same attempt (or explicit key) are dropped by the storage;
+events tracked without an attempt or key are genuine repeats and kept.
+"""
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestEventKey(unittest.TestCase):
+    """Keys are only derived when the caller identifies the invocation."""
+
+    def test_no_attempt_means_no_key(self) -> None:
+        from lib.metrics.idempotency import event_key
+
+        self.assertIsNone(event_key("decision", "T-1"))
+        self.assertEqual(event_key("decision", "T-1", attempt=2), "T-1:decision:2")
+        self.assertEqual(event_key("decision", "T-1", attempt=2, idempotency_key="run-7"), "run-7")
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestTrackedRepeats(unittest.TestCase):
+    """Retries are deduplicated on every backend; genuine repeats are kept."""
+
+    def setUp(self) -> None:
+        from lib.config import PlanReviewConfig
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        env = mock.patch.dict(os.environ, {
+            "REQUIREKIT_PROJECT_ROOT": self.tmp.name,
+            "REQUIREKIT_CACHE_DIR": os.path.join(self.tmp.name, "cache"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        PlanReviewConfig._instance = None
+        self.addCleanup(setattr, PlanReviewConfig, "_instance", None)
+
+    def _trackers(self):
+        from lib.metrics.plan_review_metrics import PlanReviewMetrics
+        from lib.metrics.storage_factory import create_metrics_storage
+
+        for backend in ("jsonl", "segmented", "sqlite"):
+            storage = create_metrics_storage(backend, Path(self.tmp.name) / backend)
+            if hasattr(storage, "close"):
+                self.addCleanup(storage.close)
+            yield backend, PlanReviewMetrics(storage=storage)
+
+    def _track_review(self, tracker, **key) -> None:
+        self.assertTrue(tracker.track_complexity("T-1", 12, {"files": 3}, stack="python", **key))
+        self.assertTrue(tracker.track_decision("T-1", 85, "auto_approve", 12, stack="python", **key))
+        self.assertTrue(tracker.track_outcome("T-1", "auto_approve", False, 60.0, "approved", stack="python", **key))
+
+    def test_retry_of_same_attempt_is_dropped(self) -> None:
+        for backend, tracker in self._trackers():
+            with self.subTest(backend=backend):
+                self._track_review(tracker, attempt=1)
+                self._track_review(tracker, attempt=1)
+                self.assertEqual(len(tracker.get_task_timeline("T-1")), 3)
+                self.assertEqual(tracker.storage.duplicates, 3)
+
+                # A new attempt is a new review, not a retry
+                self._track_review(tracker, attempt=2)
+                self.assertEqual(len(tracker.get_task_timeline("T-1")), 6)
+
+    def test_retry_with_explicit_key_is_dropped(self) -> None:
+        for backend, tracker in self._trackers():
+            with self.subTest(backend=backend):
+                for _ in range(2):
+                    self.assertTrue(tracker.track_decision(
+                        "T-1", 85, "auto_approve", 12, stack="python", idempotency_key="run-42:decision"
+                    ))
+                self.assertEqual(len(tracker.get_task_timeline("T-1")), 1)
+                self.assertEqual(tracker.storage.duplicates, 1)
+
+    def test_genuine_repeats_are_kept(self) -> None:
+        for backend, tracker in self._trackers():
+            with self.subTest(backend=backend):
+                self._track_review(tracker)
+                self._track_review(tracker)
+                timeline = tracker.get_task_timeline("T-1")
+                self.assertEqual(len(timeline), 6)
+                self.assertTrue(all("idempotency_key" not in metric for metric in timeline))
+                self.assertEqual(tracker.storage.duplicates, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Tests for the sidecar indexes maintained alongside metrics appends."""
+from __future__ import annotations
+
+import importlib.util
+import io
+import json
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestIndexMaintenance(unittest.TestCase):
+    """Appends succeed once on disk, whatever happens to the indexes."""
+
+    def setUp(self) -> None:
+        from lib.metrics.metrics_storage import MetricsStorage
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.metrics_file = Path(self.tmp.name) / "plan_review_metrics.jsonl"
+        self.storage = MetricsStorage(self.metrics_file)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _decision(self, task_id: str, timestamp: str) -> dict:
+        return {"type": "decision", "task_id": task_id, "architectural_score": 80,
+                "decision": "auto_approve", "timestamp": timestamp}
+
+    def test_offset_timestamp_then_naive_append(self) -> None:
+        now = datetime.utcnow()
+        self.assertTrue(self.storage.append_metric(
+            self._decision("T-aware", (now - timedelta(hours=1)).isoformat() + "+00:00")))
+        self.assertTrue(self.storage.append_metric(self._decision("T-naive", now.isoformat())))
+        self.assertEqual(self.storage.timestamp_index.running_max, now)
+
+        task_ids = [metric["task_id"] for metric in self.storage.read_recent_metrics(1)]
+        self.assertEqual(task_ids, ["T-aware", "T-naive"])
+        self.assertEqual(len(list(self.storage.iter_task_metrics("T-aware"))), 1)
+
+    def test_failing_index_does_not_fail_append(self) -> None:
+        index = self.storage.timestamp_index
+        with mock.patch.object(index, "note_append", side_effect=RuntimeError("boom")), \
+                redirect_stdout(io.StringIO()) as out:
+            appended = self.storage.append_metric(self._decision("T-1", datetime.utcnow().isoformat()))
+
+        self.assertTrue(appended)
+        self.assertIn("Failed to update timestamp index", out.getvalue())
+        with open(self.metrics_file, encoding="utf-8") as f:
+            self.assertEqual([json.loads(line)["task_id"] for line in f], ["T-1"])
+        self.assertEqual(len(list(self.storage.iter_task_metrics("T-1"))), 1)
+        self.assertEqual(len(self.storage.read_recent_metrics(1)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
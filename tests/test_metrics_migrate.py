@@ -0,0 +1,111 @@
+"""Tests for migrating metrics between storage backends."""
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+def _metrics(now: datetime) -> list:
+    """Keyed and unkeyed events of every type over a few days."""
+    metrics = []
+    for i in range(6):
+        stamp = (now - timedelta(days=i, hours=1)).isoformat() + "Z"
+        keyed = {"idempotency_key": f"T-{i}:decision:1"} if i % 2 else {}
+        metrics.append({"type": "complexity", "task_id": f"T-{i}", "complexity_score": 5 * i,
+                        "factors": {"files": i}, "stack": "python", "timestamp": stamp})
+        metrics.append(dict({"type": "decision", "task_id": f"T-{i}", "architectural_score": 60 + 5 * i,
+                             "decision": "auto_approve", "complexity_score": 5 * i, "stack": "python",
+                             "forced": False, "recommendations": [], "timestamp": stamp}, **keyed))
+        metrics.append({"type": "outcome", "task_id": f"T-{i}", "decision": "auto_approve",
+                        "human_override": False, "duration_seconds": 30.0 + i, "final_status": "completed",
+                        "stack": None, "timestamp": stamp, "idempotency_key": f"T-{i}:outcome:1"})
+    return metrics
+
+
+def _keys(storage) -> list:
+    return sorted(metric["idempotency_key"] for metric in storage.iter_metrics() if "idempotency_key" in metric)
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestMigrateMetrics(unittest.TestCase):
+    """Metrics survive a round trip through another backend unchanged."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.metrics = _metrics(datetime.utcnow().replace(microsecond=0))
+        self.source = self._storage("jsonl", "source")
+        for metric in self.metrics:
+            self.assertTrue(self.source.append_metric(dict(metric)))
+        self.source.flush()
+
+    def _storage(self, backend: str, name: str):
+        from lib.metrics.storage_factory import create_metrics_storage
+
+        storage = create_metrics_storage(backend, self.root / name)
+        if hasattr(storage, "close"):
+            self.addCleanup(storage.close)
+        return storage
+
+    def test_jsonl_sqlite_jsonl_round_trip(self) -> None:
+        from lib.metrics.migrate import migrate_metrics
+
+        sqlite = self._storage("sqlite", "sqlite")
+        self.assertEqual(migrate_metrics(self.source, sqlite), len(self.metrics))
+        back = self._storage("jsonl", "back")
+        self.assertEqual(migrate_metrics(sqlite, back), len(self.metrics))
+
+        for storage in (sqlite, back):
+            with self.subTest(storage=type(storage).__name__):
+                self.assertEqual(storage.count_metrics(), len(self.metrics))
+                self.assertEqual(_keys(storage), _keys(self.source))
+                self.assertEqual(len(_keys(storage)), 9)
+                self.assertEqual(list(storage.iter_metrics()), list(self.source.iter_metrics()))
+                self.assertEqual(storage.aggregate_recent(30).summary(), self.source.aggregate_recent(30).summary())
+
+    def test_repeated_migration_skips_keyed_metrics(self) -> None:
+        from lib.metrics.migrate import migrate_metrics
+
+        unkeyed = sum("idempotency_key" not in metric for metric in self.metrics)
+        for backend in ("sqlite", "segmented", "jsonl"):
+            with self.subTest(backend=backend):
+                target = self._storage(backend, f"again-{backend}")
+                self.assertEqual(migrate_metrics(self.source, target), len(self.metrics))
+                # Keyed events are recognised as already migrated; unkeyed ones cannot be
+                migrate_metrics(self.source, target)
+                self.assertEqual(target.count_metrics(), len(self.metrics) + unkeyed)
+                self.assertEqual(_keys(target), _keys(self.source))
+
+    def test_command_line(self) -> None:
+        from lib.metrics.migrate import main
+
+        metrics_dir = self.root / "source"
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main(["--from", "jsonl", "--to", "sqlite", "--metrics-dir", str(metrics_dir)]), 0)
+        self.assertIn(f"Migrated {len(self.metrics)} metrics from jsonl to sqlite", output.getvalue())
+
+        sqlite = self._storage("sqlite", "source")
+        self.assertEqual(_keys(sqlite), _keys(self.source))
+
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(["--from", "sqlite", "--to", "sqlite"])
+
+
+if __name__ == "__main__":
+    unittest.main()
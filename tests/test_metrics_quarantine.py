@@ -0,0 +1,166 @@
+"""Tests for quarantining corrupted metric lines and repairing metrics storage."""
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import json
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+def _decision(task_id: str) -> dict:
+    return {
+        "type": "decision", "task_id": task_id, "stack": "python",
+        "architectural_score": 85, "decision": "auto_approve",
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+    }
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestQuarantineOnRead(unittest.TestCase):
+    """Corrupted lines are quarantined once and skipped afterwards."""
+
+    def setUp(self) -> None:
+        from lib.metrics.storage_factory import create_metrics_storage
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = create_metrics_storage("jsonl", Path(self.tmp.name))
+        self.assertTrue(self.storage.append_metric(_decision("T-1")))
+        with open(self.storage.metrics_file, "ab") as f:
+            f.write(b'{"type": "decision", "task_id": \n')
+        self.assertTrue(self.storage.append_metric(_decision("T-2")))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _task_ids(self, storage) -> list:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [metric["task_id"] for metric in storage.iter_recent_metrics(1)]
+
+    def test_corrupted_line_is_quarantined_once(self) -> None:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            first = [metric["task_id"] for metric in self.storage.iter_recent_metrics(1)]
+            second = [metric["task_id"] for metric in self.storage.iter_recent_metrics(1)]
+
+        self.assertEqual(first, ["T-1", "T-2"])
+        self.assertEqual(second, first)
+        self.assertEqual(output.getvalue().count("Quarantined corrupted metric"), 1)
+        self.assertEqual(self.storage.quarantine.skipped, 2)
+
+        entries = list(self.storage.quarantine.iter_entries())
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["source"], self.storage.metrics_file.name)
+        self.assertEqual(entries[0]["line"], '{"type": "decision", "task_id": ')
+        offset = self.storage.metrics_file.read_bytes().index(b'{"type": "decision", "task_id": \n')
+        self.assertEqual(entries[0]["offset"], offset)
+
+    def test_quarantine_index_survives_reopen(self) -> None:
+        from lib.metrics.metrics_storage import MetricsStorage
+
+        self._task_ids(self.storage)
+        reopened = MetricsStorage(self.storage.metrics_file)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual([m["task_id"] for m in reopened.iter_recent_metrics(1)], ["T-1", "T-2"])
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(len(list(reopened.quarantine.iter_entries())), 1)
+
+    def test_torn_final_line_is_not_quarantined_on_read(self) -> None:
+        with open(self.storage.metrics_file, "ab") as f:
+            f.write(b'{"type": "outcome", "task')
+        self._task_ids(self.storage)
+        self.assertEqual(len(list(self.storage.quarantine.iter_entries())), 1)
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestRepair(unittest.TestCase):
+    """repair truncates torn writes and strips corrupted lines on every file backend."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _damaged(self, backend: str):
+        from lib.metrics.storage_factory import create_metrics_storage
+
+        storage = create_metrics_storage(backend, self.root / backend)
+        self.assertTrue(storage.append_metric(_decision("T-1")))
+        self.assertTrue(storage.append_metric(_decision("T-2")))
+        if backend == "segmented":
+            storage.flush()
+            path = sorted(storage.segments_dir.glob("*.jsonl"))[-1]
+        else:
+            path = storage.metrics_file
+        lines = path.read_bytes().splitlines(keepends=True)
+        path.write_bytes(lines[0] + b"not json\n" + lines[1] + b'{"type": "outcome", "ta')
+        return storage, path
+
+    def test_repair_strips_corruption(self) -> None:
+        for backend in ("jsonl", "segmented"):
+            with self.subTest(backend=backend):
+                storage, path = self._damaged(backend)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = storage.repair()
+
+                self.assertEqual(result, {"torn_lines": 1, "corrupted_lines": 1})
+                self.assertTrue(path.read_bytes().endswith(b"\n"))
+                reasons = sorted(entry["reason"] for entry in storage.quarantine.iter_entries())
+                self.assertEqual(len(reasons), 2)
+                self.assertIn("torn final line", reasons)
+
+                # Appends after a repair start on a fresh line and everything decodes
+                self.assertTrue(storage.append_metric(_decision("T-3")))
+                storage.flush()
+                for raw_line in path.read_bytes().splitlines():
+                    json.loads(raw_line)
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    task_ids = [metric["task_id"] for metric in storage.iter_recent_metrics(1)]
+                self.assertEqual(task_ids, ["T-1", "T-2", "T-3"])
+                self.assertEqual(output.getvalue(), "")
+
+                with contextlib.redirect_stdout(io.StringIO()):
+                    self.assertEqual(storage.repair(), {"torn_lines": 0, "corrupted_lines": 0})
+
+    def test_repair_completes_decodable_torn_line(self) -> None:
+        from lib.metrics.storage_factory import create_metrics_storage
+
+        storage = create_metrics_storage("jsonl", self.root / "jsonl")
+        self.assertTrue(storage.append_metric(_decision("T-1")))
+        with open(storage.metrics_file, "ab") as f:
+            f.write(json.dumps(_decision("T-2")).encode("utf-8"))
+
+        self.assertEqual(storage.repair(), {"torn_lines": 0, "corrupted_lines": 0})
+        self.assertTrue(storage.metrics_file.read_bytes().endswith(b"\n"))
+        self.assertEqual([m["task_id"] for m in storage.iter_recent_metrics(1)], ["T-1", "T-2"])
+        self.assertEqual(list(storage.quarantine.iter_entries()), [])
+
+    def test_repair_command(self) -> None:
+        from lib.metrics.repair import main
+
+        storage, _path = self._damaged("jsonl")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main(["--backend", "jsonl", "--metrics-dir", str(self.root / "jsonl")]), 0)
+        self.assertIn("Truncated 1 torn line(s), quarantined 1 corrupted line(s)", output.getvalue())
+        self.assertIn(str(storage.quarantine.quarantine_file), output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
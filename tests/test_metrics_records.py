@@ -0,0 +1,142 @@
+"""Tests for typed metric records and the json/compact JSONL encodings."""
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+STAMP = "2026-10-01T12:00:00Z"
+
+# One complete metric of every record type, keyed by its compact tag
+METRICS = {
+    "c1": {"type": "complexity", "task_id": "T-1", "complexity_score": 12,
+           "factors": {"files": 3, "patterns": ["repository"]}, "stack": "python", "timestamp": STAMP},
+    "d1": {"type": "decision", "task_id": "T-1", "architectural_score": 85, "decision": "auto_approve",
+           "complexity_score": 12, "stack": "python", "forced": False,
+           "recommendations": ["add tests"], "timestamp": STAMP},
+    "o1": {"type": "outcome", "task_id": "T-1", "decision": "auto_approve", "human_override": True,
+           "duration_seconds": 61.5, "final_status": "completed", "stack": "python", "timestamp": STAMP},
+    "t1": {"type": "threshold_adjustment", "old_threshold": 80, "new_threshold": 75,
+           "threshold_type": "auto_approve", "reason": "calibration", "stack": None, "timestamp": STAMP},
+}
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestRecordEncoding(unittest.TestCase):
+    """Both encodings round-trip every record type."""
+
+    def test_round_trip_each_type(self) -> None:
+        from lib.metrics.records import RECORD_TYPES, decode_metric, decode_record, encode_metric
+
+        for tag, metric in METRICS.items():
+            for compact in (False, True):
+                with self.subTest(tag=tag, compact=compact):
+                    line = encode_metric(metric, compact=compact)
+                    self.assertEqual(decode_metric(line), metric)
+                    self.assertEqual(decode_metric(line.encode("utf-8")), metric)
+
+                    record = decode_record(line)
+                    self.assertIsInstance(record, RECORD_TYPES[metric["type"]])
+                    self.assertEqual(record.to_dict(), metric)
+                    # Records encode exactly like their dictionaries
+                    self.assertEqual(encode_metric(record, compact=compact), line)
+
+    def test_compact_rows_are_tagged_in_field_order(self) -> None:
+        from lib.metrics.records import RECORD_TYPES, encode_metric
+
+        for tag, metric in METRICS.items():
+            row = json.loads(encode_metric(metric, compact=True))
+            self.assertEqual(row[0], tag)
+            self.assertEqual(row[1:], [metric[name] for name in RECORD_TYPES[metric["type"]].FIELDS])
+
+    def test_unknown_types_stay_dicts(self) -> None:
+        from lib.metrics.records import decode_record, encode_metric, to_record
+
+        rollup = {"type": "rollup", "day": "2026-09-01", "aggregate": {"total_reviews": 3}}
+        self.assertIs(to_record(rollup), rollup)
+        for compact in (False, True):
+            line = encode_metric(rollup, compact=compact)
+            self.assertIsInstance(json.loads(line), dict)
+            decoded = decode_record(line)
+            self.assertIs(type(decoded), dict)
+            self.assertEqual(decoded, rollup)
+
+    def test_optional_fields(self) -> None:
+        from lib.metrics.records import decode_metric, decode_record, encode_metric
+
+        # Null fields are kept as null, absent fields stay absent
+        unstacked = dict(METRICS["d1"], stack=None)
+        line = encode_metric(unstacked, compact=True)
+        self.assertIsInstance(json.loads(line), list)
+        self.assertIsNone(decode_metric(line)["stack"])
+        self.assertIn("stack", decode_record(line))
+
+        missing = {key: value for key, value in METRICS["d1"].items() if key != "recommendations"}
+        line = encode_metric(missing, compact=True)
+        self.assertIsInstance(json.loads(line), dict)
+        self.assertEqual(decode_metric(line), missing)
+        self.assertNotIn("recommendations", decode_record(line))
+        self.assertEqual(decode_record(line).get("recommendations", []), [])
+
+    def test_extra_keys_survive_compact_encoding(self) -> None:
+        from lib.metrics.records import decode_metric, decode_record, encode_metric
+
+        keyed = dict(METRICS["o1"], idempotency_key="T-1:outcome:2", repo="api")
+        line = encode_metric(keyed, compact=True)
+        row = json.loads(line)
+        self.assertEqual(row[-1], {"idempotency_key": "T-1:outcome:2", "repo": "api"})
+        self.assertEqual(decode_metric(line), keyed)
+
+        record = decode_record(line)
+        self.assertEqual(record["idempotency_key"], "T-1:outcome:2")
+        self.assertEqual(record.to_dict(), keyed)
+
+    def test_corrupt_lines_are_rejected(self) -> None:
+        from lib.metrics.records import decode_metric, decode_record
+
+        for line in ('"text"', "42", '["x9", 1]', '["d1", "T-1"]', "[]", "{not json", b"\xff\xfe"):
+            for decode in (decode_metric, decode_record):
+                with self.subTest(line=line, decode=decode.__name__):
+                    with self.assertRaises(ValueError):
+                        decode(line)
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestMixedEncodingFile(unittest.TestCase):
+    """A file written in both encodings reads back in order."""
+
+    def test_read_mixed_file(self) -> None:
+        from lib.metrics.metrics_storage import MetricsStorage
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "plan_review_metrics.jsonl"
+            ordered = [METRICS["c1"], METRICS["d1"], METRICS["o1"], METRICS["t1"]]
+            json_storage = MetricsStorage(path, encoding="json")
+            compact_storage = MetricsStorage(path, encoding="compact")
+            for i, metric in enumerate(ordered):
+                storage = compact_storage if i % 2 else json_storage
+                self.assertTrue(storage.append_metric(metric))
+                storage.flush()
+
+            lines = path.read_text().splitlines()
+            self.assertEqual([line[0] for line in lines], ["{", "[", "{", "["])
+
+            reader = MetricsStorage(path)
+            self.assertEqual(list(reader.iter_metrics()), ordered)
+            self.assertEqual([record.to_dict() for record in reader.iter_records()], ordered)
+            self.assertEqual(list(reader.iter_task_metrics("T-1")), ordered[:3])
+
+
+if __name__ == "__main__":
+    unittest.main()
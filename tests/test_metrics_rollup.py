@@ -0,0 +1,168 @@
+"""Tests for rolling up old metrics into daily rollup records.
+
+Only decision and outcome events are folded into rollups; complexity,
+threshold adjustment and other event types must survive a rollup on every
+backend, and dashboard aggregates must not change.
+"""
+from __future__ import annotations
+
+import importlib.util
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+DAYS = 40
+ROLLUP_AFTER_DAYS = 20
+
+
+def _daily_metrics(now: datetime) -> list:
+    """One task per day, stamped at noon, with every event type, oldest first."""
+    metrics = []
+    midnight = datetime(now.year, now.month, now.day)
+    for days_ago in range(DAYS, 0, -1):
+        stamp = (midnight - timedelta(days=days_ago, hours=-12)).isoformat() + "Z"
+        task_id = f"T-{days_ago}"
+        metrics.extend([
+            {"type": "complexity", "task_id": task_id, "stack": "python",
+             "complexity_score": days_ago % 40, "factors": {"files": days_ago}, "timestamp": stamp},
+            {"type": "decision", "task_id": task_id, "stack": "python",
+             "architectural_score": 50 + days_ago, "complexity_score": days_ago % 40,
+             "decision": "auto_approve" if days_ago % 3 else "reject", "timestamp": stamp},
+            {"type": "threshold_adjustment", "stack": "python", "threshold": "auto_approve",
+             "old_value": 80, "new_value": 80 + days_ago % 5, "timestamp": stamp},
+            {"type": "outcome", "task_id": task_id, "stack": "python",
+             "human_override": days_ago % 2 == 0, "duration_seconds": float(days_ago),
+             "final_status": "approved", "timestamp": stamp},
+        ])
+    return metrics
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestRollupOldMetrics(unittest.TestCase):
+    """Rollups replace decisions and outcomes only, on every backend."""
+
+    def setUp(self) -> None:
+        from lib.metrics.storage_factory import create_metrics_storage
+
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.backends = {
+            backend: create_metrics_storage(backend, root / backend)
+            for backend in ("jsonl", "segmented", "sqlite")
+        }
+        self.addCleanup(self.backends["sqlite"].close)
+
+        for metric in _daily_metrics(datetime.utcnow()):
+            for storage in self.backends.values():
+                self.assertTrue(storage.append_metric(dict(metric)))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _by_type(self, storage) -> dict:
+        counts: dict = {}
+        for metric in storage.iter_recent_metrics(DAYS + 5):
+            counts[metric["type"]] = counts.get(metric["type"], 0) + 1
+        return counts
+
+    def _totals(self, storage) -> tuple:
+        from lib.metrics.aggregation import MetricsAggregate
+
+        aggregate = MetricsAggregate().add_all(storage.iter_recent_metrics(DAYS + 5))
+        return (aggregate.total_reviews, dict(aggregate.decisions), aggregate.outcome_count,
+                aggregate.human_overrides, aggregate.architectural_score_sum, aggregate.duration_sum)
+
+    def test_keeps_non_aggregated_events(self) -> None:
+        for name, storage in self.backends.items():
+            with self.subTest(backend=name):
+                before = self._totals(storage)
+                rolled_up = storage.rollup_old_metrics(ROLLUP_AFTER_DAYS)
+
+                # Days 21-40 ago lose their decision and outcome events
+                self.assertEqual(rolled_up, 2 * (DAYS - ROLLUP_AFTER_DAYS))
+                counts = self._by_type(storage)
+                self.assertEqual(counts["complexity"], DAYS)
+                self.assertEqual(counts["threshold_adjustment"], DAYS)
+                self.assertEqual(counts["decision"], ROLLUP_AFTER_DAYS)
+                self.assertEqual(counts["outcome"], ROLLUP_AFTER_DAYS)
+                self.assertEqual(counts["rollup"], DAYS - ROLLUP_AFTER_DAYS)
+                self.assertEqual(self._totals(storage), before)
+
+    def test_rollup_is_idempotent(self) -> None:
+        for name, storage in self.backends.items():
+            with self.subTest(backend=name):
+                storage.rollup_old_metrics(ROLLUP_AFTER_DAYS)
+                counts = self._by_type(storage)
+                self.assertEqual(storage.rollup_old_metrics(ROLLUP_AFTER_DAYS), 0)
+                self.assertEqual(self._by_type(storage), counts)
+
+    def test_jsonl_rewrite_stays_in_timestamp_order(self) -> None:
+        from lib.metrics.metrics_index import parse_timestamp
+
+        storage = self.backends["jsonl"]
+        storage.rollup_old_metrics(ROLLUP_AFTER_DAYS)
+        stamps = [parse_timestamp(metric) for metric in storage.iter_recent_metrics(DAYS + 5)]
+        self.assertEqual(stamps, sorted(stamps))
+
+    def test_window_boundary_on_rolled_up_day(self) -> None:
+        from lib.metrics.aggregation import MetricsAggregate
+
+        # The 25-day cutoff falls inside a rolled-up day, which counts whole
+        days = ROLLUP_AFTER_DAYS + 5
+        for name, storage in self.backends.items():
+            with self.subTest(backend=name):
+                storage.rollup_old_metrics(ROLLUP_AFTER_DAYS)
+                folded = MetricsAggregate().add_all(storage.iter_recent_metrics(days))
+                self.assertEqual(folded.total_reviews, days)
+                # Backends without their own aggregation leave folding to the caller
+                aggregate = storage.aggregate_recent(days) or folded
+                self.assertEqual(aggregate.total_reviews, days)
+
+                current, previous = storage.aggregate_windows([days])[days]
+                self.assertEqual(current.total_reviews, days)
+                self.assertEqual(previous.total_reviews, DAYS - days)
+
+    def test_legacy_rollups_are_restamped(self) -> None:
+        from lib.metrics.rollup import rollup_timestamp
+
+        for name, storage in self.backends.items():
+            with self.subTest(backend=name):
+                storage.rollup_old_metrics(ROLLUP_AFTER_DAYS)
+                rollups = [m for m in storage.iter_recent_metrics(DAYS + 5) if m["type"] == "rollup"]
+                self.assertTrue(all(m["timestamp"] == rollup_timestamp(m["day"]) for m in rollups))
+
+        # Rollups written when they were stamped at the start of their day
+        storage = self.backends["jsonl"]
+        legacy_day = (datetime.utcnow() - timedelta(days=DAYS + 2)).date().isoformat()
+        legacy = dict(rollups[0], day=legacy_day, timestamp=f"{legacy_day}T00:00:00Z")
+        self.assertTrue(storage.append_metric(legacy))
+        self.assertEqual(storage.rollup_old_metrics(ROLLUP_AFTER_DAYS), 0)
+        restamped = [m for m in storage.iter_recent_metrics(DAYS + 5) if m.get("day") == legacy_day]
+        self.assertEqual([m["timestamp"] for m in restamped], [rollup_timestamp(legacy_day)])
+        self.assertEqual(restamped[0]["aggregate"], legacy["aggregate"])
+
+    def test_calibration_and_timelines_skip_rolled_up_days(self) -> None:
+        from lib.metrics.threshold_calibration import ThresholdCalibration
+
+        storage = self.backends["jsonl"]
+        storage.rollup_old_metrics(ROLLUP_AFTER_DAYS)
+        old_task = f"T-{DAYS}"
+        self.assertEqual(
+            [metric["type"] for metric in storage.iter_task_metrics(old_task)], ["complexity"]
+        )
+        calibration = ThresholdCalibration.from_metrics(storage.iter_recent_metrics(DAYS + 5))
+        self.assertEqual(calibration.outcomes_for("python").total, ROLLUP_AFTER_DAYS)
+
+
+if __name__ == "__main__":
+    unittest.main()
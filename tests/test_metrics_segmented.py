@@ -0,0 +1,79 @@
+"""Tests for the time-partitioned (segmented) metrics storage."""
+from __future__ import annotations
+
+import importlib.util
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestSegmentedStorage(unittest.TestCase):
+    """Per-segment indexes and task lookups."""
+
+    def setUp(self) -> None:
+        from lib.metrics.segmented_storage import SegmentedMetricsStorage
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.metrics_dir = Path(self.tmp.name)
+        self.metrics_file = self.metrics_dir / "plan_review_metrics.jsonl"
+        self.storage = SegmentedMetricsStorage(self.metrics_file)
+
+        now = datetime.utcnow()
+        for days_ago, task_id in ((3, "T-1"), (2, "T-2"), (1, "T-1"), (0, "T-2"), (0, "T-1")):
+            self.assertTrue(self.storage.append_metric({
+                "type": "decision", "task_id": task_id, "architectural_score": 80,
+                "decision": "auto_approve",
+                "timestamp": (now - timedelta(days=days_ago)).isoformat(),
+            }))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_base_file_is_not_indexed(self) -> None:
+        for name in ("plan_review_metrics.jsonl", "plan_review_metrics.tasks.json",
+                     "plan_review_metrics.keys.json", "plan_review_metrics.index.json", "plan_review_metrics.aggregates.json"):
+            self.assertFalse((self.metrics_dir / name).exists(), name)
+        self.assertFalse(hasattr(self.storage, "task_index"))
+
+    def test_task_lookup_uses_segment_indexes(self) -> None:
+        segments = [path for _start, path in self.storage._segments()]
+        self.assertEqual(len(segments), 4)
+
+        metrics = list(self.storage.iter_task_metrics("T-1"))
+        self.assertEqual([m["task_id"] for m in metrics], ["T-1", "T-1", "T-1"])
+        self.assertEqual(metrics, [m for m in self.storage.iter_metrics() if m["task_id"] == "T-1"])
+        offsets = [self.storage._task_index(path).find_offsets("T-1") for path in segments]
+        self.assertEqual(sum(len(found) for found in offsets), 3)
+
+    def test_task_lookup_after_external_rewrite(self) -> None:
+        from lib.metrics.segmented_storage import SegmentedMetricsStorage
+
+        list(self.storage.iter_task_metrics("T-2"))
+        newest = self.storage._segments()[-1][1]
+        newest.write_text(newest.read_text(encoding="utf-8").splitlines(True)[-1], encoding="utf-8")
+
+        reopened = SegmentedMetricsStorage(self.metrics_file)
+        self.assertEqual(len(list(reopened.iter_task_metrics("T-2"))), 1)
+        self.assertEqual(len(list(reopened.iter_task_metrics("T-1"))), 3)
+
+    def test_retention_drops_segment_task_index(self) -> None:
+        oldest = self.storage._segments()[0][1]
+        self.storage._task_index(oldest).save()
+        self.assertEqual(self.storage.clear_old_metrics(2), 1)
+        self.assertFalse(oldest.with_suffix(".tasks.json").exists())
+        self.assertEqual(len(list(self.storage.iter_task_metrics("T-1"))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Tests for the SQLite metrics backend."""
+from __future__ import annotations
+
+import importlib.util
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+def _metrics(now: datetime) -> list:
+    """Decisions and outcomes spread over 100 days, with mixed timestamp formats."""
+    metrics = []
+    for days_ago in (0, 1, 5, 20, 45, 100):
+        stamp = now - timedelta(days=days_ago, hours=1)
+        metrics.append({
+            "type": "decision", "task_id": f"T-{days_ago}", "stack": "python" if days_ago % 2 else "react",
+            "architectural_score": 60 + days_ago % 40, "complexity_score": days_ago % 45,
+            "decision": "auto_approve" if days_ago < 10 else "reject", "forced": days_ago == 5,
+            "timestamp": stamp.isoformat() + ("Z" if days_ago % 2 else "+00:00"),
+        })
+        metrics.append({
+            "type": "outcome", "task_id": f"T-{days_ago}", "stack": "python" if days_ago % 2 else "react",
+            "decision": "auto_approve", "human_override": days_ago == 1, "duration_seconds": 10.0 + days_ago,
+            "final_status": "approved", "timestamp": (stamp + timedelta(minutes=5)).isoformat(),
+        })
+    return metrics
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestSqliteStorage(unittest.TestCase):
+    """Reads, retention and aggregates match the JSONL backend."""
+
+    def setUp(self) -> None:
+        from lib.metrics.metrics_storage import MetricsStorage
+        from lib.metrics.sqlite_storage import SqliteMetricsStorage
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.metrics_dir = Path(self.tmp.name)
+        self.sqlite = SqliteMetricsStorage(self.metrics_dir / "plan_review_metrics.db")
+        self.addCleanup(self.sqlite.close)
+        self.jsonl = MetricsStorage(self.metrics_dir / "plan_review_metrics.jsonl")
+        for metric in _metrics(datetime.utcnow()):
+            self.assertTrue(self.sqlite.append_metric(dict(metric)))
+            self.assertTrue(self.jsonl.append_metric(dict(metric)))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_reads_match_jsonl(self) -> None:
+        self.assertEqual(self.sqlite.count_metrics(), 12)
+        self.assertEqual(self.sqlite.read_all_metrics(), self.jsonl.read_all_metrics())
+        for days in (1, 7, 30, 90):
+            with self.subTest(days=days):
+                self.assertEqual(self.sqlite.read_recent_metrics(days), self.jsonl.read_recent_metrics(days))
+        self.assertEqual(list(self.sqlite.iter_task_metrics("T-5")), list(self.jsonl.iter_task_metrics("T-5")))
+        self.assertEqual(list(self.sqlite.iter_task_metrics("T-missing")), [])
+
+    def test_aggregates_match_folded_metrics(self) -> None:
+        from lib.metrics.aggregation import MetricsAggregate
+
+        for days in (7, 30):
+            with self.subTest(days=days):
+                expected = MetricsAggregate().add_all(self.jsonl.iter_recent_metrics(days)).summary()
+                self.assertEqual(self.sqlite.aggregate_recent(days).summary(), expected)
+
+        current, previous = self.sqlite.aggregate_windows([30])[30]
+        self.assertEqual(current.total_reviews, 4)
+        self.assertEqual(previous.total_reviews, 1)
+
+    def test_missing_and_empty_stacks_group_as_unknown(self) -> None:
+        from lib.metrics.aggregation import MetricsAggregate
+
+        stamp = datetime.utcnow().isoformat()
+        for i, stack in enumerate(("", None, "", "go")):
+            for metric_type in ("decision", "outcome"):
+                metric = {"type": metric_type, "task_id": f"T-s{i}", "architectural_score": 70,
+                          "duration_seconds": 30.0, "timestamp": stamp}
+                if stack is not None:
+                    metric["stack"] = stack
+                self.assertTrue(self.sqlite.append_metric(dict(metric)))
+                self.assertTrue(self.jsonl.append_metric(dict(metric)))
+
+        summary = self.sqlite.aggregate_recent(7).summary()
+        self.assertEqual(summary, MetricsAggregate().add_all(self.jsonl.iter_recent_metrics(7)).summary())
+        self.assertNotIn("", summary["by_stack"])
+        self.assertEqual(summary["by_stack"]["unknown"]["count"], 3)
+
+    def test_clear_old_metrics(self) -> None:
+        self.assertEqual(self.sqlite.clear_old_metrics(30), 4)
+        self.assertEqual(self.sqlite.count_metrics(), 8)
+        self.assertEqual(self.sqlite.read_all_metrics(), self.jsonl.read_recent_metrics(30))
+
+    def test_import_metrics_skips_stored_keys(self) -> None:
+        from lib.metrics.sqlite_storage import SqliteMetricsStorage
+
+        keyed = [{"type": "decision", "task_id": "T-k", "idempotency_key": f"k-{i}",
+                  "timestamp": datetime.utcnow().isoformat()} for i in range(3)]
+        target = SqliteMetricsStorage(self.metrics_dir / "imported.db")
+        self.addCleanup(target.close)
+        self.assertEqual(target.import_metrics(self.jsonl.iter_metrics()), 12)
+        self.assertEqual(target.import_metrics(keyed), 3)
+        self.assertEqual(target.import_metrics(keyed), 0)
+        self.assertEqual(target.count_metrics(), 15)
+
+    def test_duplicate_key_is_ignored(self) -> None:
+        metric = {"type": "decision", "task_id": "T-dup", "idempotency_key": "T-dup:decision:1"}
+        self.assertTrue(self.sqlite.append_metric(dict(metric)))
+        self.assertTrue(self.sqlite.append_metric(dict(metric)))
+        self.assertEqual(self.sqlite.duplicates, 1)
+        self.assertEqual(len(list(self.sqlite.iter_task_metrics("T-dup"))), 1)
+
+    def test_opens_database_without_key_column(self) -> None:
+        from lib.metrics.sqlite_storage import SqliteMetricsStorage
+
+        db_file = self.metrics_dir / "legacy.db"
+        conn = sqlite3.connect(str(db_file))
+        conn.execute("CREATE TABLE metrics (id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT, task_id TEXT, "
+                     "stack TEXT, timestamp TEXT, decision TEXT, architectural_score REAL, "
+                     "complexity_score REAL, forced INTEGER, human_override INTEGER, "
+                     "duration_seconds REAL, final_status TEXT, data TEXT NOT NULL)")
+        conn.execute("INSERT INTO metrics (type, task_id, data) VALUES ('decision', 'T-old', "
+                     "'{\"type\": \"decision\", \"task_id\": \"T-old\"}')")
+        conn.commit()
+        conn.close()
+
+        legacy = SqliteMetricsStorage(db_file)
+        self.addCleanup(legacy.close)
+        self.assertTrue(legacy.append_metric({"type": "decision", "task_id": "T-new", "idempotency_key": "k"}))
+        self.assertTrue(legacy.append_metric({"type": "decision", "task_id": "T-new", "idempotency_key": "k"}))
+        self.assertEqual(legacy.count_metrics(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Tests for metrics whose timestamps mix naive and UTC-offset formats.
+
+Metrics written by other tools may carry ``+00:00`` or ``+02:00`` offsets
+instead of the ``Z`` suffix; readers, retention and the dashboard must
+treat them like any other timestamp.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+def _mixed_metrics(now: datetime) -> list:
+    """Decisions stamped naive, with Z, with +00:00 and with +02:00."""
+    recent = now - timedelta(days=1)
+    old = now - timedelta(days=90)
+    return [
+        {"type": "decision", "task_id": "T-naive", "architectural_score": 70,
+         "decision": "approve_with_recommendations", "timestamp": recent.isoformat()},
+        {"type": "decision", "task_id": "T-z", "architectural_score": 90,
+         "decision": "auto_approve", "timestamp": recent.isoformat() + "Z"},
+        {"type": "decision", "task_id": "T-utc", "architectural_score": 85,
+         "decision": "auto_approve", "timestamp": recent.isoformat() + "+00:00"},
+        {"type": "decision", "task_id": "T-cest", "architectural_score": 40,
+         "decision": "reject", "timestamp": (recent + timedelta(hours=2)).isoformat() + "+02:00"},
+        {"type": "decision", "task_id": "T-old", "architectural_score": 50,
+         "decision": "reject", "timestamp": old.isoformat() + "+00:00"},
+    ]
+
+
+class TestParseTimestamp(unittest.TestCase):
+    """parse_timestamp always returns naive UTC."""
+
+    def setUp(self) -> None:
+        from lib.metrics.metrics_index import parse_timestamp
+        self.parse = parse_timestamp
+
+    def test_offsets_are_converted_to_naive_utc(self) -> None:
+        expected = datetime(2026, 10, 16, 10, 0, 0)
+        for raw in ("2026-10-16T10:00:00", "2026-10-16T10:00:00Z",
+                    "2026-10-16T10:00:00+00:00", "2026-10-16T12:00:00+02:00"):
+            with self.subTest(raw=raw):
+                parsed = self.parse({"timestamp": raw})
+                self.assertIsNone(parsed.tzinfo)
+                self.assertEqual(parsed, expected)
+
+    def test_invalid_timestamps(self) -> None:
+        for metric in ({}, {"timestamp": None}, {"timestamp": "yesterday"}, {"timestamp": 5}):
+            with self.subTest(metric=metric):
+                self.assertIsNone(self.parse(metric))
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestMixedTimestampFile(unittest.TestCase):
+    """Windowed reads, retention and the dashboard over a mixed file."""
+
+    def setUp(self) -> None:
+        from lib.metrics.metrics_storage import MetricsStorage
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.metrics_file = Path(self.tmp.name) / "plan_review_metrics.jsonl"
+        with open(self.metrics_file, "w", encoding="utf-8") as f:
+            for metric in _mixed_metrics(datetime.utcnow()):
+                f.write(json.dumps(metric) + "\n")
+        self.storage = MetricsStorage(self.metrics_file)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_read_recent_metrics(self) -> None:
+        task_ids = {metric["task_id"] for metric in self.storage.read_recent_metrics(30)}
+        self.assertEqual(task_ids, {"T-naive", "T-z", "T-utc", "T-cest"})
+
+    def test_clear_old_metrics(self) -> None:
+        self.assertEqual(self.storage.clear_old_metrics(30), 1)
+        self.assertEqual(self.storage.count_metrics(), 4)
+
+    def test_append_after_offset_timestamp(self) -> None:
+        metric = {"type": "decision", "task_id": "T-new", "architectural_score": 60,
+                  "decision": "approve_with_recommendations"}
+        self.assertTrue(self.storage.append_metric(metric))
+        self.assertEqual(self.storage.count_metrics(), 6)
+
+    def test_dashboard_summary(self) -> None:
+        from lib.config import PlanReviewConfig
+        from lib.metrics.plan_review_dashboard import PlanReviewDashboard
+
+        env = mock.patch.dict(os.environ, {"REQUIREKIT_PROJECT_ROOT": self.tmp.name,
+                                           "REQUIREKIT_CACHE_DIR": os.path.join(self.tmp.name, "cache")})
+        env.start()
+        self.addCleanup(env.stop)
+        PlanReviewConfig._instance = None
+        self.addCleanup(setattr, PlanReviewConfig, "_instance", None)
+
+        summary = PlanReviewDashboard(storage=self.storage).summarize(30)
+        self.assertEqual(summary.total_reviews, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
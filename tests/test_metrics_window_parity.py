@@ -0,0 +1,133 @@
+"""Tests that every backend aggregates a window over exactly the same metrics.
+
+The JSONL backend and the archive answer from per-day partials; the day
+containing the cutoff must be clipped to the exact cutoff so their totals
+match folding ``iter_recent_metrics``, the segmented backend and SQLite.
+"""
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+def _hourly_metrics(now: datetime, days: int) -> list:
+    """One decision every 5 hours and one outcome every 7 hours, oldest first."""
+    metrics = []
+    for hours_ago in range(days * 24, 0, -1):
+        stamp = now - timedelta(hours=hours_ago, minutes=17)
+        if hours_ago % 5 == 0:
+            metrics.append({
+                "type": "decision", "task_id": f"T-{hours_ago}", "stack": "python",
+                "architectural_score": 50 + hours_ago % 50, "complexity_score": hours_ago % 40,
+                "decision": "auto_approve" if hours_ago % 3 else "reject",
+                "timestamp": stamp.isoformat() + "Z",
+            })
+        if hours_ago % 7 == 0:
+            metrics.append({
+                "type": "outcome", "task_id": f"T-{hours_ago}", "stack": "python",
+                "human_override": hours_ago % 2 == 0, "duration_seconds": float(hours_ago % 90),
+                "final_status": "approved", "timestamp": stamp.isoformat() + "Z",
+            })
+    return metrics
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestWindowParity(unittest.TestCase):
+    """Cached, archived, segmented and SQL aggregates agree with a plain fold."""
+
+    WINDOWS = (1, 7, 30)
+
+    def setUp(self) -> None:
+        from lib.metrics.storage_factory import create_metrics_storage
+
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.backends = {
+            backend: create_metrics_storage(backend, root / backend)
+            for backend in ("jsonl", "segmented", "sqlite")
+        }
+        self.backends["archived"] = create_metrics_storage("jsonl", root / "archived", archive="gzip")
+        self.addCleanup(self.backends["sqlite"].close)
+
+        for metric in _hourly_metrics(datetime.utcnow(), 65):
+            for storage in self.backends.values():
+                self.assertTrue(storage.append_metric(dict(metric)))
+        # Push days 20-65 into the compressed archive
+        self.assertGreater(self.backends["archived"].clear_old_metrics(20), 0)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _fold(self, storage, days: int):
+        from lib.metrics.aggregation import MetricsAggregate
+        return MetricsAggregate().add_all(storage.iter_recent_metrics(days))
+
+    def _totals(self, aggregate) -> tuple:
+        return (aggregate.total_reviews, dict(aggregate.decisions), aggregate.outcome_count,
+                aggregate.human_overrides, aggregate.architectural_score_sum, aggregate.duration_sum)
+
+    def test_aggregate_recent(self) -> None:
+        for days in self.WINDOWS:
+            expected = self._totals(self._fold(self.backends["jsonl"], days))
+            for name, storage in self.backends.items():
+                with self.subTest(backend=name, days=days):
+                    aggregate = storage.aggregate_recent(days)
+                    if aggregate is None:
+                        aggregate = self._fold(storage, days)
+                    self.assertEqual(self._totals(aggregate), expected)
+                    self.assertEqual(self._totals(self._fold(storage, days)), expected)
+
+    def test_aggregate_windows(self) -> None:
+        from lib.metrics.aggregation import fold_windows
+
+        reference = fold_windows(self.backends["jsonl"].iter_recent_metrics(60), self.WINDOWS)
+        for name, storage in self.backends.items():
+            results = storage.aggregate_windows(self.WINDOWS)
+            for days in self.WINDOWS:
+                with self.subTest(backend=name, days=days):
+                    current, previous = results[days]
+                    self.assertEqual(self._totals(current), self._totals(reference[days][0]))
+                    self.assertEqual(self._totals(previous), self._totals(reference[days][1]))
+
+    def test_persisted_cache_clips_boundary_day(self) -> None:
+        from lib.metrics.metrics_storage import MetricsStorage
+
+        jsonl = self.backends["jsonl"]
+        jsonl.aggregate_recent(30)
+        reopened = MetricsStorage(jsonl.metrics_file)
+        self.assertEqual(self._totals(reopened.aggregate_recent(30)), self._totals(self._fold(jsonl, 30)))
+
+    def test_dashboard_totals_match(self) -> None:
+        from lib.config import PlanReviewConfig
+        from lib.metrics.plan_review_dashboard import PlanReviewDashboard
+
+        with mock.patch.dict(os.environ, {"REQUIREKIT_PROJECT_ROOT": self.tmp.name,
+                                          "REQUIREKIT_CACHE_DIR": os.path.join(self.tmp.name, "cache")}):
+            PlanReviewConfig._instance = None
+            self.addCleanup(setattr, PlanReviewConfig, "_instance", None)
+            totals = {
+                name: PlanReviewDashboard(storage=storage).summarize(30).total_reviews
+                for name, storage in self.backends.items()
+            }
+        expected = len(self.backends["jsonl"].read_recent_metrics(30)) - sum(
+            1 for metric in self.backends["jsonl"].read_recent_metrics(30) if metric["type"] != "decision"
+        )
+        self.assertEqual(totals, dict.fromkeys(self.backends, expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""Tests for project-root resolution and its memoized and persistent caches.
+
+A stale root would silently point settings and metrics at the wrong
+repository, so every cached answer must be revalidated or rebuilt.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+
+class TestProjectRootResolution(unittest.TestCase):
+    """Roots are found by walking up to .git, then reused safely."""
+
+    def setUp(self) -> None:
+        from lib.utils import PathResolver
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.base = Path(self.tmp.name).resolve()
+        self.repo = self.base / "repo"
+        self.work = self.repo / "src" / "pkg"
+        self.work.mkdir(parents=True)
+        (self.repo / ".git").mkdir()
+        self.cache_file = self.base / "cache" / "roots.json"
+
+        env = mock.patch.dict(os.environ, {"REQUIREKIT_ROOT_CACHE": str(self.cache_file)})
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop("REQUIREKIT_PROJECT_ROOT", None)
+
+        PathResolver.clear_cache()
+        self.addCleanup(PathResolver.clear_cache)
+        self.cwd = self.work
+        cwd = mock.patch.object(Path, "cwd", side_effect=lambda: self.cwd)
+        cwd.start()
+        self.addCleanup(cwd.stop)
+
+    def _counting_walks(self):
+        """Patch the walk so calls can be counted."""
+        from lib.utils import PathResolver
+
+        walk = mock.patch.object(PathResolver, "_find_project_root", side_effect=PathResolver._find_project_root)
+        self.addCleanup(walk.stop)
+        return walk.start()
+
+    def _cache_entries(self) -> dict:
+        return json.loads(self.cache_file.read_text())["roots"]
+
+    def test_memoized_per_working_directory(self) -> None:
+        from lib.utils import PathResolver
+
+        walks = self._counting_walks()
+        self.assertEqual(PathResolver.resolve_project_root(), self.repo)
+        self.assertEqual(PathResolver.resolve_project_root(), self.repo)
+        self.assertEqual(walks.call_count, 1)
+
+        other = self.base / "elsewhere"
+        other.mkdir()
+        self.cwd = other
+        self.assertEqual(PathResolver.resolve_project_root(), other)
+        self.assertEqual(walks.call_count, 2)
+
+        self.cwd = self.work
+        self.assertEqual(PathResolver.get_settings_path(), self.repo / ".claude" / "settings.json")
+        self.assertEqual(walks.call_count, 2)
+
+    def test_project_root_env_takes_precedence(self) -> None:
+        from lib.utils import PathResolver
+
+        self.assertEqual(PathResolver.resolve_project_root(), self.repo)
+        walks = self._counting_walks()
+        with mock.patch.dict(os.environ, {"REQUIREKIT_PROJECT_ROOT": str(self.base)}):
+            self.assertEqual(PathResolver.resolve_project_root(), self.base)
+            self.assertEqual(PathResolver.get_metrics_dir(), self.base / "docs" / "state" / "metrics")
+        self.assertEqual(walks.call_count, 0)
+        self.assertEqual(PathResolver.resolve_project_root(), self.repo)
+
+    def test_clear_cache_forgets_roots(self) -> None:
+        from lib.utils import PathResolver
+
+        (self.repo / ".git").rmdir()
+        os.environ.pop("REQUIREKIT_ROOT_CACHE")
+        self.assertEqual(PathResolver.resolve_project_root(), self.work)
+
+        # A repository created later is only seen after clearing the cache
+        (self.work / ".git").mkdir()
+        self.assertEqual(PathResolver.resolve_project_root(), self.work)
+        (self.work / ".git").rmdir()
+        (self.repo / ".git").mkdir()
+        self.assertEqual(PathResolver.resolve_project_root(), self.work)
+        PathResolver.clear_cache()
+        self.assertEqual(PathResolver.resolve_project_root(), self.repo)
+
+    def test_persistent_cache_is_reused(self) -> None:
+        from lib.utils import PathResolver
+
+        self.assertEqual(PathResolver.resolve_project_root(), self.repo)
+        stat = self.work.stat()
+        self.assertEqual(self._cache_entries()[str(self.work)], [stat.st_dev, stat.st_ino, str(self.repo)])
+
+        # A new process answers from the file without walking
+        PathResolver.clear_cache()
+        with mock.patch.object(Path, "parents", new_callable=mock.PropertyMock) as parents:
+            self.assertEqual(PathResolver.resolve_project_root(), self.repo)
+        parents.assert_not_called()
+
+    def test_changed_directory_identity_is_rejected(self) -> None:
+        from lib.utils import PathResolver
+
+        stat = self.work.stat()
+        wrong = self.base / "wrong"
+        (wrong / ".git").mkdir(parents=True)
+        for identity in ([stat.st_dev, stat.st_ino + 1], [stat.st_dev + 1, stat.st_ino]):
+            with self.subTest(identity=identity):
+                self.cache_file.parent.mkdir(exist_ok=True)
+                self.cache_file.write_text(json.dumps({
+                    "version": PathResolver.ROOT_CACHE_VERSION,
+                    "roots": {str(self.work): identity + [str(wrong)]},
+                }))
+                PathResolver.clear_cache()
+                self.assertEqual(PathResolver.resolve_project_root(), self.repo)
+                self.assertEqual(self._cache_entries()[str(self.work)], [stat.st_dev, stat.st_ino, str(self.repo)])
+
+    def test_recreated_directory_is_rejected(self) -> None:
+        from lib.utils import PathResolver
+
+        self.assertEqual(PathResolver.resolve_project_root(), self.repo)
+
+        # The working directory is replaced by one in a different repository
+        shutil.rmtree(self.repo)
+        self.work.mkdir(parents=True)
+        (self.work / ".git").mkdir()
+        stat = self.work.stat()
+        PathResolver.clear_cache()
+        self.assertEqual(PathResolver.resolve_project_root(), self.work)
+        self.assertEqual(self._cache_entries()[str(self.work)], [stat.st_dev, stat.st_ino, str(self.work)])
+
+    def test_removed_git_directory_is_rejected(self) -> None:
+        from lib.utils import PathResolver
+
+        self.assertEqual(PathResolver.resolve_project_root(), self.repo)
+        (self.repo / ".git").rmdir()
+        (self.repo / "src" / ".git").mkdir()
+
+        PathResolver.clear_cache()
+        self.assertEqual(PathResolver.resolve_project_root(), self.repo / "src")
+
+    def test_unusable_cache_file_is_ignored(self) -> None:
+        from lib.utils import PathResolver
+
+        self.cache_file.parent.mkdir()
+        for content in ("{not json", json.dumps({"version": 0, "roots": {str(self.work): [0, 0, "/"]}})):
+            with self.subTest(content=content[:10]):
+                self.cache_file.write_text(content)
+                PathResolver.clear_cache()
+                with mock.patch("builtins.print"):
+                    self.assertEqual(PathResolver.resolve_project_root(), self.repo)
+                self.assertIn(str(self.work), self._cache_entries())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""Tests for the live (watch) mode of the plan review dashboard."""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestDashboardWatch(unittest.TestCase):
+    """watch() reports the same window as summarize(), archive included."""
+
+    def setUp(self) -> None:
+        from lib.config import PlanReviewConfig
+        from lib.metrics.storage_factory import create_metrics_storage
+
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        env = mock.patch.dict(os.environ, {
+            "REQUIREKIT_PROJECT_ROOT": str(root),
+            "REQUIREKIT_CACHE_DIR": str(root / "cache"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        PlanReviewConfig._instance = None
+        self.addCleanup(setattr, PlanReviewConfig, "_instance", None)
+
+        self.storage = create_metrics_storage("jsonl", root / "metrics", archive="gzip")
+        now = datetime.utcnow()
+        for days_ago in (1, 2, 10, 15, 25, 40):
+            self.assertTrue(self.storage.append_metric({
+                "type": "decision", "task_id": f"T-{days_ago}", "architectural_score": 80,
+                "complexity_score": 5, "decision": "auto_approve",
+                "timestamp": (now - timedelta(days=days_ago)).isoformat(),
+            }))
+        self.assertEqual(self.storage.clear_old_metrics(12), 3)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _watch(self, dashboard, days: int, iterations: int = 1) -> list:
+        renderings = []
+        dashboard.watch(days, refresh_interval=0, format="json", iterations=iterations, output=renderings.append)
+        return [json.loads(text) for text in renderings]
+
+    def test_watch_includes_archived_days(self) -> None:
+        from lib.metrics.plan_review_dashboard import PlanReviewDashboard
+
+        dashboard = PlanReviewDashboard(storage=self.storage)
+        for days in (7, 30, 60):
+            with self.subTest(days=days):
+                rendered = self._watch(dashboard, days)[0]
+                rendered = rendered[0] if isinstance(rendered, list) else rendered
+                self.assertEqual(rendered["total_reviews"], dashboard.summarize(days).total_reviews)
+        self.assertEqual(dashboard.summarize(30).total_reviews, 5)
+
+    def test_watch_picks_up_appends(self) -> None:
+        from lib.metrics.plan_review_dashboard import PlanReviewDashboard
+
+        dashboard = PlanReviewDashboard(storage=self.storage)
+        renderings = []
+
+        def output(text: str) -> None:
+            renderings.append(json.loads(text))
+            self.storage.append_metric({"type": "decision", "task_id": "T-new", "architectural_score": 90,
+                                        "complexity_score": 5, "decision": "auto_approve"})
+
+        dashboard.watch(30, refresh_interval=0, format="json", iterations=2, output=output)
+        totals = [(r[0] if isinstance(r, list) else r)["total_reviews"] for r in renderings]
+        self.assertEqual(totals, [5, 6])
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestDashboardConfigReload(unittest.TestCase):
+    """A running watch() picks up settings.json edits through ConfigWatcher."""
+
+    def setUp(self) -> None:
+        from lib.config import PlanReviewConfig
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.settings = self.root / ".claude" / "settings.json"
+        self.settings.parent.mkdir()
+        self._write_settings({"metrics": {"output_format": "json"}})
+
+        env = mock.patch.dict(os.environ, {
+            "REQUIREKIT_PROJECT_ROOT": str(self.root),
+            "REQUIREKIT_CACHE_DIR": str(self.root / "cache"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        PlanReviewConfig._instance = None
+        self.addCleanup(setattr, PlanReviewConfig, "_instance", None)
+
+    def _write_settings(self, plan_review: dict) -> None:
+        """Rewrite settings.json, making sure its stat changes."""
+        before = self.settings.stat().st_mtime_ns if self.settings.exists() else 0
+        self.settings.write_text(json.dumps({"plan_review": plan_review}))
+        if self.settings.stat().st_mtime_ns <= before:
+            os.utime(self.settings, ns=(before + 10**9, before + 10**9))
+
+    def test_settings_change_reaches_running_watch(self) -> None:
+        from lib.metrics.plan_review_dashboard import PlanReviewDashboard
+        from lib.metrics.sqlite_storage import SqliteMetricsStorage
+
+        dashboard = PlanReviewDashboard()
+        self.assertTrue(dashboard.storage.append_metric({
+            "type": "decision", "task_id": "T-1", "architectural_score": 80,
+            "complexity_score": 5, "decision": "auto_approve",
+        }))
+        renderings = []
+
+        def output(text: str) -> None:
+            renderings.append(text)
+            if len(renderings) == 1:
+                self._write_settings({"metrics": {"output_format": "csv", "backend": "sqlite"}})
+
+        dashboard.watch(30, refresh_interval=0, iterations=2, output=output)
+        self.addCleanup(dashboard.storage.close)
+
+        first = json.loads(renderings[0])
+        self.assertEqual((first[0] if isinstance(first, list) else first)["total_reviews"], 1)
+        self.assertRaises(ValueError, json.loads, renderings[1])
+        self.assertIsInstance(dashboard.storage, SqliteMetricsStorage)
+        self.assertEqual(dashboard.summarize(30).total_reviews, 0)
+
+    def test_caller_storage_is_kept(self) -> None:
+        from lib.config import ConfigWatcher
+        from lib.metrics.plan_review_dashboard import PlanReviewDashboard
+        from lib.metrics.storage_factory import create_metrics_storage
+
+        storage = create_metrics_storage("jsonl", self.root / "metrics")
+        dashboard = PlanReviewDashboard(storage=storage)
+        watcher = ConfigWatcher(dashboard.config, interval=60)
+        watcher.subscribe(dashboard.on_config_change)
+
+        self._write_settings({"metrics": {"output_format": "json", "backend": "sqlite"}})
+        self.assertTrue(watcher.check())
+        self.assertIs(dashboard.storage, storage)
+        self.assertEqual(dashboard.config.get_metrics_backend(), "sqlite")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for threshold recommendations from historical review outcomes."""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LIB_PARENT = BASE_DIR / "installer" / "global"
+
+if str(LIB_PARENT) not in sys.path:
+    sys.path.insert(0, str(LIB_PARENT))
+
+HAS_PYDANTIC = importlib.util.find_spec("pydantic") is not None
+
+SETTINGS = {
+    "plan_review": {
+        "thresholds": {
+            "stack_overrides": {
+                "python": {"auto_approve": 90, "approve_with_recommendations": 70, "reject": 40},
+                "react": {"auto_approve": 65, "approve_with_recommendations": 64, "reject": 60},
+            }
+        }
+    }
+}
+
+
+@unittest.skipUnless(HAS_PYDANTIC, "lib.metrics requires pydantic")
+class TestThresholdRecommendations(unittest.TestCase):
+    """Recommendations keep auto_approve > approve_with_recommendations >= reject."""
+
+    def setUp(self) -> None:
+        from lib.config import PlanReviewConfig
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+        (root / ".claude").mkdir()
+        (root / ".claude" / "settings.json").write_text(json.dumps(SETTINGS), encoding="utf-8")
+        env = mock.patch.dict(os.environ, {
+            "REQUIREKIT_PROJECT_ROOT": str(root),
+            "REQUIREKIT_CACHE_DIR": str(root / "cache"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        PlanReviewConfig._instance = None
+        self.addCleanup(setattr, PlanReviewConfig, "_instance", None)
+        self.config = PlanReviewConfig()
+
+    def _calibration(self, reviews):
+        from lib.metrics.threshold_calibration import ThresholdCalibration
+
+        calibration = ThresholdCalibration()
+        for stack, score, overridden in reviews:
+            calibration.add(stack, score, overridden)
+        return calibration
+
+    def _assert_valid(self, report) -> None:
+        from lib.config.config_schema import ThresholdConfig
+
+        for stack, entry in report.items():
+            name = None if stack == "all" else stack
+            applied = dict(self.config.get_stack_thresholds(name), reject=self.config.get_reject_threshold(name))
+            applied.update({key: value for key, value in entry["recommended"].items() if value is not None})
+            ThresholdConfig(**applied).validate_ordering()
+
+    def test_recommendations_below_auto_approve(self) -> None:
+        # Nobody is ever overridden, so every threshold meets both budgets
+        calibration = self._calibration([("go", score, False) for score in range(101) for _ in range(3)])
+        recommended = calibration.report(min_samples=20)["go"]["recommended"]
+        self.assertEqual(recommended, {"auto_approve": 1, "approve_with_recommendations": 0})
+        self._assert_valid(calibration.report(self.config, min_samples=20))
+
+    def test_falls_back_to_configured_auto_approve(self) -> None:
+        # Overrides above 95 keep auto_approve from qualifying anywhere
+        reviews = [("python", score, score >= 95) for score in range(101) for _ in range(2)]
+        report = self._calibration(reviews).report(self.config, auto_approve_override_rate=0.0,
+                                                    recommendations_override_rate=0.5, min_samples=5)
+        recommended = report["python"]["recommended"]
+        self.assertIsNone(recommended["auto_approve"])
+        self.assertIsNotNone(recommended["approve_with_recommendations"])
+        self.assertLess(recommended["approve_with_recommendations"], 90)
+        self.assertGreaterEqual(recommended["approve_with_recommendations"], 40)
+        self._assert_valid(report)
+
+    def test_withholds_auto_approve_that_breaks_ordering(self) -> None:
+        # react is configured 65/64/60: auto_approve could drop to 61, but
+        # nothing in [60, 61) meets the looser budget
+        reviews = [("react", 60, True)] * 5 + [("react", score, False) for score in range(61, 101)]
+        report = self._calibration(reviews).report(self.config, auto_approve_override_rate=0.0,
+                                                    recommendations_override_rate=0.0, min_samples=5)
+        self.assertIsNone(report["react"]["recommended"]["auto_approve"])
+        self._assert_valid(report)
+
+    def test_random_histories_always_validate(self) -> None:
+        rng = random.Random(7)
+        for run in range(200):
+            reviews = []
+            for stack in ("python", "react", "go"):
+                bias = rng.random()
+                for _ in range(rng.randint(0, 150)):
+                    score = rng.randint(0, 100)
+                    reviews.append((stack, score, rng.random() < bias * (100 - score) / 100))
+            report = self._calibration(reviews).report(
+                self.config,
+                auto_approve_override_rate=rng.choice((0.0, 0.02, 0.05, 0.1)),
+                recommendations_override_rate=rng.choice((0.05, 0.2, 0.4)),
+                min_samples=rng.choice((1, 5, 20)),
+            )
+            with self.subTest(run=run):
+                self._assert_valid(report)
+
+
+if __name__ == "__main__":
+    unittest.main()